@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Python interface to the NKT Photonics NKTPDLL.dll (NKTP SDK).
+
+    Same functions, arguments and return values as the NKTP_DLL.py module shipped with the SDK, but:
+        - importing NKTP_DLL doesn't load the DLL. It is loaded the first time a DLL function is called (or NKTP_DLL.NKTPDLL is
+          used), so the result code decoders, the callback prototypes and the simulator can be used without the SDK installed
+        - the wrapper of every function is generated from a single signature table (signatures.py) rather than written out by
+          hand, and is only created when it's first looked up
+        - the wrappers reuse per-thread out-parameters and buffers and encode each port name once, so polling a register doesn't
+          allocate anything. registerRead, registerWriteRead, deviceGetAllTypes and registerGetAll also have a <name>View fast path
+          returning a memoryview of the data rather than a copy (see bindings.py)
+        - the latency and result code of every register call can be recorded per (port, device, register) with
+          enable_telemetry(), at no cost while it is disabled (see telemetry.py)
+        - registerGetAll, deviceGetFirmwareVersion and deviceGetStatusBits return what their description says
+
+    The package is made of:
+        - decoders.py       the result code decoders (PortResultTypes, RegisterResultTypes, ...) and structures, plain Python
+        - signatures.py     the C signature of every DLL function
+        - bindings.py       loading the DLL and generating the wrappers
+        - telemetry.py      register access latency histograms and result code counters
+
+    The DLL is loaded from %NKTP_SDK_PATH%\\NKTPDLL\\x64 (or x86), C:\\NKTP_SDK by default.
+
+Usage:
+
+    import NKTP_DLL as nktp
+    print(nktp.RegisterResultTypes(0))                    # no DLL needed
+    result = nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)  # loads the DLL on the first call
+
+    from NKTP_DLL import *                                # as with the SDK module
+"""
+
+from ctypes import CFUNCTYPE, c_char_p, c_ubyte, c_void_p
+
+from .bindings import VIEWS, function, load_library, pointToPointPortData
+from .decoders import (DeviceModeTypes, DeviceResultTypes, DeviceStatusTypes, P2PPortResultTypes, ParamSetUnitTypes,
+                       PortResultTypes, PortStatusTypes, RegisterDataTypes, RegisterPriorityTypes, RegisterResultTypes,
+                       RegisterStatusTypes, tDateTimeStruct, tParamSetStruct)
+from .signatures import SIGNATURES
+from .telemetry import register_telemetry
+
+# Callback prototypes, see setCallbackPtrPortInfo, setCallbackPtrDeviceInfo and setCallbackPtrRegisterInfo
+portStatusCallbackFuncPtr = CFUNCTYPE(None, c_char_p, c_ubyte, c_ubyte, c_ubyte, c_ubyte)
+deviceStatusCallbackFuncPtr = CFUNCTYPE(None, c_char_p, c_ubyte, c_ubyte, c_ubyte, c_void_p)
+registerStatusCallbackFuncPtr = CFUNCTYPE(None, c_char_p, c_ubyte, c_ubyte, c_ubyte, c_ubyte, c_ubyte, c_void_p)
+
+# Register access telemetry, see telemetry.py
+enable_telemetry = register_telemetry.enable
+disable_telemetry = register_telemetry.disable
+reset_telemetry = register_telemetry.reset
+telemetry_snapshot = register_telemetry.snapshot
+telemetry_log_line = register_telemetry.log_line
+
+__all__ = ['DeviceModeTypes', 'DeviceResultTypes', 'DeviceStatusTypes', 'P2PPortResultTypes', 'ParamSetUnitTypes',
+           'PortResultTypes', 'PortStatusTypes', 'RegisterDataTypes', 'RegisterPriorityTypes', 'RegisterResultTypes',
+           'RegisterStatusTypes', 'tDateTimeStruct', 'tParamSetStruct', 'pointToPointPortData', 'portStatusCallbackFuncPtr',
+           'deviceStatusCallbackFuncPtr', 'registerStatusCallbackFuncPtr', 'enable_telemetry', 'disable_telemetry',
+           'reset_telemetry', 'telemetry_snapshot', 'telemetry_log_line'] + sorted(SIGNATURES) + VIEWS
+
+_functions = set(SIGNATURES) | set(VIEWS)
+
+
+# The DLL functions are created on first access, e.g. NKTP_DLL.registerWriteU8, and kept as module attributes from then on
+def __getattr__(name):
+    if name == 'NKTPDLL':
+        return load_library()
+    if name in _functions:
+        wrapper = globals()[name] = function(name)
+        return wrapper
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | _functions | {'NKTPDLL'})
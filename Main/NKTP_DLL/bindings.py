@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy ctypes bindings of NKTPDLL.dll.
+
+    NKTPDLL.dll is only loaded the first time one of its functions is called, not when NKTP_DLL is imported, so the decoders, the
+    simulator and any script that never talks to the hardware work on a machine without the NKTP SDK. The Python wrapper of every
+    function is generated from its entry in signatures.py, and the ctypes prototype behind it is only bound to the DLL when the
+    wrapper is first called.
+
+    The wrappers don't allocate anything per call, as they are called thousands of times in a sweep or a status polling loop:
+        - the out-parameters and string buffers of a function are allocated once per thread and reused by every later call of the
+          function on that thread
+        - port names are encoded once, the first time they are used
+    The functions that return raw data through a buffer (registerRead, registerWriteRead, deviceGetAllTypes and registerGetAll) also
+    have a fast path, <name>View (e.g. registerReadView), which returns a memoryview of the data in the thread's buffer instead of a
+    copy. The view is only valid until the function is called again on the same thread (for the functions called through a
+    PortWorker, on the port's worker thread), so it must be used or copied straight away.
+
+    The DLL is loaded from %NKTP_SDK_PATH%\\NKTPDLL\\x64 (or x86 for a 32 bit Python), C:\\NKTP_SDK by default.
+
+Usage:
+
+    registerWriteU8 = function('registerWriteU8')   # no DLL access yet
+    registerWriteU8('COM4', 1, 0x30, 1, -1)          # loads the DLL if needed, binds registerWriteU8 and calls it
+    result, data = function('registerReadView')('COM5', 25, 0x90, -1)
+    wavelength = int.from_bytes(data, 'little')
+    print(source('registerReadU16'))                 # the generated Python source
+"""
+
+import ctypes
+import os
+import threading
+from collections import namedtuple
+from ctypes import CFUNCTYPE, POINTER, c_char, c_char_p, create_string_buffer
+
+from .signatures import SIGNATURES, Buffer, Data, In, Out, Port, Str
+
+# Named tuple for PointToPoint ports
+pointToPointPortData = namedtuple('pointToPointPortData', 'hostAddress, hostPort, clientAddress, clientPort, protocol, msTimeout')
+
+_library = None
+_library_lock = threading.Lock()
+
+# Encoded port names, see encode_port()
+_ports = {}
+
+# Namespaces of the generated wrappers, and the wrapper put around their prototypes (see set_wrapper())
+_namespaces = []
+_wrapper = None
+_install_lock = threading.Lock()
+
+# The memoryview fast paths, see lookup()
+VIEWS = sorted(name + 'View' for name, sig in SIGNATURES.items()
+               if any(isinstance(a, Buffer) and a.decode == 'raw' for a in sig.arguments))
+
+
+# Loads the OS related DLL, x86 or x64, the first time it's needed
+def load_library():
+    global _library
+    with _library_lock:
+        if _library is None:
+            dllFolder = os.environ.get('NKTP_SDK_PATH', r'C:\NKTP_SDK')
+            platform = 'x86' if ctypes.sizeof(ctypes.c_voidp) == 4 else 'x64'
+            path = dllFolder + '\\NKTPDLL\\' + platform + '\\NKTPDLL.dll'
+            print(f'Loading {platform} DLL from:', path)
+            _library = ctypes.cdll.LoadLibrary(path)
+        return _library
+
+
+# Port name as passed to the DLL, encoded once per port
+def encode_port(portname):
+    encoded = _ports[portname] = portname.encode('ascii')
+    return encoded
+
+
+# C argument types of a signature, in order
+def argtypes(sig):
+    types = []
+    for argument in sig.arguments:
+        if isinstance(argument, (Port, Str, Data)):
+            types.append(c_char_p)
+        elif isinstance(argument, In):
+            types.append(argument.ctype)
+        elif isinstance(argument, Out):
+            types.append(POINTER(argument.ctype))
+        else:
+            types += [POINTER(c_char), POINTER(argument.size_ctype)]
+    return types
+
+
+# The signature of a function, or of the function a <name>View fast path is for. Returns (signature, view)
+def lookup(name):
+    sig = SIGNATURES.get(name)
+    if sig is not None:
+        return sig, False
+    sig = SIGNATURES.get(name[:-4]) if name.endswith('View') else None
+    if sig is not None and any(isinstance(a, Buffer) and a.decode == 'raw' for a in sig.arguments):
+        return sig, True
+    raise KeyError(name)
+
+
+# The out-parameters and buffers of a function, in the order of its arguments, as allocated for each thread
+def allocate(sig, view=False):
+    buffers = []
+    for argument in sig.arguments:
+        if isinstance(argument, Out):
+            buffers.append(argument.ctype(0))
+        elif isinstance(argument, Buffer):
+            buffer = create_string_buffer(argument.size)
+            buffers += [argument.size_ctype(argument.size), buffer]
+            if view:
+                buffers.append(memoryview(buffer).cast('B'))
+    return buffers
+
+
+# Python source of the wrapper of a function, calling its prototype _function with the buffers from _local (see allocate())
+def source(name, sig=None, view=False):
+    if sig is None:
+        sig, view = lookup(name)
+    params = sig.params
+    if params is None:
+        params = ', '.join(a.name for a in sig.arguments if isinstance(a, (Port, Str, In, Data)))
+
+    body = []
+    buffers = []
+    args = []
+    outputs = []
+    for argument in sig.arguments:
+        if isinstance(argument, Port):
+            args.append(f'(_ports.get({argument.name}) or _encode_port({argument.name}))')
+        elif isinstance(argument, Str):
+            args.append(f"{argument.name}.encode('ascii')")
+        elif isinstance(argument, (In, Data)):
+            args.append(argument.name)
+        elif isinstance(argument, Out):
+            buffers.append(f'_{argument.name}')
+            body.append(f'_{argument.name}.value = 0')
+            args.append(f'_{argument.name}')
+            outputs.append(f'_{argument.name}.value')
+        else:
+            buffer = f'_{argument.name}'
+            size = f'_{argument.name}Size'
+            buffers += [size, buffer]
+            body.append(f'{size}.value = {argument.size}')
+            args += [buffer, size]
+            if view:
+                buffers.append(f'{buffer}View')
+                ok = '' if sig.restype is None else ' if result == 0 else 0'
+                outputs.append(f'{buffer}View[:{size}.value{ok}]')
+            elif argument.decode == 'raw':
+                outputs.append(f"({buffer}[:{size}.value] if result == 0 else b'')")
+            else:
+                # An empty string rather than the previous call's if the function doesn't write to the buffer
+                body.append(f"{buffer}[0] = b'\\0'")
+                outputs.append(f"{buffer}.value.decode('ascii')" if argument.decode == 'str' else f'{buffer}.value')
+    if sig.pack is not None:
+        outputs = [f'{sig.pack}({", ".join(outputs)})']
+    if buffers:
+        unpack = f'{", ".join(buffers)}{"," if len(buffers) == 1 else ""}'
+        body[:0] = ['try:', f'    {unpack} = _local.buffers', 'except AttributeError:',
+                    f'    {unpack} = _local.buffers = _allocate()']
+
+    call = f'_function({", ".join(args)})'
+    if sig.restype is None:
+        body.append(call)
+        if outputs:
+            body.append(f'return {", ".join(outputs)}')
+    elif outputs:
+        body.append(f'result = {call}')
+        body.append(f'return result, {", ".join(outputs)}')
+    else:
+        body.append(f'return {call}')
+    return f'def {name}({params}):\n' + ''.join(f'    {line}\n' for line in body)
+
+
+# Stands in for the ctypes prototype of a function until its first call, which binds the prototype to the DLL and replaces the
+# stand-in in the wrapper's namespace, so later calls go straight to the DLL
+class _Prototype:
+    def __init__(self, name, sig, namespace):
+        self.name = name
+        self.sig = sig
+        self.namespace = namespace
+
+    def __call__(self, *args):
+        prototype = CFUNCTYPE(self.sig.restype, *argtypes(self.sig))((self.name, load_library()))
+        self.namespace['_prototype'] = prototype
+        install(self.namespace)
+        return prototype(*args)
+
+
+# Sets the _function a wrapper calls: its prototype, or the prototype wrapped by the current wrapper (see set_wrapper())
+def install(namespace):
+    with _install_lock:
+        prototype = namespace['_prototype']
+        wrapped = None if _wrapper is None else _wrapper(namespace['_name'], namespace['_sig'], prototype)
+        namespace['_function'] = prototype if wrapped is None else wrapped
+
+
+# Puts wrapper(name, signature, prototype) around the prototype of every function, e.g. to time the DLL calls (see telemetry.py).
+# The wrapper returns the callable to use instead of the prototype, or None to leave the function alone. None removes the wrappers,
+# so the functions call the DLL directly again
+def set_wrapper(wrapper):
+    global _wrapper
+    with _install_lock:
+        _wrapper = wrapper
+        namespaces = list(_namespaces)
+    for namespace in namespaces:
+        install(namespace)
+
+
+# The Python wrapper of an NKTPDLL function (or of its <name>View fast path), generated from its signature. The DLL isn't touched
+# until the wrapper is called
+def function(name):
+    try:
+        sig, view = lookup(name)
+    except KeyError:
+        raise AttributeError(f'NKTPDLL has no function {name!r}') from None
+    local = threading.local()
+    namespace = {'pointToPointPortData': pointToPointPortData, '_ports': _ports, '_encode_port': encode_port, '_local': local,
+                 '_allocate': lambda: allocate(sig, view), '_name': name, '_sig': sig}
+    namespace['_prototype'] = _Prototype(name[:-4] if view else name, sig, namespace)
+    with _install_lock:
+        _namespaces.append(namespace)
+    install(namespace)
+    exec(compile(source(name, sig, view), f'<NKTPDLL {name}>', 'exec'), namespace)
+    wrapper = namespace[name]
+    wrapper.__module__ = 'NKTP_DLL'
+    return wrapper
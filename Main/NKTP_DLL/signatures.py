@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Signature table of the NKTPDLL functions.
+
+    Every function exported by NKTPDLL.dll that the bindings wrap is described here once: its C return type and its C arguments in
+    order. bindings.py generates the Python wrapper of a function from its entry the first time it is used. The argument kinds are:
+        - Port(name)                        port name, a str passed as a zero terminated ASCII string
+        - Str(name)                         any other str argument, passed the same way
+        - In(name, ctype)                   a value passed as it is
+        - Data(name)                        bytes, passed as a char pointer
+        - Out(name, ctype)                  a value the function stores through a pointer, returned after the result code
+        - Buffer(name, size_ctype, size, decode)
+                                            a preallocated char buffer and a pointer to its size, returned after the result code as
+                                            'raw' bytes (cut to the size the function returns, empty on error), 'bytes' (up to the
+                                            zero terminator) or a decoded 'str'
+    Port, Str, In and Data arguments become the parameters of the Python function, in order, unless params is given. pack names a
+    callable that the outputs are passed to, e.g. pointToPointPortData.
+
+    Functions with no return type (None) return their only output, or nothing. The others return the result code, followed by
+    their outputs if they have any. The full description of every function is in NKTPDLL.h of the NKTP SDK.
+"""
+
+from collections import namedtuple
+from ctypes import (c_byte, c_double, c_float, c_int32, c_int64, c_short, c_ubyte, c_uint32, c_uint64, c_ushort,
+                    c_void_p)
+
+Port = namedtuple('Port', 'name')
+Str = namedtuple('Str', 'name')
+In = namedtuple('In', 'name ctype')
+Data = namedtuple('Data', 'name')
+Out = namedtuple('Out', 'name ctype')
+Buffer = namedtuple('Buffer', 'name size_ctype size decode')
+
+Signature = namedtuple('Signature', 'restype arguments params pack')
+
+
+def signature(restype, *arguments, params=None, pack=None):
+    return Signature(restype, arguments, params, pack)
+
+
+PORT = Port('portname')
+DEV_ID = In('devId', c_ubyte)
+REG_ID = In('regId', c_ubyte)
+INDEX = In('index', c_short)
+
+# C type of every typed register function, registerReadU8 ... registerWriteReadF64. The DLL's (unsigned) long is 32 bits, as on
+# Windows; the fixed size types keep it that way on any platform
+REGISTER_CTYPES = {
+    'U8': c_ubyte, 'S8': c_byte, 'U16': c_ushort, 'S16': c_short, 'U32': c_uint32, 'S32': c_int32,
+    'U64': c_uint64, 'S64': c_int64, 'F32': c_float, 'F64': c_double,
+}
+
+SIGNATURES = {
+    # Port functions
+    'getAllPorts': signature(None, Buffer('portnames', c_ushort, 255, 'str')),
+    'getOpenPorts': signature(None, Buffer('portnames', c_ushort, 255, 'str')),
+    'pointToPointPortAdd': signature(c_ubyte, PORT, Str('portdata.hostAddress'), In('portdata.hostPort', c_ushort),
+                                     Str('portdata.clientAddress'), In('portdata.clientPort', c_ushort),
+                                     In('portdata.protocol', c_ubyte), In('portdata.msTimeout', c_ubyte),
+                                     params='portname, portdata'),
+    'pointToPointPortGet': signature(c_ubyte, PORT, Buffer('hostAddress', c_ubyte, 255, 'str'), Out('hostPort', c_ushort),
+                                     Buffer('clientAddress', c_ubyte, 255, 'str'), Out('clientPort', c_ushort),
+                                     Out('protocol', c_ubyte), Out('msTimeout', c_ubyte), pack='pointToPointPortData'),
+    'pointToPointPortDel': signature(c_ubyte, PORT),
+    'openPorts': signature(c_ubyte, Port('portnames'), In('autoMode', c_ubyte), In('liveMode', c_ubyte)),
+    'closePorts': signature(c_ubyte, Port('portnames')),
+    'setLegacyBusScanning': signature(None, In('legacyScanning', c_ubyte)),
+    'getLegacyBusScanning': signature(c_ubyte),
+    'getPortStatus': signature(c_ubyte, PORT, Out('portStatus', c_ubyte)),
+    'getPortErrorMsg': signature(c_ubyte, PORT, Buffer('errorMessage', c_ushort, 1000, 'str')),
+
+    # Dedicated register read, write and write/read functions (the typed ones are added below)
+    'registerRead': signature(c_ubyte, PORT, DEV_ID, REG_ID, Buffer('readData', c_ubyte, 255, 'raw'), INDEX),
+    'registerReadAscii': signature(c_ubyte, PORT, DEV_ID, REG_ID, Buffer('readData', c_ubyte, 255, 'bytes'), INDEX),
+    'registerWrite': signature(c_ubyte, PORT, DEV_ID, REG_ID, Data('writeData'), In('writeSize', c_ubyte), INDEX),
+    'registerWriteAscii': signature(c_ubyte, PORT, DEV_ID, REG_ID, Str('strValue'), In('wrEOL', c_ubyte), INDEX),
+    'registerWriteRead': signature(c_ubyte, PORT, DEV_ID, REG_ID, Data('writeData'), In('writeSize', c_ubyte),
+                                   Buffer('readData', c_ubyte, 255, 'raw'), INDEX),
+    'registerWriteReadAscii': signature(c_ubyte, PORT, DEV_ID, REG_ID, Str('strValue'), In('wrEOL', c_ubyte),
+                                        Buffer('readData', c_ubyte, 255, 'bytes'), INDEX),
+
+    # Dedicated device functions
+    'deviceGetType': signature(c_ubyte, PORT, DEV_ID, Out('devType', c_ubyte)),
+    'deviceGetPartNumberStr': signature(c_ubyte, PORT, DEV_ID, Buffer('readStr', c_ubyte, 255, 'bytes')),
+    'deviceGetPCBVersion': signature(c_ubyte, PORT, DEV_ID, Out('PCBVersion', c_ubyte)),
+    'deviceGetStatusBits': signature(c_ubyte, PORT, DEV_ID, Out('statusBits', c_uint32)),
+    'deviceGetErrorCode': signature(c_ubyte, PORT, DEV_ID, Out('errorCode', c_ushort)),
+    'deviceGetBootloaderVersion': signature(c_ubyte, PORT, DEV_ID, Out('version', c_ushort)),
+    'deviceGetBootloaderVersionStr': signature(c_ubyte, PORT, DEV_ID, Buffer('readStr', c_ubyte, 255, 'bytes')),
+    'deviceGetFirmwareVersion': signature(c_ubyte, PORT, DEV_ID, Out('version', c_ushort)),
+    'deviceGetFirmwareVersionStr': signature(c_ubyte, PORT, DEV_ID, Buffer('readStr', c_ubyte, 255, 'bytes')),
+    'deviceGetModuleSerialNumberStr': signature(c_ubyte, PORT, DEV_ID, Buffer('readStr', c_ubyte, 255, 'bytes')),
+    'deviceGetPCBSerialNumberStr': signature(c_ubyte, PORT, DEV_ID, Buffer('readStr', c_ubyte, 255, 'bytes')),
+
+    # Callback device functions
+    'deviceCreate': signature(c_ubyte, PORT, DEV_ID, In('waitReady', c_ubyte)),
+    'deviceExists': signature(c_ubyte, PORT, DEV_ID, Out('exists', c_ubyte)),
+    'deviceRemove': signature(c_ubyte, PORT, DEV_ID),
+    'deviceRemoveAll': signature(c_ubyte, PORT),
+    'deviceGetAllTypes': signature(c_ubyte, PORT, Buffer('types', c_ubyte, 255, 'raw')),
+    'deviceGetMode': signature(c_ubyte, PORT, DEV_ID, Out('devMode', c_ubyte)),
+    'deviceGetLive': signature(c_ubyte, PORT, DEV_ID, Out('liveMode', c_ubyte)),
+    'deviceSetLive': signature(c_ubyte, PORT, DEV_ID, In('liveMode', c_ubyte)),
+
+    # Callback register functions
+    'registerCreate': signature(c_ubyte, PORT, DEV_ID, REG_ID, In('priority', c_ubyte), In('dataType', c_ubyte)),
+    'registerExists': signature(c_ubyte, PORT, DEV_ID, REG_ID, Out('exists', c_ubyte)),
+    'registerRemove': signature(c_ubyte, PORT, DEV_ID, REG_ID),
+    'registerRemoveAll': signature(c_ubyte, PORT, DEV_ID),
+    'registerGetAll': signature(c_ubyte, PORT, DEV_ID, Buffer('regs', c_ubyte, 255, 'raw')),
+
+    # Callback support functions
+    'setCallbackPtrPortInfo': signature(None, In('PortStatusCallback', c_void_p)),
+    'setCallbackPtrDeviceInfo': signature(None, In('DeviceStatusCallback', c_void_p)),
+    'setCallbackPtrRegisterInfo': signature(None, In('RegisterStatusCallback', c_void_p)),
+}
+
+for _suffix, _ctype in REGISTER_CTYPES.items():
+    SIGNATURES['registerRead' + _suffix] = signature(c_ubyte, PORT, DEV_ID, REG_ID, Out('readValue', _ctype), INDEX)
+    SIGNATURES['registerWrite' + _suffix] = signature(c_ubyte, PORT, DEV_ID, REG_ID, In('value', _ctype), INDEX)
+    SIGNATURES['registerWriteRead' + _suffix] = signature(c_ubyte, PORT, DEV_ID, REG_ID, In('writeValue', _ctype),
+                                                          Out('readValue', _ctype), INDEX)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Register access telemetry.
+
+    Records how long every NKTPDLL call takes and which result code it returns, per (port, device, register), to find out which
+    register traffic limits the sweep speed and how often the transactions time out, are busy or fail their CRC check. The
+    functions that take a port name and return a result code are recorded, keyed on:
+        - (port, devId, regId)      register functions, e.g. registerWriteU32('COM5', 25, 0x90, ...)
+        - (port, devId)             device functions and registerRemoveAll / registerGetAll
+        - (port)                    port functions, e.g. openPorts
+    Each key gets a latency histogram (LATENCY_BINS_MS), the number of calls, their total and maximum duration, and a count of each
+    result code.
+
+    Telemetry is off by default, and then costs nothing: the wrappers call the DLL directly. Enabling it puts a timing wrapper
+    around the ctypes prototype of every function (see bindings.set_wrapper()), and disabling it removes the wrappers again.
+    Calls skipped by a RegisterCache never reach the DLL, so they aren't recorded.
+
+Usage:
+
+    import NKTP_DLL as nktp
+    nktp.enable_telemetry(log_interval=10)      # prints a summary line every 10 s
+    ...
+    stats = nktp.telemetry_snapshot()           # {'COM5/25/0x90': {'calls': ..., 'p99_ms': ..., 'results': {...}}, ...}
+    print(nktp.telemetry_log_line())
+    nktp.disable_telemetry()
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from . import bindings
+from .decoders import DeviceResultTypes, P2PPortResultTypes, PortResultTypes, RegisterResultTypes
+from .signatures import DEV_ID, REG_ID, Port
+
+# Upper edges of the latency histogram bins, in ms. The last bin holds all slower calls
+LATENCY_BINS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+_LATENCY_BINS = tuple(edge / 1000 for edge in LATENCY_BINS_MS)
+
+
+# Result code decoder of a function
+def result_decoder(name):
+    if name.startswith('register'):
+        return RegisterResultTypes
+    if name.startswith('device'):
+        return DeviceResultTypes
+    if name.startswith('pointToPoint'):
+        return P2PPortResultTypes
+    return PortResultTypes
+
+
+class RegisterStats:
+    __slots__ = ('decoder', 'calls', 'total', 'max', 'histogram', 'results')
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(_LATENCY_BINS) + 1)
+        self.results = {}
+
+    def add(self, latency, result):
+        self.calls += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+        self.histogram[bisect_left(_LATENCY_BINS, latency)] += 1
+        self.results[result] = self.results.get(result, 0) + 1
+
+    @property
+    def errors(self):
+        return self.calls - self.results.get(0, 0)
+
+    # Upper edge (ms) of the histogram bin holding the given fraction of the calls, or the maximum for the last bin
+    def percentile(self, fraction):
+        count = 0
+        for i, n in enumerate(self.histogram):
+            count += n
+            if count >= fraction * self.calls:
+                return LATENCY_BINS_MS[i] if i < len(LATENCY_BINS_MS) else self.max * 1000
+        return self.max * 1000
+
+    def summary(self):
+        bins = [f'<={edge} ms' for edge in LATENCY_BINS_MS] + [f'>{LATENCY_BINS_MS[-1]} ms']
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_s': self.total,
+            'mean_ms': self.total / self.calls * 1000 if self.calls else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max * 1000,
+            'histogram': {label: n for label, n in zip(bins, self.histogram) if n},
+            'results': {self.result_name(code): n for code, n in sorted(self.results.items())},
+        }
+
+    # e.g. '5:RegResultCRCErr', or '42:Unknown result' for codes the decoder doesn't know
+    def result_name(self, code):
+        name = self.decoder(code)
+        return name if name.startswith(f'{code}:') else f'{code}:{name}'
+
+
+# Name of a telemetry key, e.g. 'COM5/25/0x90'
+def key_name(key):
+    port, devId, regId = key
+    name = port.decode('ascii', 'replace')
+    if devId is not None:
+        name += f'/{devId}'
+    if regId is not None:
+        name += f'/{hex(regId)}'
+    return name
+
+
+class RegisterTelemetry:
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._stop = None
+
+    # Starts recording. With a log_interval (s), a summary line is printed that often until disable() is called
+    def enable(self, log_interval=None):
+        self.enabled = True
+        bindings.set_wrapper(self.instrument)
+        self._stop_logging()
+        if log_interval:
+            self._stop = threading.Event()
+            threading.Thread(target=self._log, args=(log_interval, self._stop), name='NKTP telemetry', daemon=True).start()
+
+    # Stops recording. The statistics are kept until reset()
+    def disable(self):
+        self.enabled = False
+        bindings.set_wrapper(None)
+        self._stop_logging()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def _stop_logging(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def _log(self, interval, stop):
+        while not stop.wait(interval):
+            print(self.log_line())
+
+    # Timing wrapper around the prototype of a function that takes a port name and returns a result code (see bindings.set_wrapper())
+    def instrument(self, name, sig, prototype):
+        arguments = sig.arguments
+        if sig.restype is None or not arguments or not isinstance(arguments[0], Port):
+            return None
+        has_dev = len(arguments) > 1 and arguments[1] == DEV_ID
+        has_reg = has_dev and len(arguments) > 2 and arguments[2] == REG_ID
+        decoder = result_decoder(name)
+        record = self.record
+
+        def timed(*args):
+            start = perf_counter()
+            result = prototype(*args)
+            record((args[0], args[1] if has_dev else None, args[2] if has_reg else None), result, perf_counter() - start, decoder)
+            return result
+        return timed
+
+    def record(self, key, result, latency, decoder=RegisterResultTypes):
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RegisterStats(decoder)
+            stats.add(latency, result)
+
+    # {key name: statistics}, with the keys taking the most time first
+    def snapshot(self):
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+            return {key_name(key): stats.summary() for key, stats in items}
+
+    # One line summary of the keys taking the most time
+    def log_line(self, top=5):
+        snapshot = self.snapshot()
+        if not snapshot:
+            return 'NKTP telemetry: no register calls'
+        parts = []
+        for name, stats in list(snapshot.items())[:top]:
+            part = (f'{name} {stats["calls"]} calls {stats["total_s"]:.2f} s, mean {stats["mean_ms"]:.2f} ms, '
+                    f'p99 {stats["p99_ms"]:g} ms, max {stats["max_ms"]:.1f} ms')
+            if stats['errors']:
+                errors = ', '.join(f'{result} x{n}' for result, n in stats['results'].items() if not result.startswith('0:'))
+                part += f', {stats["errors"]} errors ({errors})'
+            parts.append(part)
+        calls = sum(stats['calls'] for stats in snapshot.values())
+        return f'NKTP telemetry ({calls} calls): ' + '; '.join(parts)
+
+
+register_telemetry = RegisterTelemetry()
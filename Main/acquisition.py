@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Hypercube acquisition sweep.
+
+    HypercubeSweep holds the stages of the main wavelength sweep (tune the SELECT, grab a frame, read the spectrometer, store the
+    band) and runs them with SweepEngine. It is used by hyperspectral_imaging.py and by the benchmarks, so both run exactly the same
+    sweep.
+
+    BandSweep holds what HypercubeSweep shares with MultiplexedSweep (multiplexed_sweep.py): the register transactions, settling,
+    the camera and spectrometer captures and the SweepEngine they run on. The subclasses provide tune() and store().
+
+Usage:
+
+    sweep = HypercubeSweep(nktp, camera, spec, cube_store, Wavelengths, amplitudes, dark_reference=dark_reference, writer=writer)
+    total_intensities = sweep.run()
+    sweep.engine.timings        # per-stage durations of the last run, in seconds
+"""
+
+import numpy as np
+
+from aotf_settle import REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH
+from register_transactions import run_transaction
+from sweep_engine import SweepEngine
+
+
+class BandSweep:
+    def __init__(self, nktp, camera, spec, cube_store, wavelengths, amplitudes, port='COM5', dev_id=25, dark_reference=None,
+                 writer=None, exposure_time=None, settle_time=0.05, settle_waiter=None, port_worker=None, spectrometer_stream=None,
+                 verbose=True):
+        self.nktp = nktp
+        self.camera = camera
+        self.spec = spec
+        self.cube_store = cube_store
+        self.wavelengths = wavelengths
+        self.amplitudes = amplitudes
+        self.port = port
+        self.dev_id = dev_id
+        self.dark_reference = dark_reference
+        self.writer = writer
+        self.exposure_time = exposure_time
+        self.settle_time = settle_time
+        self.settle_waiter = settle_waiter
+        self.port_worker = port_worker
+        self.spectrometer_stream = spectrometer_stream
+        self.verbose = verbose
+        self.total_intensities = None
+        self._first_frame = 0
+        self._settings = {}
+
+        settle = self.settle if settle_waiter is not None else None
+        self.engine = SweepEngine(self.tune, self.capture_frame, self.capture_spectrum, self.store, settle=settle,
+                                  settle_time=settle_time, frame_exposed=self.frame_exposed)
+
+    def log(self, *args):
+        if self.verbose:
+            print(*args)
+
+    # Runs the register writes as one transaction, on the port worker if there is one, otherwise on the calling thread (the sweep
+    # engine's register worker). The settle waiter is told about them first
+    def transaction(self, writes):
+        if self.settle_waiter is not None:
+            self.settle_waiter.written(writes)
+        if self.port_worker is not None:
+            return self.port_worker.transaction(self.dev_id, writes)
+        return run_transaction(self.nktp, self.port, self.dev_id, writes)
+
+    # Returns as soon as the RF driver confirms the settings tune(i) wrote to the registers the settle waiter monitors, or after
+    # settle_time
+    def settle(self, i):
+        settings = self._settings.pop(i)
+        self.settle_waiter.wait({regId: value for regId, value in settings.items() if regId in self.settle_waiter.registers},
+                                self.settle_time)
+
+    # The camera returns None for a failed grab, which would otherwise only show up when the frame is stored
+    def grab(self, name, out=None):
+        if self.exposure_time is not None:
+            self.camera.set_exposure(self.exposure_time)
+        img = self.camera.grab(out=out)
+        if img is None:
+            raise RuntimeError(f'Camera: grab failed for the {name}')
+        return img
+
+    # Lets the engine retune the AOTF while the frame is read out
+    def frame_exposed(self, i):
+        self.camera.wait_exposure_end(self._first_frame + i + 1)
+
+    # With a spectrometer stream, the first spectrum exposed after the AOTF settled, otherwise a new reading
+    def capture_spectrum(self, i):
+        if self.spectrometer_stream is not None:
+            return self.spectrometer_stream.spectrum(after=self.engine.settled_at)
+        return self.spec.intensities()
+
+
+class HypercubeSweep(BandSweep):
+    # Register writes for one band as a single transaction
+    def tune(self, i):
+        lam = int(self.wavelengths[i])
+        amplitude = max(1, min(1000, int(self.amplitudes[i])))
+        result = self.transaction([('U32', REG_WAVELENGTH, lam), ('U16', REG_AMPLITUDE, amplitude), ('U8', REG_RF_POWER, 1)])
+
+        if self.verbose:
+            codes = [self.nktp.RegisterResultTypes(code) if code is not None else 'not sent' for code in result.results]
+            print('Setting wavelength', i + 1, codes[0])
+            print('Setting amplitude', amplitude, codes[1])
+            print('RF power ON', codes[2])
+
+        self._settings[i] = {REG_WAVELENGTH: lam, REG_AMPLITUDE: amplitude, REG_RF_POWER: 1}
+
+    # The frame is copied from the grab buffer straight into its band slot in the store
+    def capture_frame(self, i):
+        return self.grab(f'band {i + 1}', out=self.cube_store.band(i))
+
+    # Runs in band order on the engine's store worker, so the cumulative spectrum needs no locking
+    def store(self, i, img, intensities):
+        if self.writer is not None:
+            self.writer.write_band(i, self.cube_store.band(i), intensities)
+
+        normalized_intensities = intensities - self.dark_reference if self.dark_reference is not None else intensities
+
+        if self.total_intensities is None:
+            self.total_intensities = np.zeros_like(normalized_intensities)
+
+        self.total_intensities += normalized_intensities
+
+    def run(self):
+        self.total_intensities = None
+        self._first_frame = self.camera.frames_triggered
+        self.engine.run(len(self.wavelengths))
+        self.cube_store.flush()
+        return self.total_intensities
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Event-driven AOTF settling.
+
+    Settling used to be a fixed sleep after every register write (0.1 s in the calibration, 0.05 s in the sweep, up to 1 s in the Misc
+    scripts), which has to be long enough for the slowest case. SettleWaiter opens the SELECT port in live mode, asks the NKTP kernel
+    to monitor the wavelength, amplitude and RF power registers, and subscribes to the register callbacks. wait() then returns as
+    soon as the RF driver reports the values that were written, so the dead time per band is only what the hardware actually needs.
+    If the confirmation doesn't arrive within the timeout, wait() returns after the timeout, like the old fixed sleep.
+
+    A value reported before the write doesn't confirm it: after RF OFF (a failed probe) and RF ON again, the last event still says the
+    RF power is on. So the writes are passed to written() before they are sent, and a register that is written with a new value is
+    only confirmed by an event received after that. A register written with the value it already holds doesn't change and gets no
+    new event, so the value it last reported still counts.
+
+    The confirmation only says that the RF driver has taken the new values, so wait() always waits at least min_settle (MIN_SETTLE,
+    5 ms, by default) for the acoustic wave and the optical output to follow.
+
+    If the port can't be opened in live mode, or the registers can't be monitored, the waiter is not available and wait() simply
+    sleeps for the timeout. The port is opened and the registers are set up on the port's worker, if one is given (port_worker).
+
+Usage:
+
+    waiter = SettleWaiter(nktp, 'COM5', 25, timeout=0.1, port_worker=ports['COM5'])
+    writes = [('U32', 0x90, lam), ('U16', 0xB0, amplitude), ('U8', 0x30, 1)]
+    waiter.written(writes)
+    ports.transaction('COM5', 25, writes)
+    waiter.wait({0x90: lam, 0xB0: amplitude, 0x30: 1})
+    waiter.close()
+"""
+
+import threading
+from time import perf_counter, sleep
+
+from register_events import monitor_registers, register_events
+
+REG_RF_POWER = 0x30
+REG_WAVELENGTH = 0x90
+REG_AMPLITUDE = 0xB0
+
+# RegisterDataTypes, see NKTP_DLL
+RegData_U8 = 2
+RegData_U16 = 4
+RegData_U32 = 6
+RegSuccess = 0
+
+# Shortest time (s) wait() waits after the writes, even when the RF driver confirms them straight away
+MIN_SETTLE = 0.005
+
+
+# Registers to monitor for the first n_channels wavelength/amplitude channels of the SELECT (0x90-0x97, 0xB0-0xB7)
+def channel_registers(n_channels=1):
+    registers = {REG_RF_POWER: RegData_U8}
+    for channel in range(n_channels):
+        registers[REG_WAVELENGTH + channel] = RegData_U32
+        registers[REG_AMPLITUDE + channel] = RegData_U16
+    return registers
+
+
+REGISTER_TYPES = channel_registers(1)
+
+
+class SettleWaiter:
+    def __init__(self, nktp, port='COM5', dev_id=25, registers=REGISTER_TYPES, timeout=0.1, min_settle=MIN_SETTLE,
+                 port_worker=None):
+        self.nktp = nktp
+        self.port = port
+        self.dev_id = dev_id
+        self.timeout = timeout
+        self.min_settle = min_settle
+        self.registers = dict(registers)
+        self.values = {}
+        self.timeouts = 0
+        self._last_written = {}
+        self._marks = {}
+        self._sequence = 0
+        self.available = False
+        self._changed = threading.Condition()
+
+        self._events = register_events(nktp)
+        self._events.subscribe(self._on_register)
+        if monitor_registers(nktp, port, dev_id, registers, port_worker=port_worker) != 0:
+            print('Settle waiter: not available, using fixed settle times')
+            self._events.unsubscribe(self._on_register)
+            return
+        self.available = True
+
+    # Called by the NKTP kernel thread. Calling DLL functions from here is not allowed, so it only records the new value, numbered in
+    # the order the events arrive
+    def _on_register(self, event):
+        if event.dev_id != self.dev_id or event.port != self.port or event.status != RegSuccess or not event.data:
+            return
+        with self._changed:
+            self._sequence += 1
+            self.values[event.reg_id] = (event.value, self._sequence)
+            self._changed.notify_all()
+
+    # Called with the (type, regId, value) writes before they are sent. A monitored register that gets a new value (different from
+    # the last value written or reported) is only confirmed by an event received from now on
+    def written(self, writes):
+        with self._changed:
+            for _, regId, value in writes:
+                if regId not in self.registers:
+                    continue
+                value = int(value)
+                reported = self.values.get(regId)
+                if self._last_written.get(regId) != value or reported is None or reported[0] != value:
+                    self._marks[regId] = self._sequence
+                self._last_written[regId] = value
+
+    def _confirmed(self, expected):
+        for regId, value in expected.items():
+            reported = self.values.get(regId)
+            if reported is None or reported[0] != value or reported[1] <= self._marks.get(regId, 0):
+                return False
+        return True
+
+    # Waits until every register in expected (regId: value) has been confirmed by the device. Returns False on timeout
+    def wait(self, expected, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        start = perf_counter()
+
+        if not self.available:
+            sleep(timeout)
+            return False
+
+        expected = {regId: int(value) for regId, value in expected.items()}
+        with self._changed:
+            confirmed = self._changed.wait_for(lambda: self._confirmed(expected), timeout)
+        if not confirmed:
+            self.timeouts += 1
+
+        remaining = self.min_settle - (perf_counter() - start)
+        if remaining > 0:
+            sleep(remaining)
+        return confirmed
+
+    def close(self):
+        if self.available:
+            self._events.unsubscribe(self._on_register)
+            self.available = False
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Device backends.
+
+    The acquisition code talks to the hardware through a backend object, so the same calibration and sweep can run against the real
+    devices or against the in-process simulator (simulator.py):
+        - backend.nktp                              the NKTP_DLL register API (the module itself for the hardware backend)
+        - backend.open_spectrometer(serial)         a seabreeze style Spectrometer
+        - backend.open_camera(exposure_time)        a CameraSession style camera, the first one found or the one with the given
+                                                    serial_number
+        - backend.list_cameras()                    the serial numbers of the cameras attached, and
+          backend.list_spectrometers()              of the spectrometers. Enumerating the devices is slow, so the main script
+                                                    only does it when the cached ones are gone (see device_discovery.py)
+        - backend.place_reference(kind)             waits for the 'dark' or 'white' reference to be placed
+        - backend.remove_reference()                goes back to measuring the sample
+
+    The backend is chosen with load_backend(name), where name is 'hardware' or 'simulator'. If no name is given, the HSI_BACKEND
+    environment variable is used, falling back to 'hardware'. e.g. to run the main script without any devices attached:
+
+        HSI_BACKEND=simulator python hyperspectral_imaging.py
+
+    The device libraries (NKTP_DLL, seabreeze, pypylon) are only imported by the hardware backend, and only when they are needed.
+"""
+
+import os
+from time import sleep
+
+from simulator import SimulatedCamera, SimulatedNKTP, SimulatedSpectrometer
+
+
+class HardwareBackend:
+    name = 'hardware'
+
+    def __init__(self):
+        import NKTP_DLL
+        self.nktp = NKTP_DLL
+
+    def open_spectrometer(self, serial_number):
+        from seabreeze.spectrometers import Spectrometer
+        return Spectrometer.from_serial_number(serial_number)
+
+    def open_camera(self, exposure_time=None, serial_number=None, **options):
+        from camera_session import CameraSession
+        if serial_number is not None:
+            from pypylon import pylon
+            info = pylon.CDeviceInfo()
+            info.SetSerialNumber(str(serial_number))
+            options['device'] = pylon.TlFactory.GetInstance().CreateDevice(info)
+        return CameraSession(exposure_time, **options)
+
+    def list_cameras(self):
+        from pypylon import pylon
+        return [device.GetSerialNumber() for device in pylon.TlFactory.GetInstance().EnumerateDevices()]
+
+    def list_spectrometers(self):
+        from seabreeze.spectrometers import list_devices
+        return [device.serial_number for device in list_devices()]
+
+    def place_reference(self, kind):
+        input()
+
+    def remove_reference(self):
+        pass
+
+
+class SimulatedBackend:
+    name = 'simulator'
+
+    def __init__(self, register_latency=0.002, settle_time=0.02, frame_shape=(480, 640), spectrometer_pixels=2048, seed=None,
+                 bus_scan_time=2.0, enumeration_time=0.5, camera_serial='SIM-CAMERA-0001', spectrometer_serial='HR2B1032'):
+        self.nktp = SimulatedNKTP(register_latency=register_latency, settle_time=settle_time, bus_scan_time=bus_scan_time)
+        self.frame_shape = frame_shape
+        self.spectrometer_pixels = spectrometer_pixels
+        self.seed = seed
+        self.spectrometer = None
+        self.enumeration_time = enumeration_time
+        self.camera_serial = camera_serial
+        self.spectrometer_serial = spectrometer_serial
+
+    def open_spectrometer(self, serial_number):
+        self.spectrometer = SimulatedSpectrometer(self.nktp, serial_number=serial_number, pixels=self.spectrometer_pixels,
+                                                  seed=self.seed)
+        return self.spectrometer
+
+    def open_camera(self, exposure_time=None, serial_number=None, **options):
+        if serial_number is not None and serial_number != self.camera_serial:
+            raise RuntimeError(f'No camera with serial number {serial_number}')
+        return SimulatedCamera(self.nktp, exposure_time, shape=self.frame_shape, serial_number=self.camera_serial)
+
+    def list_cameras(self):
+        sleep(self.enumeration_time)
+        return [self.camera_serial]
+
+    def list_spectrometers(self):
+        sleep(self.enumeration_time)
+        return [self.spectrometer_serial]
+
+    def place_reference(self, kind):
+        self.spectrometer.place(kind)
+
+    def remove_reference(self):
+        self.spectrometer.place(None)
+
+
+BACKENDS = {
+    'hardware': HardwareBackend,
+    'simulator': SimulatedBackend,
+}
+
+
+def load_backend(name=None, **options):
+    name = name or os.environ.get('HSI_BACKEND', 'hardware')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**options)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming HDF5 writer for the sweep.
+
+    BandWriter appends each band to a chunked, compressed HDF5 file on a background thread while the sweep is running, so the data
+    is on disk as soon as it is captured and the acquisition loop never waits for the disk. Calls to write_band() only put the band on
+    a queue and return immediately.
+
+File layout:
+
+    /hypercube                  (N_wavelengths, height, width) camera frames, one gzip compressed chunk per band
+    /wavelengths                (N_wavelengths,) AOTF wavelengths in pm
+    /spectra                    (N_wavelengths, N_pixels) spectrometer reading taken with each band
+    /spectrometer_wavelengths   (N_pixels,) spectrometer wavelength axis in nm
+    attributes                  exposure_time_us, integration_time_us and anything else passed in attrs
+
+    The file can be read back with h5py, e.g. h5py.File('hypercube.h5')['hypercube'][i] for band i. An existing file is never
+    replaced unless overwrite=True, like HypercubeStore.
+"""
+
+import os
+import queue
+import threading
+
+import h5py
+import numpy as np
+
+
+class BandWriter:
+    def __init__(self, path, n_bands, height, width, wavelengths, dtype=np.uint16, spectrometer_wavelengths=None,
+                 exposure_time=None, integration_time=None, attrs=None, compression='gzip', compression_opts=4, overwrite=False):
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f'{path} already exists, pass overwrite=True to replace it')
+        self.path = path
+        self.n_bands = n_bands
+        self.error = None
+
+        self.file = h5py.File(path, 'w')
+        self.cube = self.file.create_dataset('hypercube', shape=(n_bands, height, width), dtype=dtype, chunks=(1, height, width),
+                                             compression=compression, compression_opts=compression_opts, shuffle=True)
+        self.file.create_dataset('wavelengths', data=np.asarray(wavelengths))
+        self.file['wavelengths'].attrs['units'] = 'pm'
+        if spectrometer_wavelengths is not None:
+            self.file.create_dataset('spectrometer_wavelengths', data=np.asarray(spectrometer_wavelengths))
+            self.file['spectrometer_wavelengths'].attrs['units'] = 'nm'
+        self.spectra = None
+
+        if exposure_time is not None:
+            self.file.attrs['exposure_time_us'] = exposure_time
+        if integration_time is not None:
+            self.file.attrs['integration_time_us'] = integration_time
+        for key, value in (attrs or {}).items():
+            self.file.attrs[key] = value
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='band-writer', daemon=True)
+        self._thread.start()
+
+    # Queue band i for writing. img must not be modified until the writer is closed (a band slot of a HypercubeStore is fine)
+    def write_band(self, i, img, spectrum=None):
+        self._queue.put(('band', i, img, spectrum))
+
+    def write_dataset(self, name, data):
+        self._queue.put(('dataset', name, data, None))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                kind, key, data, spectrum = item
+                if kind == 'dataset':
+                    self.file.create_dataset(key, data=np.asarray(data))
+                    continue
+                self.cube[key] = data
+                if spectrum is not None:
+                    if self.spectra is None:
+                        self.spectra = self.file.create_dataset('spectra', shape=(self.n_bands, len(spectrum)), dtype=np.float64,
+                                                                chunks=(1, len(spectrum)), compression='gzip')
+                    self.spectra[key] = spectrum
+            except Exception as e:
+                self.error = e
+                print('Band writer error:', e)
+
+    # Waits for the queued bands to be written, then closes the file
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self.file.close()
+        if self.error is not None:
+            raise self.error
+        print(f'Hypercube saved to {self.path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
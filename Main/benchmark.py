@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Acquisition benchmarks.
+
+    Runs the power normalisation and the hypercube sweep, exactly as hyperspectral_imaging.py does, for a range of sweep sizes and
+    frame sizes, and reports where the time goes:
+        - wall time of the calibration and of the sweep
+        - p50/p95/p99 latency of every stage (register writes, settling, spectrometer, camera, storing)
+        - bands per second
+        - peak memory allocated during the run (tracemalloc) and the peak resident size of the process (not on Windows, where the
+          resource module doesn't exist)
+
+    By default the simulator backend is used (see backends.py), so the benchmarks run on any machine. The results are written as JSON
+    so that runs from different commits can be compared. The device timings of a run on the hardware can be recorded (--record), and
+    replayed later on the simulator (--replay), see device_recording.py.
+
+Usage:
+
+    python benchmark.py                                         # 10 and 100 bands, VGA and 5 MP frames
+    python benchmark.py --bands 10 200 1000 --frames vga        # larger sweeps
+    python benchmark.py --no-calibration --output results.json
+    python benchmark.py --multiplex 7 --exposure-time 1000      # S-matrix multiplexed sweep
+    python benchmark.py --no-settle-waiter                      # fixed settle times, for comparison
+    python benchmark.py --p2p udp                               # SELECT on an Ethernet (point-to-point) port
+    python benchmark.py --line-width 0                          # calibrate on the nearest spectrometer pixel only
+    python benchmark.py --stream                                # spectrometer read continuously on a background thread
+    python benchmark.py --calibrate-on camera --target-count 50 # power normalisation on a camera ROI
+    python benchmark.py --backend hardware --record timings.json # record the device timings on the hardware
+    python benchmark.py --replay timings.json                   # the simulator with the recorded device timings
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+
+from acquisition import HypercubeSweep
+from aotf_settle import SettleWaiter, channel_registers
+from backends import load_backend
+from band_writer import BandWriter
+from device_recording import DeviceRecorder, ReplayBackend, load_timings
+from hypercube_store import HypercubeStore
+from multiplexed_sweep import MultiplexedSweep
+from point_to_point import point_to_point_port
+from power_calibration import PowerCalibrator
+from power_meters import CameraROIMeter, SpectrometerMeter
+from register_cache import RegisterCache
+from port_manager import PortManager
+from simulator import PointToPointStandIn
+from spectrometer_references import ReferenceLibrary, white_calibration
+from spectrometer_session import SpectrometerSession
+from spectrometer_stream import SpectrometerStreamer
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+FRAME_SIZES = {
+    'vga': (480, 640),
+    '1mp': (1024, 1280),
+    '5mp': (2048, 2448),
+}
+
+
+def stage_stats(timings):
+    stats = {}
+    for stage, durations in timings.items():
+        if not durations:
+            continue
+        ms = np.asarray(durations) * 1000
+        stats[stage] = {
+            'count': len(ms),
+            'total_s': float(ms.sum() / 1000),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p95_ms': float(np.percentile(ms, 95)),
+            'p99_ms': float(np.percentile(ms, 99)),
+        }
+    return stats
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Peak resident size of the process, or None where the resource module isn't available
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+
+# replay_timings are the device timings to replay on the simulator, and recorder records the device timings of the run
+def run_benchmark(n_bands, frame_shape, args, workdir, replay_timings=None, recorder=None):
+    if replay_timings is not None:
+        backend = ReplayBackend(replay_timings, frame_shape=frame_shape)
+    elif args.backend == 'simulator':
+        backend = load_backend(args.backend, frame_shape=frame_shape)
+    else:
+        backend = load_backend(args.backend)
+    if recorder is not None:
+        recorder.wrap(backend)
+    nktp = RegisterCache(backend.nktp, enabled=args.register_cache)
+    wavelengths = np.linspace(args.wavelength_min, args.wavelength_max, n_bands)
+    result = {'bands': n_bands, 'frame_shape': list(frame_shape), 'backend': backend.name}
+
+    # With --p2p the SELECT is reached through a point-to-point port to a local stand-in rather than COM5
+    select = 'COM5'
+    point_to_point = {}
+    stand_in = None
+    if args.p2p:
+        stand_in = PointToPointStandIn(args.p2p)
+        select = 'SELECT-ETH'
+        point_to_point[select] = point_to_point_port('127.0.0.1', 0, stand_in.address, stand_in.port, args.p2p)
+    result['select_port'] = select
+
+    tracemalloc.start()
+    ports = PortManager(nktp, ['COM4', select], live_ports=[select], point_to_point=point_to_point).open()
+    select_port = ports[select]
+    ports.call('COM4', 'registerWriteU8', 1, 0x30, 1, -1)
+    spec = SpectrometerSession(backend.open_spectrometer(args.spectrometer), integration_time=args.integration_time)
+
+    library = ReferenceLibrary(os.path.join(workdir, 'reference_cache'))
+    start = perf_counter()
+    dark, white = library.references(spec, args.integration_time, args.reference_frames, place=backend.place_reference,
+                                     remove=backend.remove_reference)
+    result['references_s'] = perf_counter() - start
+    dark_reference = dark.mean
+    calibration_factors = white_calibration(dark.mean, white.mean)
+    spec_wavelengths = spec.wavelengths()
+    spec.set_bands(wavelengths / 1000, line_width_nm=args.line_width)
+    result['line_width_nm'] = args.line_width
+
+    camera = backend.open_camera(args.exposure_time)
+    if args.calibrate_on == 'camera':
+        ports.call(select, 'registerWriteU8', 25, 0x30, 0, -1)
+        meter = CameraROIMeter(camera, args.exposure_time)
+        meter.capture_dark()
+    else:
+        meter = SpectrometerMeter(spec, args.integration_time, dark_reference, calibration_factors)
+    result['calibrate_on'] = args.calibrate_on
+    settle_waiter = None
+    if args.settle_waiter:
+        settle_waiter = SettleWaiter(nktp, select, 25, registers=channel_registers(8 if args.multiplex else 1),
+                                     timeout=args.settle_time, port_worker=select_port)
+
+    if args.calibration:
+        calibrator = PowerCalibrator(nktp, meter, args.target_count, args.tolerance, args.max_iterations,
+                                     port=select, dev_id=25, settle_waiter=settle_waiter, port_worker=select_port,
+                                     verbose=False)
+        start = perf_counter()
+        amplitudes, counts = calibrator.calibrate(wavelengths)
+        elapsed = perf_counter() - start
+        result['calibration'] = {
+            'wall_time_s': elapsed,
+            'bands_per_s': n_bands / elapsed,
+            'mean_iterations': float(np.mean(calibrator.iterations)),
+            'stages': stage_stats(calibrator.timings),
+        }
+    else:
+        amplitudes = np.full(n_bands, 500)
+
+    height, width = camera.shape
+    # The runs share the temporary directory, so each one replaces the files of the previous one
+    cube_store = HypercubeStore(os.path.join(workdir, 'hypercube.npy'), n_bands, height, width, overwrite=True)
+    writer = None
+    if args.writer:
+        writer = BandWriter(os.path.join(workdir, 'hypercube.h5'), n_bands, height, width, wavelengths,
+                            spectrometer_wavelengths=spec_wavelengths, exposure_time=args.exposure_time,
+                            integration_time=args.integration_time, overwrite=True)
+    sweep_class = HypercubeSweep
+    options = {}
+    if args.multiplex:
+        sweep_class = MultiplexedSweep
+        options['order'] = args.multiplex
+    stream = SpectrometerStreamer(spec, args.integration_time) if args.stream else None
+    sweep = sweep_class(nktp, camera, spec, cube_store, wavelengths, amplitudes, port=select, dev_id=25,
+                        dark_reference=dark_reference, writer=writer, exposure_time=args.exposure_time,
+                        settle_time=args.settle_time, settle_waiter=settle_waiter, port_worker=select_port,
+                        spectrometer_stream=stream, verbose=False, **options)
+    start = perf_counter()
+    if stream is not None:
+        stream.start()
+    sweep.run()
+    if stream is not None:
+        stream.close()
+        result['spectra_streamed'] = stream.count
+    if writer is not None:
+        writer.close()
+    elapsed = perf_counter() - start
+    result['sweep'] = {
+        'wall_time_s': elapsed,
+        'bands_per_s': n_bands / elapsed,
+        'stages': stage_stats(sweep.engine.timings),
+    }
+
+    rf_off = ports.submit(select, 'registerWriteU8', 25, 0x30, 0, -1)
+    emission_off = ports.submit('COM4', 'registerWriteU8', 1, 0x30, 0, -1)
+    rf_off.result()
+    emission_off.result()
+    result['register_writes'] = {'sent': nktp.written, 'skipped': nktp.skipped}
+    if settle_waiter is not None:
+        result['settle_timeouts'] = settle_waiter.timeouts
+        settle_waiter.close()
+    camera.close()
+    spec.close()
+    ports.close()
+    if stand_in is not None:
+        stand_in.close()
+
+    result['peak_traced_memory_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    result['peak_rss_mb'] = peak_rss_mb()
+    tracemalloc.stop()
+    del cube_store
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the calibration and hypercube sweep.')
+    parser.add_argument('--bands', type=int, nargs='+', default=[10, 100], help='sweep sizes (number of wavelengths)')
+    parser.add_argument('--frames', nargs='+', default=['vga', '5mp'], choices=sorted(FRAME_SIZES), help='camera frame sizes')
+    parser.add_argument('--backend', default='simulator', help="device backend, 'simulator' or 'hardware'")
+    parser.add_argument('--spectrometer', default='HR2B1032', help='spectrometer serial number')
+    parser.add_argument('--wavelength-min', type=int, default=500000, help='pm')
+    parser.add_argument('--wavelength-max', type=int, default=650000, help='pm')
+    parser.add_argument('--exposure-time', type=float, default=5000.0, help='camera exposure time (us)')
+    parser.add_argument('--integration-time', type=int, default=5000, help='spectrometer integration time (us)')
+    parser.add_argument('--settle-time', type=float, default=0.05, help='AOTF settle time in the sweep (s)')
+    parser.add_argument('--no-settle-waiter', dest='settle_waiter', action='store_false',
+                        help='sleep for the settle time instead of waiting for the AOTF register callbacks')
+    parser.add_argument('--no-register-cache', dest='register_cache', action='store_false',
+                        help='send every register write, even when the value is unchanged')
+    parser.add_argument('--target-count', type=int, default=1000)
+    parser.add_argument('--tolerance', type=int, default=50)
+    parser.add_argument('--max-iterations', type=int, default=10)
+    parser.add_argument('--reference-frames', type=int, default=10, help='spectrometer readings averaged per reference')
+    parser.add_argument('--calibrate-on', choices=['spectrometer', 'camera'], default='spectrometer',
+                        help='what the power normalisation measures')
+    parser.add_argument('--line-width', type=float, default=2.0,
+                        help='FWHM (nm) of the AOTF line fitted to the spectrometer pixels of a band, 0 for the nearest pixel')
+    parser.add_argument('--no-calibration', dest='calibration', action='store_false', help='only benchmark the sweep')
+    parser.add_argument('--multiplex', type=int, default=0, metavar='ORDER',
+                        help='run a multiplexed sweep with an S-matrix of this order (3, 7 or 15) instead of band by band')
+    parser.add_argument('--p2p', choices=['udp', 'tcp'],
+                        help='reach the SELECT through a point-to-point port to a local UDP/TCP stand-in (simulator only)')
+    parser.add_argument('--stream', action='store_true', help='read the spectrometer on a background thread during the sweep')
+    parser.add_argument('--no-writer', dest='writer', action='store_false', help='do not stream the sweep to HDF5')
+    parser.add_argument('--record', metavar='PATH', help='record the device timings of the runs to a JSON file')
+    parser.add_argument('--replay', metavar='PATH', help='run the simulator with the device timings recorded in a JSON file')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file to write the results to')
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': vars(args),
+        'results': [],
+    }
+
+    replay_timings = load_timings(args.replay) if args.replay else None
+    recorder = DeviceRecorder() if args.record else None
+    with tempfile.TemporaryDirectory() as workdir:
+        for frame in args.frames:
+            for n_bands in args.bands:
+                result = run_benchmark(n_bands, FRAME_SIZES[frame], args, workdir, replay_timings, recorder)
+                result['frames'] = frame
+                report['results'].append(result)
+
+                line = f'{n_bands:5d} bands, {frame:>4}:'
+                if 'calibration' in result:
+                    line += f" calibration {result['calibration']['wall_time_s']:7.2f} s ({result['calibration']['mean_iterations']:.1f} probes/band),"
+                line += f" sweep {result['sweep']['wall_time_s']:7.2f} s ({result['sweep']['bands_per_s']:.1f} bands/s),"
+                line += f" peak memory {result['peak_traced_memory_mb']:.0f} MB"
+                print(line)
+
+    if recorder is not None:
+        recorder.save(args.record)
+        print(f'Device timings recorded to {args.record}')
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results saved to {args.output}')
+    return report
+
+
+if __name__ == '__main__':
+    main()
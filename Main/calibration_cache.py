@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of power normalisation results, keyed by the hardware configuration.
+
+    A full power normalisation takes many minutes, but on a stable rig the amplitudes barely change from one day to the next.
+    CalibrationCache keeps every calibration in a directory (calibration_cache/ by default), keyed by:
+        - the SELECT module serial number (deviceGetModuleSerialNumberStr)
+        - the spectrometer serial number
+        - the spectrometer integration time
+        - the target count
+        - the wavelength grid
+        - the spectrometer readout, if it isn't the nearest pixel (e.g. a band-integrated readout, see spectrometer_session.py)
+    When a calibration for the same key is found, it is checked by measuring a few spot wavelengths at the cached amplitudes. A spot
+    has drifted when its count differs from the count cached for it by more than drift_tolerance (DRIFT_TOLERANCE, 5 %, by default)
+    of that count. Comparing with the cached count rather than the target means that a band the calibration couldn't bring to the
+    target (e.g. one out of power at the edge of the range) isn't recalibrated every time. Only the bands around a drifted spot are
+    recalibrated (starting from the cached amplitudes); the rest of the table is reused as it is.
+
+Files:
+
+    calibration_cache/index.json        the key and save time of every cached calibration
+    calibration_cache/<id>.csv          the calibration itself, in the same format as calibration_results.csv
+
+Usage:
+
+    cache = CalibrationCache()
+    key = cache.make_key(select_serial, spec.serial_number, spec_integration_time, TARGET_COUNT, Wavelengths)
+    final_amplitudes, final_counts = cache.calibrate(key, calibrator, Wavelengths)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from power_calibration import load_calibration, save_calibration
+
+# Largest relative change of a spot count from its cached count before the bands around it are recalibrated
+DRIFT_TOLERANCE = 0.05
+
+
+class CalibrationCache:
+    def __init__(self, directory='calibration_cache'):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+
+    @staticmethod
+    def make_key(select_serial, spectrometer_serial, integration_time, target_count, wavelengths, readout=None):
+        if isinstance(select_serial, bytes):
+            select_serial = select_serial.decode('ascii', 'replace')
+        key = {
+            'select_serial': str(select_serial),
+            'spectrometer_serial': str(spectrometer_serial),
+            'integration_time_us': int(integration_time),
+            'target_count': float(target_count),
+            'wavelengths_pm': [int(w) for w in wavelengths],
+        }
+        if readout:
+            key['readout'] = str(readout)
+        return key
+
+    @staticmethod
+    def key_id(key):
+        return hashlib.sha1(json.dumps(key, sort_keys=True).encode('ascii')).hexdigest()[:16]
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    # Returns the cached wavelengths, amplitudes and counts for key, or None
+    def load(self, key):
+        entry = self._read_index().get(self.key_id(key))
+        if entry is None or entry['key'] != key:
+            return None
+        path = os.path.join(self.directory, entry['file'])
+        if not os.path.exists(path):
+            return None
+        return load_calibration(path)
+
+    def save(self, key, wavelengths, amplitudes, counts):
+        os.makedirs(self.directory, exist_ok=True)
+        key_id = self.key_id(key)
+        filename = f'{key_id}.csv'
+        save_calibration(os.path.join(self.directory, filename), wavelengths, amplitudes, counts)
+
+        index = self._read_index()
+        index[key_id] = {'key': key, 'file': filename, 'saved': datetime.now().isoformat(timespec='seconds')}
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, indent=1)
+
+    # Boolean mask of the bands to recalibrate. n_checks spot wavelengths, spread over the grid, are measured at their cached
+    # amplitude. A spot whose count has moved from its cached count by more than drift_tolerance (relative) marks every band between
+    # its neighbouring spots
+    def drifted_bands(self, calibrator, wavelengths, amplitudes, counts, n_checks=5, drift_tolerance=DRIFT_TOLERANCE):
+        n_bands = len(wavelengths)
+        spots = np.unique(np.round(np.linspace(0, n_bands - 1, min(n_checks, n_bands))).astype(int))
+        drifted = np.zeros(n_bands, dtype=bool)
+
+        for k, i in enumerate(spots):
+            count = calibrator.probe(wavelengths[i], amplitudes[i])
+            if abs(count - counts[i]) <= drift_tolerance * max(abs(counts[i]), 1):
+                continue
+            print(f'Calibration has drifted at {int(wavelengths[i])} pm (count {count:.0f}, was {counts[i]:.0f})')
+            start = spots[k - 1] + 1 if k > 0 else 0
+            stop = spots[k + 1] if k + 1 < len(spots) else n_bands
+            drifted[start:stop] = True
+
+        return drifted
+
+    # Returns the amplitudes and counts for the wavelengths, reusing the cached calibration for key where it is still valid.
+    # initial_amplitudes is passed on to the calibrator when there is nothing cached for key
+    def calibrate(self, key, calibrator, wavelengths, initial_amplitudes=None, n_checks=5, drift_tolerance=DRIFT_TOLERANCE):
+        wavelengths = np.asarray(wavelengths)
+        cached = self.load(key)
+
+        if cached is None:
+            print('No cached calibration for this setup, calibrating all bands')
+            amplitudes, counts = calibrator.calibrate(wavelengths, initial_amplitudes)
+            self.save(key, wavelengths, amplitudes, counts)
+            return amplitudes, counts
+
+        _, amplitudes, counts = cached
+        drifted = self.drifted_bands(calibrator, wavelengths, amplitudes, counts, n_checks, drift_tolerance)
+        if not drifted.any():
+            print('Cached calibration is still valid')
+            return amplitudes, counts
+
+        print(f'Recalibrating {drifted.sum()} of {len(wavelengths)} bands')
+        amplitudes[drifted], counts[drifted] = calibrator.calibrate(wavelengths[drifted], amplitudes[drifted])
+        self.save(key, wavelengths, amplitudes, counts)
+        return amplitudes, counts
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent Basler camera session.
+
+    Opening and closing the camera for every wavelength (camera.Open(), ExposureTime.SetValue, StartGrabbing(1), RetrieveResult,
+    camera.Close()) costs hundreds of milliseconds per band on a USB3 camera. CameraSession opens the pylon InstantCamera once, puts it
+    in software trigger mode and keeps it grabbing for the whole session, with a fixed pool of grab buffers allocated up front. Each call
+    to grab() fires one software trigger and returns the resulting frame. The exposure time is only written to the camera when it
+    actually changes.
+
+Usage:
+
+    camera = CameraSession(exposure_time=74920.0)
+    img = camera.grab()                 # returns a new array
+    camera.grab(out=hypercube_band)     # copies the frame straight into an existing array
+    camera.close()
+"""
+
+import threading
+from time import perf_counter, sleep
+
+import numpy as np
+from pypylon import pylon
+
+
+class CameraSession:
+    def __init__(self, exposure_time=None, n_buffers=4, timeout_ms=2000, device=None):
+        self.timeout_ms = timeout_ms
+        self.exposure_time = None
+        self.frames_grabbed = 0
+        self.frames_triggered = 0
+        self.trigger_error = None
+        self._exposure_end = 0.0
+        self._triggered = threading.Condition()
+
+        tl_factory = pylon.TlFactory.GetInstance()
+        self.camera = pylon.InstantCamera()
+        self.camera.Attach(device if device is not None else tl_factory.CreateFirstDevice())
+        self.camera.Open()
+        self.serial_number = self.camera.GetDeviceInfo().GetSerialNumber()
+
+        # Frames are only exposed when we ask for them
+        self.camera.TriggerSelector.SetValue('FrameStart')
+        self.camera.TriggerMode.SetValue('On')
+        self.camera.TriggerSource.SetValue('Software')
+
+        if exposure_time is not None:
+            self.set_exposure(exposure_time)
+
+        # pylon allocates MaxNumBuffer buffers when grabbing starts and reuses them for every frame
+        self.camera.MaxNumBuffer.SetValue(n_buffers)
+        self.camera.StartGrabbing(pylon.GrabStrategy_OneByOne)
+
+        self.height = self.camera.Height.GetValue()
+        self.width = self.camera.Width.GetValue()
+        print(f'Camera: OPEN ({self.width}x{self.height})')
+
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    def set_exposure(self, exposure_time):
+        if exposure_time != self.exposure_time:
+            self.camera.ExposureTime.SetValue(exposure_time)
+            self.exposure_time = exposure_time
+
+    # A failed trigger is kept in trigger_error and wakes up wait_exposure_end(), which raises it instead of waiting for a frame
+    # that was never triggered
+    def trigger(self):
+        try:
+            self.camera.WaitForFrameTriggerReady(self.timeout_ms, pylon.TimeoutHandling_ThrowException)
+            self.camera.ExecuteSoftwareTrigger()
+        except Exception as error:
+            with self._triggered:
+                self.trigger_error = error
+                self._triggered.notify_all()
+            raise
+        with self._triggered:
+            self.trigger_error = None
+            self.frames_triggered += 1
+            self._exposure_end = perf_counter() + (self.exposure_time or 0) / 1e6
+            self._triggered.notify_all()
+
+    # Stops and restarts grabbing, which drops the frames still queued, e.g. a frame that arrived after its retrieve() timed out
+    def _restart_grabbing(self):
+        self.camera.StopGrabbing()
+        self.camera.StartGrabbing(pylon.GrabStrategy_OneByOne)
+
+    # A frame that doesn't arrive in time would still be queued, and returned for the next trigger instead of that trigger's own
+    # frame, so a timeout drops the queued frames and raises
+    def retrieve(self, out=None):
+        grab = self.camera.RetrieveResult(self.timeout_ms, pylon.TimeoutHandling_Return)
+        if grab is None or not grab.IsValid():
+            self._restart_grabbing()
+            raise TimeoutError(f'Camera: no frame within {self.timeout_ms} ms of the trigger')
+        try:
+            if not grab.GrabSucceeded():
+                print('Camera: grab failed', grab.GetErrorCode(), grab.GetErrorDescription())
+                return None
+            if out is None:
+                return grab.GetArray()
+            # Copy from the pylon buffer straight into the caller's array
+            if hasattr(grab, 'GetArrayZeroCopy'):
+                with grab.GetArrayZeroCopy() as img:
+                    np.copyto(out, img)
+            else:
+                np.copyto(out, grab.GetArray())
+            return out
+        finally:
+            grab.Release()
+            self.frames_grabbed += 1
+
+    def grab(self, out=None):
+        self.trigger()
+        return self.retrieve(out)
+
+    # Blocks until the sensor has finished integrating the n-th triggered frame (counted from 1), so the light source can be
+    # changed while that frame is still being read out. Raises if the trigger failed, or if the frame isn't triggered within the
+    # timeout (the trigger timeout by default)
+    def wait_exposure_end(self, n, timeout=None):
+        timeout = self.timeout_ms / 1000 if timeout is None else timeout
+        with self._triggered:
+            self._triggered.wait_for(lambda: self.frames_triggered >= n or self.trigger_error is not None, timeout)
+            if self.frames_triggered < n:
+                if self.trigger_error is not None:
+                    raise RuntimeError(f'Camera: trigger failed ({self.trigger_error})') from self.trigger_error
+                raise TimeoutError(f'Camera: frame {n} not triggered within {timeout} s')
+            remaining = self._exposure_end - perf_counter()
+        if remaining > 0:
+            sleep(remaining)
+
+    def close(self):
+        if self.camera.IsGrabbing():
+            self.camera.StopGrabbing()
+        if self.camera.IsOpen():
+            self.camera.Close()
+        print('Camera: Closed')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
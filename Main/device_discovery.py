@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Cached device discovery, for a fast session start.
+
+    Finding the devices is the slowest part of starting a session: openPorts with autoMode 1 scans the whole bus of a port (up to
+    20 s), and enumerating the cameras (pylon EnumerateDevices) or the spectrometers (seabreeze list_devices) takes seconds more.
+    The devices on the rig hardly ever change, so DeviceDiscovery keeps the last topology it found in a JSON file
+    (device_cache.json by default):
+        - the NKTP devices on every port, {port: {devId: device type}}, as found by deviceGetAllTypes after a bus scan
+        - the serial numbers of the cameras and of the spectrometers
+    At the start of a session, discover() checks the cached NKTP devices of every port on the port's worker (the ports are checked
+    in parallel), with deviceCreate, deviceExists and deviceGetType, which only talk to the cached devIds. The bus is only scanned
+    on the ports where a device is missing or has changed type, or that aren't in the cache yet.
+    The camera and the spectrometer are opened straight from their cached serial numbers. They are only enumerated when nothing
+    is cached yet, or when the cached device can't be opened. seabreeze looks the spectrometers up itself when opening one by its
+    serial number, so the spectrometer saves the extra list_devices call rather than the whole enumeration.
+
+    The ports must be open (see port_manager.py): discover() never closes them, a bus scan reopens the port with autoMode 1.
+    Delete the cache file, or call discover(force=True), to scan everything again.
+
+Usage:
+
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        discovery = DeviceDiscovery(backend, ports)
+        devices = discovery.discover()                       # {'COM4': {1: 0x74}, 'COM5': {25: 0x67}}
+        spec = discovery.open_spectrometer('HR2B1032')
+        camera = discovery.open_camera(exposure_time)
+"""
+
+import json
+import os
+from datetime import datetime
+from time import perf_counter
+
+DEVICE_KINDS = {'cameras': 'camera', 'spectrometers': 'spectrometer'}
+
+
+class DeviceDiscovery:
+    def __init__(self, backend, ports, path='device_cache.json'):
+        self.backend = backend
+        self.ports = ports
+        self.nktp = ports.nktp
+        self.path = path
+        self.topology = self._load()
+        self.scanned = []
+
+    def _load(self):
+        topology = {'ports': {}, 'cameras': [], 'spectrometers': []}
+        if not os.path.exists(self.path):
+            return topology
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+            topology['ports'] = {port: {int(devId): int(devType) for devId, devType in devices.items()}
+                                 for port, devices in cached['ports'].items()}
+            for kind in DEVICE_KINDS:
+                topology[kind] = [str(serial) for serial in cached.get(kind, [])]
+        except (OSError, ValueError, KeyError, AttributeError) as error:
+            print(f'Device cache: could not read {self.path} ({error}), looking for the devices again')
+        return topology
+
+    def save(self):
+        cached = dict(self.topology, saved=datetime.now().isoformat(timespec='seconds'))
+        cached['ports'] = {port: {str(devId): devType for devId, devType in devices.items()}
+                           for port, devices in self.topology['ports'].items()}
+        with open(self.path, 'w') as f:
+            json.dump(cached, f, indent=2)
+
+    # Checks the cached NKTP devices of every open port and scans the bus of the ports where something changed.
+    # Returns {port: {devId: device type}}
+    def discover(self, force=False):
+        start = perf_counter()
+        cached = self.topology['ports']
+        ports = self.ports.ports
+        if force:
+            changed = list(ports)
+        else:
+            futures = {port: self.ports[port].run(self._verify, port, cached.get(port)) for port in ports}
+            changed = [port for port, future in futures.items() if not future.result()]
+        if changed:
+            futures = {port: self.ports[port].run(self._scan, port) for port in changed}
+            for port, future in futures.items():
+                cached[port] = future.result()
+            self.save()
+        self.scanned = changed
+
+        found = ', '.join(f'{port} {{{", ".join(f"{devId}: {hex(devType)}" for devId, devType in cached[port].items())}}}'
+                          for port in ports)
+        how = f'bus scan of {", ".join(changed)}' if changed else 'cached'
+        print(f'Devices: {found} ({how}, {perf_counter() - start:.2f} s)')
+        return {port: cached[port] for port in ports}
+
+    # Runs on the port's worker. True if every cached device of the port still answers, with the same type
+    def _verify(self, port, devices):
+        if not devices:
+            return False
+        for devId, devType in devices.items():
+            if self.nktp.deviceCreate(port, devId, 1) != 0:
+                return False
+            result, exists = self.nktp.deviceExists(port, devId)
+            if result != 0 or not exists:
+                return False
+            result, found_type = self.nktp.deviceGetType(port, devId)
+            if result != 0 or found_type != devType:
+                print(f'Port {port}: device {devId} changed')
+                return False
+        return True
+
+    # Runs on the port's worker: reopens the port with autoMode 1, which scans its bus, and reads the types of all devices found
+    def _scan(self, port):
+        result = self.nktp.openPorts(port, 1, int(port in self.ports.live_ports))
+        if result != 0:
+            print(f'Port {port}: bus scan failed', self.nktp.PortResultTypes(result))
+            return {}
+        result, types = self.nktp.deviceGetAllTypes(port)
+        if result != 0:
+            print(f'Port {port}: could not read the device types', self.nktp.DeviceResultTypes(result))
+            return {}
+        return {devId: devType for devId, devType in enumerate(types) if devType}
+
+    # Serial numbers of the cameras or spectrometers attached, enumerated again and cached
+    def enumerate(self, kind):
+        start = perf_counter()
+        list_devices = self.backend.list_cameras if kind == 'cameras' else self.backend.list_spectrometers
+        self.topology[kind] = [str(serial) for serial in list_devices()]
+        self.save()
+        print(f'Devices: {kind} {self.topology[kind]} (enumerated, {perf_counter() - start:.2f} s)')
+        return self.topology[kind]
+
+    # Puts the serial number of the device just opened first in the cache, so it's the one opened next time
+    def _remember(self, kind, serial_number):
+        serials = [str(serial_number)] + [serial for serial in self.topology[kind] if serial != str(serial_number)]
+        if serials != self.topology[kind]:
+            self.topology[kind] = serials
+            self.save()
+
+    # Opens the given device, or the first cached one, enumerating the devices only if there are none cached or it can't be opened
+    def _open(self, kind, serial_number, open_device):
+        requested = serial_number
+        if serial_number is None:
+            serial_number = next(iter(self.topology[kind] or self.enumerate(kind)), None)
+        try:
+            device = open_device(serial_number)
+        except Exception as error:
+            found = self.enumerate(kind)
+            print(f'Device cache: could not open {DEVICE_KINDS[kind]} {serial_number} ({error})')
+            if requested is None and found:
+                serial_number = found[0]
+            elif serial_number not in found:
+                raise
+            device = open_device(serial_number)
+        self._remember(kind, device.serial_number)
+        return device
+
+    def open_camera(self, exposure_time=None, serial_number=None, **options):
+        return self._open('cameras', serial_number,
+                          lambda serial: self.backend.open_camera(exposure_time, serial_number=serial, **options))
+
+    def open_spectrometer(self, serial_number=None):
+        return self._open('spectrometers', serial_number, self.backend.open_spectrometer)
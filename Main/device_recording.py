@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Recording device timings, and replaying them on the simulator.
+
+    The simulator's latencies are a model, so a benchmark on the simulator only shows how the code behaves with those numbers.
+    DeviceRecorder wraps the devices of a backend (the NKTP register API, the camera and the spectrometer) and records how long every
+    device call takes, per function, in the order the calls were made. The recording is saved as JSON, e.g. from a benchmark run on
+    the hardware.
+
+    ReplayBackend is the simulator with the recorded timings: the simulated register latency and bus scan time are set to zero, and
+    every recorded call takes as long as it did on the hardware, going through the durations recorded for that function in order
+    (and starting again at the first one when they run out). The simulated camera and spectrometer already take the exposure and
+    integration time, so only the time the call took beyond that is added. The data (frames, spectra, register values) and the AOTF
+    settling are still simulated; only the device timing is replayed.
+
+    Recorded calls:
+        - nktp          every register, device, port and point-to-point function (RECORDED_PREFIXES)
+        - camera        trigger, retrieve, grab, set_exposure
+        - spectrometer  intensities, integration_time_micros, wavelengths
+
+Usage:
+
+    recorder = DeviceRecorder()
+    backend = recorder.wrap(load_backend('hardware'))
+    ...                                             # calibration and sweep on the hardware
+    recorder.save('hardware_timings.json')
+
+    backend = ReplayBackend('hardware_timings.json', frame_shape=(480, 640))
+
+    or from the benchmarks:
+
+    python benchmark.py --backend hardware --record hardware_timings.json
+    python benchmark.py --replay hardware_timings.json
+"""
+
+import json
+import threading
+from time import perf_counter, sleep
+
+from backends import SimulatedBackend
+
+RECORDED_PREFIXES = ('registerRead', 'registerWrite', 'registerCreate', 'registerExists', 'registerRemove', 'registerGetAll', 'device',
+                     'openPorts', 'closePorts', 'getAllPorts', 'getOpenPorts', 'pointToPoint')
+RECORDED_CALLS = {
+    'camera': ('trigger', 'retrieve', 'grab', 'set_exposure'),
+    'spectrometer': ('intensities', 'integration_time_micros', 'wavelengths'),
+}
+
+
+def recorded(kind, name):
+    if kind == 'nktp':
+        return name.startswith(RECORDED_PREFIXES)
+    return name in RECORDED_CALLS.get(kind, ())
+
+
+# Passes everything through to the wrapped device, and calls on_call(key, elapsed) after each recorded call
+class _TimedDevice:
+    def __init__(self, target, kind, on_call):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_kind', kind)
+        object.__setattr__(self, '_on_call', on_call)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if not callable(value) or not recorded(self._kind, name):
+            return value
+        key = f'{self._kind}.{name}'
+
+        def call(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                self._on_call(key, perf_counter() - start)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DeviceRecorder:
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def _record(self, key, elapsed):
+        with self._lock:
+            self.timings.setdefault(key, []).append(elapsed)
+
+    def device(self, target, kind):
+        return _TimedDevice(target, kind, self._record)
+
+    # Records the calls to the devices of the backend: backend.nktp, and the cameras and spectrometers it opens from now on
+    def wrap(self, backend):
+        backend.nktp = self.device(backend.nktp, 'nktp')
+        open_camera, open_spectrometer = backend.open_camera, backend.open_spectrometer
+        backend.open_camera = lambda *args, **kwargs: self.device(open_camera(*args, **kwargs), 'camera')
+        backend.open_spectrometer = lambda *args, **kwargs: self.device(open_spectrometer(*args, **kwargs), 'spectrometer')
+        return backend
+
+    def save(self, path):
+        with self._lock:
+            timings = {key: list(durations) for key, durations in self.timings.items()}
+        with open(path, 'w') as f:
+            json.dump({'timings': timings}, f)
+
+
+def load_timings(path):
+    with open(path) as f:
+        return json.load(f)['timings']
+
+
+# Makes each recorded call take as long as the next duration recorded for it. Calls nothing was recorded for are left alone
+class TimingReplay:
+    def __init__(self, timings):
+        self.timings = timings
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def _replay(self, key, elapsed):
+        durations = self.timings.get(key)
+        if not durations:
+            return
+        with self._lock:
+            n = self.calls.get(key, 0)
+            self.calls[key] = n + 1
+        remaining = durations[n % len(durations)] - elapsed
+        if remaining > 0:
+            sleep(remaining)
+
+    def device(self, target, kind):
+        return _TimedDevice(target, kind, self._replay)
+
+
+class ReplayBackend(SimulatedBackend):
+    name = 'replay'
+
+    def __init__(self, timings, **options):
+        options.update(register_latency=0.0, bus_scan_time=0.0, enumeration_time=0.0)
+        super().__init__(**options)
+        self.replay = TimingReplay(load_timings(timings) if isinstance(timings, str) else timings)
+        self.simulated_nktp = self.nktp
+        self.nktp = self.replay.device(self.nktp, 'nktp')
+
+    def open_spectrometer(self, serial_number):
+        return self.replay.device(super().open_spectrometer(serial_number), 'spectrometer')
+
+    def open_camera(self, exposure_time=None, serial_number=None, **options):
+        return self.replay.device(super().open_camera(exposure_time, serial_number, **options), 'camera')
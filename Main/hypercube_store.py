@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Band-sequential hypercube store backed by a memory-mapped file.
+
+    The hypercube used to be an in-RAM (height, width, N_wavelengths) array filled with hypercube[:, :, i] = img. With the band axis
+    last every band write is a strided scatter across the whole cube, and large sweeps can exhaust the memory of the acquisition PC
+    and are lost if the script crashes. HypercubeStore keeps the bands contiguous on disk (band-sequential, BSQ, shape
+    (N_wavelengths, height, width)) in a .npy file that is memory-mapped, so each band is one contiguous block that the camera frame
+    can be copied straight into, and only the pages being used are held in memory.
+
+    The cube attribute is a (row, col, band) view of the same memory, which is what HyperspectralViewer expects, so no copy of the
+    cube is ever made. Because the file is a standard .npy file, a sweep can be reopened after a crash with HypercubeStore.open(path)
+    or simply np.load(path, mmap_mode='r').
+
+    Creating a store never replaces an existing file unless overwrite=True, so a new run can't truncate the partial cube left by a
+    crashed one. hyperspectral_imaging.py names the files of each run after its start time (run_filename()).
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+
+
+# Timestamped file name for the current run, e.g. hypercube_20240521_143005.npy
+def run_filename(prefix, extension, when=None):
+    return f'{prefix}_{(when or datetime.now()).strftime("%Y%m%d_%H%M%S")}{extension}'
+
+
+class HypercubeStore:
+    def __init__(self, path, n_bands, height, width, dtype=np.uint16, overwrite=False):
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f'{path} already exists, pass overwrite=True to replace it')
+        self.path = path
+        self.bands = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n_bands, height, width))
+
+    @classmethod
+    def open(cls, path, mode='r+'):
+        store = cls.__new__(cls)
+        store.path = path
+        store.bands = np.load(path, mmap_mode=mode)
+        return store
+
+    @property
+    def shape(self):
+        n_bands, height, width = self.bands.shape
+        return (height, width, n_bands)
+
+    # (row, col, band) view of the store, no data is copied
+    @property
+    def cube(self):
+        return self.bands.transpose(1, 2, 0)
+
+    # Contiguous (row, col) slot for band i, can be passed as the out array of a grab
+    def band(self, i):
+        return self.bands[i]
+
+    def write_band(self, i, img):
+        np.copyto(self.bands[i], img)
+
+    def flush(self):
+        self.bands.flush()
@@ -13,6 +13,11 @@ Light-Dark Calibration:
     As instructed, place the dark reference in front of the spectrometer, press enrter, and repeat for the light reference. Press enter 
     to move on to the power normalisation phase.
 
+    The references are taken once the settings below have been entered, at the spectrometer integration time, and each is the mean of
+    REFERENCE_FRAMES readings. They are cached in the 'reference_cache' folder for the spectrometer and integration time, and are
+    reused without being placed again while they are fresh (1 hour for the dark reference, 8 hours for the white reference). A dark
+    reference can also be interpolated between cached ones at a shorter and a longer integration time (see spectrometer_references.py).
+
 Initialise Variables and Power Normalisation:
 
     As prompted within the terminal determine the range of wavelengths over which you would like to perform the wavelength sweep, and the 
@@ -23,6 +28,10 @@ Initialise Variables and Power Normalisation:
     
     Once the power normalisation loop has run, the calibration data is stored as a csv file to the same directory as the file is run from, and 
     called back later.
+    
+    Calibrations are also cached in the 'calibration_cache' folder, keyed by the SELECT and spectrometer serial numbers, integration time,
+    target count and wavelength grid. When the same setup is run again, a few spot wavelengths are measured and only the bands that
+    have drifted are recalibrated (see calibration_cache.py).
 
 Main loop:
 
@@ -30,6 +39,17 @@ Main loop:
     each iteration taking an image of the object and taking a spectral reading. This data is stored in a three dimensional hypercube, which is 
     visualised within the GUI described below.
     
+    The sweep is run by HypercubeSweep (acquisition.py) with SweepEngine (sweep_engine.py), which captures the image and the spectrometer reading at the same time and
+    tunes the AOTF to the next wavelength while the current band is being stored.
+    The hypercube is written band by band to 'hypercube_<date>_<time>.npy' in the working directory, so it survives a crash and can be
+    reloaded with np.load(path, mmap_mode='r') (shape: wavelength, row, column). It is also streamed to a compressed HDF5 file with the
+    same name, 'hypercube_<date>_<time>.h5', together with the wavelengths, the spectrometer reading for each band and the
+    camera/spectrometer settings. Every run gets new files, so the cube of a crashed run is never overwritten.
+    
+    Setting MULTIPLEX_ORDER to 3, 7 or 15 switches on several SELECT channels at once following an S-matrix pattern, and the bands are
+    demultiplexed after each block (see multiplexed_sweep.py). This helps with dim samples, but the exposure time must be low enough
+    for the frames not to saturate.
+    
 GUI Construction:
     
     Once the main loop is coplete, a new window will appear to visualise the captured data. This window has the following capabilities:
@@ -60,53 +80,113 @@ Notes:
         - e = -1
     See line 87 for an example of how to turn SuperK COMPACT emission ON. To understand this better, read the NKTP SDK instruction manual 
     located at C:\SDK 2. Page 52 describes the specific registers for the RF driver for SUperK SELECT.
+    
+    All device access goes through a backend (backends.py), with the register functions available as nktp.registerWriteU8 etc.
+    To run the whole script without any devices attached, e.g. on Linux, set the environment variable HSI_BACKEND=simulator; the
+    laser, AOTF, spectrometer and camera are then simulated in-process (simulator.py).
+    Register writes go through a RegisterCache (register_cache.py), which skips writes of a value the device already holds, e.g.
+    switching the RF power on again for every band. The wavelength, amplitude and RF power writes for a band are sent as one
+    transaction on the SELECT port's worker thread (register_transactions.py). The COM4 and COM5 ports are opened once for the whole
+    session, and each has its own worker thread so the laser and the SELECT are driven independently (port_manager.py). The
+    SELECT can also be reached over Ethernet, through a point-to-point port listed in POINT_TO_POINT_PORTS (point_to_point.py).
+    The devices found are cached in 'device_cache.json': at the start of a session only the cached devices are checked, and the
+    buses are only scanned (and the cameras and spectrometers enumerated) when something has changed (device_discovery.py).
+    The spectrometer is wrapped in a SpectrometerSession (spectrometer_session.py), which keeps the wavelength axis and the pixel
+    of every band, so a calibration probe is a single spectrometer reading. The count of a band is the height of an AOTF line of
+    SPECTROMETER_LINE_WIDTH fitted to the pixels around it, which is less noisy than the nearest pixel, so fewer probes are needed.
+    With SPECTROMETER_STREAM, a free running spectrometer is read continuously on a background thread during the sweep, and each
+    band uses the first spectrum whose exposure started after the AOTF settled (spectrometer_stream.py).
+    With CALIBRATION_SOURCE = 'camera', the power normalisation measures the mean of CAMERA_ROI in the camera image of a white
+    target instead of the spectrometer, so the amplitudes flatten what the camera sees. The target count is then in grey levels.
+    Setting REGISTER_TELEMETRY records the latency and result code of every NKTP register call and prints a summary line at that
+    interval (hardware backend only, see NKTP_DLL/telemetry.py).
 """
 # Import relevant modules
 
 import numpy as np
-from NKTP_DLL import *
 from time import sleep
-import seabreeze.spectrometers as sb
-from seabreeze.spectrometers import Spectrometer
 import matplotlib.pyplot as plt
-from pypylon import pylon
 import pandas as pd
-from scipy.interpolate import interp1d
 import sys
+from datetime import datetime
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSlider, QLabel, QDoubleSpinBox
 from PyQt5.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from backends import load_backend
+from register_cache import RegisterCache
+from port_manager import PortManager
+from device_discovery import DeviceDiscovery
+from spectrometer_session import SpectrometerSession
+from spectrometer_references import ReferenceLibrary, white_calibration
+from spectrometer_stream import SpectrometerStreamer
+from power_calibration import PowerCalibrator, previous_amplitudes, save_calibration
+from power_meters import CameraROIMeter, SpectrometerMeter
+from calibration_cache import CalibrationCache
+from power_compensation import PowerCompensation
+from aotf_settle import SettleWaiter, channel_registers
+from acquisition import HypercubeSweep
+from multiplexed_sweep import MultiplexedSweep
+from hypercube_store import HypercubeStore, run_filename
+from band_writer import BandWriter
 
 #################################################################################################################################################
 # INITIALISE HARDWARE
 #################################################################################################################################################
 
+# Select the device backend: the real hardware, or the simulator if HSI_BACKEND=simulator (see backends.py)
+backend = load_backend()
+nktp = RegisterCache(backend.nktp)
+
 # Initialize COMPACT supercontinuum laser
 COM_port = 'COM5'
-result = registerWriteU8('COM4', 1, 0x30, 1, -1)
-print('Emission: ON')
 
-# Initialize spectrometer
-spec = Spectrometer.from_serial_number("HR2B1032")
-print(spec)
+# 0 for the normal band-by-band sweep, or the order of the S-matrix (3, 7 or 15) for a multiplexed sweep
+MULTIPLEX_ORDER = 0
 
-#################################################################################################################################################
-# LIGHT-DARK CALIBRATION
-#################################################################################################################################################
+# Seconds between register telemetry log lines, or 0 for no telemetry
+REGISTER_TELEMETRY = 0
+telemetry = bool(REGISTER_TELEMETRY) and hasattr(backend.nktp, 'enable_telemetry')
+if telemetry:
+    backend.nktp.enable_telemetry(log_interval=REGISTER_TELEMETRY)
 
-print("Place dark reference and press Enter")
-input()
-dark_reference = spec.intensities()
+# Width (FWHM, nm) of the AOTF line fitted to the spectrometer pixels around each band in the power normalisation, or 0 to read the
+# nearest pixel only (see spectrometer_session.py)
+SPECTROMETER_LINE_WIDTH = 2.0
 
-print("Place white reference and press Enter")
-input()
-white_reference = spec.intensities()
+# What the power normalisation measures: 'spectrometer', or 'camera' for the mean grey level of CAMERA_ROI, (first row, last row,
+# first column, last column) of the camera image of a white target, or None for the central half of the image (see power_meters.py)
+CALIBRATION_SOURCE = 'spectrometer'
+CAMERA_ROI = None
 
-calibration_factors = (white_reference - dark_reference) / (max(white_reference) - min(dark_reference))
+# 1 to read the spectrometer continuously in the background during the sweep, 0 to read it once per band
+SPECTROMETER_STREAM = 1
 
-print("Calibration complete")
-print(" ")
+# Serial number of the spectrometer to open, or None for the one cached in device_cache.json (the first one found if nothing is
+# cached yet)
+SPECTROMETER_SERIAL = None
+
+# Number of spectrometer readings averaged for the dark and white references
+REFERENCE_FRAMES = 10
+
+# Ethernet-attached devices, {port name: point_to_point.point_to_point_port(...)}, e.g. a SELECT on 'SELECT-ETH' with COM_port = 'SELECT-ETH'
+# (see point_to_point.py)
+POINT_TO_POINT_PORTS = {}
+
+# The laser (COM4) and SELECT (COM5) ports stay open for the whole session, each with its own worker thread
+ports = PortManager(nktp, ['COM4', COM_port], live_ports=[COM_port], point_to_point=POINT_TO_POINT_PORTS).open()
+select_port = ports[COM_port]
+
+# Check the devices found last time (device_cache.json) rather than scanning the buses and enumerating the cameras and spectrometers
+discovery = DeviceDiscovery(backend, ports)
+discovery.discover()
+
+result = ports.call('COM4', 'registerWriteU8', 1, 0x30, 1, -1)
+print('Emission: ON')
+
+# Initialize spectrometer. The session reads the wavelength axis once, and only sends the integration time when it changes
+spec = SpectrometerSession(discovery.open_spectrometer(SPECTROMETER_SERIAL))
+print(spec)
 
 #################################################################################################################################################
 # INITIALISE VARIABLES
@@ -143,87 +223,75 @@ print(f"Number of wavelength steps: {N_wavelengths}")
 print(f"Camera exposure time: {exposure_time} microseconds")
 print(f"Spectrometer integration time: {spec_integration_time} microseconds")
 
+#################################################################################################################################################
+# LIGHT-DARK CALIBRATION
+#################################################################################################################################################
+
+# The references are the mean of REFERENCE_FRAMES readings, cached for this spectrometer and integration time. Only the ones with
+# no fresh cached reference (or, for the dark reference, none to interpolate from) need placing
+reference_library = ReferenceLibrary('reference_cache')
+dark, white = reference_library.references(spec, spec_integration_time, REFERENCE_FRAMES, place=backend.place_reference,
+                                           remove=backend.remove_reference)
+dark_reference = dark.mean
+white_reference = white.mean
+
+calibration_factors = white_calibration(dark_reference, white_reference)
+
+print("Calibration complete")
+print(" ")
+
+
 print("Press ENTER to begin power normalization")
 input()
 
-final_amplitudes = np.zeros(N_wavelengths)
-final_counts = np.zeros(N_wavelengths)
+# The spectrometer pixels and weights of each band of the sweep are found once, rather than searched for on every probe
+spec.set_bands(Wavelengths / 1000, line_width_nm=SPECTROMETER_LINE_WIDTH)
 
-# Perform light-dark calibration on spectrometer reading
-def get_spectrometer_count(wavelength):
-    spec.integration_time_micros(spec_integration_time)
-    intensities = spec.intensities()
-    wavelengths = spec.wavelengths()
-    index = np.argmin(np.abs(wavelengths - wavelength/1000))
-    calibrated_intensity = (intensities[index] - dark_reference[index]) / calibration_factors[index]
-    return calibrated_intensity
-
-# Initialize camera
-tl_factory = pylon.TlFactory.GetInstance()
-camera = pylon.InstantCamera()
-camera.Attach(tl_factory.CreateFirstDevice())
+# Initialize camera. The session is opened once and keeps grabbing (on software trigger) until the devices are closed
+camera = discovery.open_camera(exposure_time)
 
 # Get image size to set hypercube dimensions
-camera.Open()
-camera.ExposureTime.SetValue(exposure_time)
-camera.StartGrabbing(1)
-grab = camera.RetrieveResult(2000, pylon.TimeoutHandling_Return)
-if grab.GrabSucceeded():
-    img = grab.GetArray()
-    height, width = img.shape
-camera.Close()
+height, width = camera.shape
+
+# The power is measured either with the light-dark calibrated spectrometer reading, over the pixels around the band, or with the mean
+# of CAMERA_ROI in the camera image of a white target (see power_meters.py)
+if CALIBRATION_SOURCE == 'camera':
+    print("Place white target in front of the camera and press Enter")
+    ports.call(COM_port, 'registerWriteU8', 25, 0x30, 0, -1)
+    backend.place_reference('white')
+    sleep(0.1)
+    # Dark level with the RF power off, subtracted from every measurement
+    get_count = CameraROIMeter(camera, exposure_time, roi=CAMERA_ROI)
+    get_count.capture_dark()
+else:
+    get_count = SpectrometerMeter(spec, spec_integration_time, dark_reference, calibration_factors)
 
 #################################################################################################################################################
 # POWER NORMALISATION LOOP
 #################################################################################################################################################
 
-for i, wavelength in enumerate(Wavelengths):
-    lam = int(wavelength)
-    amplitude = 500
-    
-    for iteration in range(MAX_ITERATIONS):
-        result = registerWriteU32(COM_port, 25, 0x90, lam, -1)
-        print(f'Setting wavelength {lam} pm')
-        
-        amplitude = int(amplitude)
-        result = registerWriteU16(COM_port, 25, 0xB0, amplitude, -1)
-        print(f'Setting amplitude {amplitude}')
-        
-        result = registerWriteU8(COM_port, 25, 0x30, 1, -1)
-        print('RF power ON')
-        
-        sleep(0.1)
-        
-        count = get_spectrometer_count(wavelength)
-        print(f'Count: {count}')
-        
-        if abs(count - TARGET_COUNT) <= TOLERANCE:
-            print(f'Target reached for wavelength {lam} pm')
-            break
-        
-        error = TARGET_COUNT - count
-        step_size = max(1, min(100, abs(int(error / 3))))
-        
-        if count < TARGET_COUNT:
-            amplitude = min(1000, amplitude + step_size)
-        else:
-            amplitude = max(1, amplitude - step_size)
-        
-        result = registerWriteU8(COM_port, 25, 0x30, 0, -1)
-        print('RF power OFF')
-        
-        if iteration == MAX_ITERATIONS - 1:
-            print(f'Warning: Max iterations reached for wavelength {lam} pm')
-    
-    final_amplitudes[i] = amplitude
-    final_counts[i] = count
+# Rather than a fixed sleep after each change, wait for the RF driver to confirm the new wavelength and amplitude (up to 0.1 s)
+settle_waiter = SettleWaiter(nktp, COM_port, 25, registers=channel_registers(8 if MULTIPLEX_ORDER else 1), timeout=0.1,
+                             port_worker=select_port)
+
+calibrator = PowerCalibrator(nktp, get_count, TARGET_COUNT, TOLERANCE, MAX_ITERATIONS, port=COM_port, dev_id=25,
+                             settle_waiter=settle_waiter, port_worker=select_port)
+# Reuse the cached calibration for this SELECT, spectrometer (or camera), integration time, target count and wavelength grid if there
+# is one, recalibrating only the bands that have drifted. Otherwise calibrate, starting from the last calibration_results.csv if there
+# is one for the same setup
+rdResult, select_serial = select_port.call('deviceGetModuleSerialNumberStr', 25).result()
+calibration_cache = CalibrationCache('calibration_cache')
+calibration_key = calibration_cache.make_key(select_serial, get_count.serial_number, get_count.integration_time, TARGET_COUNT,
+                                             Wavelengths, get_count.readout)
+initial_amplitudes = previous_amplitudes('calibration_results.csv', Wavelengths, calibration_key)
+final_amplitudes, final_counts = calibration_cache.calibrate(calibration_key, calibrator, Wavelengths, initial_amplitudes)
+if CALIBRATION_SOURCE == 'camera':
+    backend.remove_reference()
+    if get_count.saturated_frames:
+        print(f'Warning: {get_count.saturated_frames} calibration frames were saturated, reduce the target count or exposure time')
 
 # Save calibration results
-np.savetxt('calibration_results.csv', 
-           np.column_stack((Wavelengths, final_amplitudes, final_counts)), 
-           delimiter=',', 
-           header='Wavelength (pm),Amplitude,Count',
-           comments='')
+save_calibration('calibration_results.csv', Wavelengths, final_amplitudes, final_counts, calibration_key)
 
 print("Calibration and power normalization complete. Results saved to 'calibration_results.csv'")
 
@@ -232,90 +300,94 @@ calibration_data = pd.read_csv('calibration_results.csv')
 wavelengths_cal = calibration_data['Wavelength (pm)'].values
 amplitudes_cal = calibration_data['Amplitude'].values
 
-# Create interpolation function
-amplitude_interpolator = interp1d(wavelengths_cal, amplitudes_cal, kind='linear', fill_value='extrapolate')
+# Create interpolation function, evaluated over whole wavelength arrays at once (see power_compensation.py)
+compensation = PowerCompensation(wavelengths_cal, amplitudes_cal)
 
 #################################################################################################################################################
 # INITIALISE LISTS AND FINAL VARIABLE CHANGES
 #################################################################################################################################################
 
-peak_wavelengths = []
-total_intensities = None
-
 # Initialize hypercube (3-d array, and NxMxL matrix where N and M are the image dimensions, L is the wavelength range and 
-# the elements store grayscale values)
-hypercube = np.zeros((height, width, N_wavelengths), dtype=np.uint16)
-
-# Power compensation function
-def calculate_power_compensation(wavelength):
-    wavelength_nm = wavelength / 1000
-    calibrated_amplitude = amplitude_interpolator(wavelength)
-    normalized_amplitude = calibrated_amplitude / 1000
-    compensation_factor = 1 / normalized_amplitude if normalized_amplitude > 0 else 1
-    return compensation_factor
-
-def apply_power_compensation(wavelengths, intensities):
-    compensated_intensities = np.zeros_like(intensities)
-    for i, (wavelength, intensity) in enumerate(zip(wavelengths, intensities)):
-        compensation_factor = calculate_power_compensation(wavelength)
-        compensated_intensities[i] = intensity / compensation_factor
-    return compensated_intensities
+# the elements store grayscale values). The bands are stored one after another in a memory-mapped file, named after the start of the
+# run ('hypercube_<date>_<time>.npy'), and hypercube is a (row, col, band) view of it
+run_started = datetime.now()
+cube_store = HypercubeStore(run_filename('hypercube', '.npy', run_started), N_wavelengths, height, width, dtype=np.uint16)
+hypercube = cube_store.cube
 
 #################################################################################################################################################
 # MAIN LOOP - WAVELENGTH SWEEP
 #################################################################################################################################################
 
-for i in range(N_wavelengths):
-    iteration = i + 1
-    lam = int(Wavelengths[i])
-    
-    power_factor = calculate_power_compensation(lam)
-    
-    result = registerWriteU32(COM_port, 25, 0x90, lam, -1)
-    print('Setting wavelength', i + 1, RegisterResultTypes(result))
-    
-    amplitude = int(1000 / power_factor)
-    amplitude = max(1, min(1000, amplitude))
-    result = registerWriteU16(COM_port, 25, 0xB0, amplitude, -1)
-    print('Setting amplitude', amplitude, RegisterResultTypes(result))
-    
-    result = registerWriteU8(COM_port, 25, 0x30, 1, -1)
-    print('RF power ON', RegisterResultTypes(result))
-    
-    sleep(0.05)
-
-    spec.integration_time_micros(spec_integration_time)
-    wavelengths = spec.wavelengths()
-    intensities = spec.intensities()
-    normalized_intensities = intensities - dark_reference
-
-    if total_intensities is None:
-        total_intensities = np.zeros_like(normalized_intensities)
-
-    total_intensities += normalized_intensities
-    
-    camera.Open()
-    camera.ExposureTime.SetValue(exposure_time)
-    camera.StartGrabbing(1)
-    grab = camera.RetrieveResult(2000, pylon.TimeoutHandling_Return)
-    
-    if grab.GrabSucceeded():
-        img = grab.GetArray()
-        print(f'Size of image: {img.shape}')
-        hypercube[:, :, i] = img
-
-    camera.Close()
-    print('Camera: Closed')
-    
-    # plot the cumulative intensity of each wavelength value for each iteration
-    plt.plot(wavelengths, total_intensities)
-    plt.xlabel('Wavelength (nm)')
-    plt.ylabel('Cumulative Normalized Intensity')
-    plt.title(f'Cumulative Normalized Spectrum up to Iteration {iteration}')
-    plt.xlim(Wavelength_min/1000, Wavelength_max/1000)
-    plt.show()
-
-compensated_intensities = apply_power_compensation(wavelengths, total_intensities)
+# The integration time and wavelength axis do not change during the sweep (the session only sends the integration time if it has)
+spec.integration_time_micros(spec_integration_time)
+wavelengths = spec.wavelengths()
+
+# Each band is streamed to a compressed HDF5 file, 'hypercube_<date>_<time>.h5', on a background thread during the sweep
+writer = BandWriter(run_filename('hypercube', '.h5', run_started), N_wavelengths, height, width, Wavelengths, dtype=hypercube.dtype,
+                    spectrometer_wavelengths=wavelengths, exposure_time=exposure_time, integration_time=spec_integration_time)
+writer.write_dataset('dark_reference', dark_reference)
+writer.write_dataset('white_reference', white_reference)
+writer.write_dataset('dark_reference_variance', dark.variance)
+writer.write_dataset('white_reference_variance', white.variance)
+writer.write_dataset('calibration', np.column_stack((Wavelengths, final_amplitudes, final_counts)))
+
+# Amplitude for each band from the power normalisation
+amplitudes = compensation.amplitudes(Wavelengths.astype(int))
+
+# Camera and spectrometer capture run in parallel, and the next band is tuned while the current one is stored (see acquisition.py)
+# The spectrometer is read continuously on its own thread during the sweep, and each band takes the first spectrum
+# exposed after the AOTF settled (see spectrometer_stream.py)
+stream = SpectrometerStreamer(spec, spec_integration_time) if SPECTROMETER_STREAM else None
+if MULTIPLEX_ORDER:
+    sweep = MultiplexedSweep(nktp, camera, spec, cube_store, Wavelengths, amplitudes, order=MULTIPLEX_ORDER, port=COM_port,
+                             dev_id=25, dark_reference=dark_reference, writer=writer, exposure_time=exposure_time,
+                             settle_time=0.05, settle_waiter=settle_waiter, port_worker=select_port, spectrometer_stream=stream)
+else:
+    sweep = HypercubeSweep(nktp, camera, spec, cube_store, Wavelengths, amplitudes, port=COM_port, dev_id=25,
+                           dark_reference=dark_reference, writer=writer, exposure_time=exposure_time, settle_time=0.05,
+                           settle_waiter=settle_waiter, port_worker=select_port, spectrometer_stream=stream)
+if stream is not None:
+    stream.start()
+# Whatever goes wrong during the sweep or while the files are finished, the RF power and emission are switched off and the devices
+# and ports are closed. An error from the HDF5 writer is raised once that is done
+try:
+    try:
+        total_intensities = sweep.run()
+    finally:
+        if stream is not None:
+            stream.close()
+        try:
+            writer.close()
+        finally:
+            cube_store.flush()
+finally:
+    # Clean up and close devices
+
+    # RF power and emission are switched off at the same time, each on its own port
+    rf_off = ports.submit(COM_port, 'registerWriteU8', 25, 0x30, 0, -1)
+    emission_off = ports.submit('COM4', 'registerWriteU8', 1, 0x30, 0, -1)
+    try:
+        result = rf_off.result()
+        print('RF power: OFF')
+        result = emission_off.result()
+        print('Emission: OFF')
+    finally:
+        settle_waiter.close()
+
+        camera.close()
+
+        spec.close()
+        print('Spectrometer: CLOSED')
+
+        print(f'Register writes: {nktp.written} sent, {nktp.skipped} skipped')
+        if telemetry:
+            print(backend.nktp.telemetry_log_line())
+            backend.nktp.disable_telemetry()
+        print('Closing COM ports')
+        ports.close()
+
+# The spectrometer wavelengths are in nm and the calibration in pm
+compensated_intensities = compensation.compensate(wavelengths * 1000, total_intensities)
 
 # Plot the final cumulative intensity of each wavelength value
 plt.plot(wavelengths, total_intensities)
@@ -325,23 +397,6 @@ plt.title(f'Cumulative Normalized Spectrum - All Iterations')
 plt.xlim(Wavelength_min/1000, Wavelength_max/1000)
 plt.show()
 
-# Clean up and close devices
-
-result = registerWriteU8(COM_port, 25, 0x30, 0, -1)
-print('RF power: OFF')
-
-result = registerWriteU8('COM4', 1, 0x30, 0, -1)
-print('Emission: OFF')
-
-camera.Close()
-print('Camera: Closed')
-
-spec.close()
-print('Spectrometer: CLOSED')
-
-closeResult = closePorts(COM_port)
-print('Closing COM ports')
-
 #################################################################################################################################################
 # GUI CONSTRUCTION
 #################################################################################################################################################
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Multiplexed (S-matrix) hypercube acquisition.
+
+    The SELECT RF driver has eight wavelength/amplitude channels (0x90-0x97 and 0xB0-0xB7), but the normal sweep only uses channel 0
+    and takes one frame per band. MultiplexedSweep splits the bands into blocks of n (n = 2^k - 1, e.g. 3, 7 or 15) and, for every
+    block, takes n frames, each with (n + 1) / 2 of the block's bands switched on at once following the rows of an S-matrix. The
+    bands are recovered afterwards by applying the inverse S-matrix to all pixels of the block in a single matrix product.
+
+    Each frame then collects light from about half the bands, so for a detector-noise limited (low light) sample every band is
+    measured with a better signal-to-noise ratio than in the band-by-band sweep, for the same number of exposures. Alternatively the
+    exposure time can be shortened for the same SNR.
+
+    Things to be aware of:
+        - (n + 1) / 2 bands are on at once, so n is at most 15 with the eight SELECT channels
+        - the frame holds the sum of about n / 2 bands, so the exposure time must be chosen so that the frames don't saturate
+          (saturated frames are counted and reported, as they break the demultiplexing)
+        - a dark frame is taken with the RF power off at the start of the sweep and subtracted from every frame, since the inverse
+          transform assumes the frames are linear in the light from each band
+        - the amplitudes are the ones from the single-channel power normalisation
+
+    The demultiplexed bands are written to the same HypercubeStore (and BandWriter) as the normal sweep, so the rest of the script
+    and the viewer are unchanged. The spectrometer readings are demultiplexed the same way.
+
+Usage:
+
+    sweep = MultiplexedSweep(nktp, camera, spec, cube_store, Wavelengths, amplitudes, order=7, dark_reference=dark_reference)
+    total_intensities = sweep.run()
+"""
+
+import numpy as np
+from time import sleep
+
+from acquisition import BandSweep
+from aotf_settle import REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH
+
+N_CHANNELS = 8
+
+
+# S-matrix of order n (n + 1 a power of two), from the Sylvester Hadamard matrix of order n + 1. Every row has (n + 1) / 2 ones
+def s_matrix(n):
+    if n < 1 or (n + 1) & n:
+        raise ValueError(f'S-matrix order must be 2^k - 1 (1, 3, 7, 15, ...), got {n}')
+    hadamard = np.ones((1, 1), dtype=int)
+    while len(hadamard) < n + 1:
+        hadamard = np.block([[hadamard, hadamard], [hadamard, -hadamard]])
+    return (hadamard[1:, 1:] == -1).astype(float)
+
+
+# S^-1 = 2 / (n + 1) * (2 S^T - J)
+def s_matrix_inverse(s):
+    n = len(s)
+    return 2 / (n + 1) * (2 * s.T - 1)
+
+
+class MultiplexedSweep(BandSweep):
+    def __init__(self, nktp, camera, spec, cube_store, wavelengths, amplitudes, order=7, port='COM5', dev_id=25,
+                 n_channels=N_CHANNELS, dark_reference=None, writer=None, exposure_time=None, settle_time=0.05,
+                 settle_waiter=None, port_worker=None, spectrometer_stream=None, verbose=True):
+        self.s = s_matrix(order)
+        if (order + 1) // 2 > n_channels:
+            raise ValueError(f'An S-matrix of order {order} needs {(order + 1) // 2} channels, only {n_channels} available')
+        self.inverse = s_matrix_inverse(self.s)
+        self.order = order
+        super().__init__(nktp, camera, spec, cube_store, wavelengths, amplitudes, port=port, dev_id=dev_id,
+                         dark_reference=dark_reference, writer=writer, exposure_time=exposure_time, settle_time=settle_time,
+                         settle_waiter=settle_waiter, port_worker=port_worker, spectrometer_stream=spectrometer_stream, verbose=verbose)
+
+        self.n_channels = n_channels
+        self.saturated_frames = 0
+
+        self.n_bands = len(wavelengths)
+        self.n_blocks = -(-self.n_bands // order)
+        height, width = camera.shape
+        self._frames = np.zeros((order, height, width), dtype=np.float32)
+        self._spectra = None
+        self.dark_frame = np.zeros((height, width), dtype=np.float32)
+
+    # Bands switched on in frame k: row k % order of the S-matrix, applied to block k // order
+    def pattern_bands(self, k):
+        block, row = divmod(k, self.order)
+        bands = block * self.order + np.flatnonzero(self.s[row])
+        return bands[bands < self.n_bands]
+
+    # One channel per band of the pattern, the remaining channels are switched off with a zero amplitude
+    def tune(self, k):
+        writes = []
+        settings = {REG_RF_POWER: 1}
+        bands = self.pattern_bands(k)
+        for channel in range(self.n_channels):
+            if channel < len(bands):
+                lam = int(self.wavelengths[bands[channel]])
+                amplitude = max(1, min(1000, int(self.amplitudes[bands[channel]])))
+                writes.append(('U32', REG_WAVELENGTH + channel, lam))
+                settings[REG_WAVELENGTH + channel] = lam
+            else:
+                amplitude = 0
+            writes.append(('U16', REG_AMPLITUDE + channel, amplitude))
+            settings[REG_AMPLITUDE + channel] = amplitude
+        writes.append(('U8', REG_RF_POWER, 1))
+
+        result = self.transaction(writes)
+        self.log(f'Pattern {k + 1}/{self.n_blocks * self.order}: bands {", ".join(str(i + 1) for i in bands)}')
+        if not result.ok:
+            self.log('Register write failed:', ', '.join(f'{hex(regId)} {self.nktp.RegisterResultTypes(code)}'
+                                                         for regId, code in result.failures()))
+        self._settings[k] = settings
+
+    def capture_frame(self, k):
+        return self.grab(f'pattern {k + 1}')
+
+    # Runs in frame order on the engine's store worker. The block is demultiplexed once its last frame is in
+    def store(self, k, img, intensities):
+        row = k % self.order
+        if img.dtype.kind in 'ui' and img.max() >= np.iinfo(img.dtype).max:
+            self.saturated_frames += 1
+        np.subtract(img, self.dark_frame, out=self._frames[row])
+
+        intensities = np.asarray(intensities, dtype=float)
+        if self.dark_reference is not None:
+            intensities = intensities - self.dark_reference
+        if self._spectra is None:
+            self._spectra = np.zeros((self.order, len(intensities)))
+        self._spectra[row] = intensities
+
+        if row == self.order - 1:
+            self.demultiplex(k // self.order)
+
+    # Recovers the bands of a block from its frames and spectra: one matrix product over all pixels at once
+    def demultiplex(self, block):
+        frames = self._frames.reshape(self.order, -1)
+        bands = self.inverse.astype(np.float32) @ frames
+        spectra = self.inverse @ self._spectra
+
+        dtype = self.cube_store.band(0).dtype
+        if dtype.kind in 'ui':
+            info = np.iinfo(dtype)
+            np.rint(bands, out=bands)
+            np.clip(bands, info.min, info.max, out=bands)
+
+        for j in range(self.order):
+            i = block * self.order + j
+            if i >= self.n_bands:
+                break
+            band = self.cube_store.band(i)
+            np.copyto(band, bands[j].reshape(band.shape), casting='unsafe')
+            if self.writer is not None:
+                self.writer.write_band(i, band, spectra[j])
+            if self.total_intensities is None:
+                self.total_intensities = np.zeros_like(spectra[j])
+            self.total_intensities += spectra[j]
+
+    # Dark frame with the RF power off, subtracted from every multiplexed frame
+    def capture_dark_frame(self):
+        self.transaction([('U8', REG_RF_POWER, 0)])
+        sleep(self.settle_time)
+        self.dark_frame[...] = self.grab('dark frame')
+
+    def run(self):
+        self.total_intensities = None
+        self.saturated_frames = 0
+        self.capture_dark_frame()
+        self._first_frame = self.camera.frames_triggered
+        self.engine.run(self.n_blocks * self.order)
+        self.cube_store.flush()
+        if self.saturated_frames:
+            print(f'Warning: {self.saturated_frames} multiplexed frames were saturated, reduce the exposure time')
+        return self.total_intensities
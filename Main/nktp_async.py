@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio interface to the NKTP register API.
+
+    Every NKTP_DLL register call blocks its caller for the whole serial transaction. AsyncNKTP makes the same functions awaitable:
+    calls that take a port name (registerRead*, registerWrite*, device*, ...) are queued on that port's worker thread (a PortWorker,
+    see register_transactions.py), so the calls to one port keep their order while different ports, e.g. the COMPACT on COM4 and the
+    SELECT on COM5, are driven at the same time. Other blocking calls (getAllPorts, pointToPointPortAdd, ...) run in the event loop's
+    default executor. The event loop itself is never blocked.
+
+    The workers of a PortManager can be shared with AsyncNKTP(nktp, ports.workers), so the async calls are queued in order with the
+    rest of the acquisition, and a point-to-point port's worker (point_to_point.py) sees the registers monitored on it and creates
+    them again when it reconnects. Workers for ports that aren't given are started when the port is first used.
+
+    Live-mode register events (see register_events.py) are available as async iterators, with the events of the registers being
+    monitored delivered to the event loop as RegisterEvent tuples. Open the stream before monitoring the registers, so that the
+    events sent when they are first read aren't missed.
+
+    The camera and spectrometer can be driven from the same event loop with loop.run_in_executor(None, spec.intensities) etc.
+
+Usage:
+
+    async def main(nktp):
+        anktp = AsyncNKTP(nktp)
+        await asyncio.gather(anktp.registerWriteU8('COM4', 1, 0x30, 1, -1),
+                             anktp.transaction('COM5', 25, [('U32', 0x90, 600000), ('U16', 0xB0, 500), ('U8', 0x30, 1)]))
+        result, amplitude = await anktp.registerReadU16('COM5', 25, 0xB0, -1)
+
+        async with anktp.events('COM5', 25) as events:
+            await anktp.monitor('COM5', 25, {0x90: 6, 0xB0: 4})
+            async for event in events:
+                print(hex(event.reg_id), event.value)
+        anktp.close()
+"""
+
+import asyncio
+import threading
+from functools import partial
+
+from register_events import RegPriority_High, monitor_registers, register_events
+from register_transactions import PortWorker
+
+# Functions whose first argument is the port name
+PORT_FUNCTION_PREFIXES = ('register', 'device', 'getPort')
+
+
+class AsyncNKTP:
+    def __init__(self, nktp, port_workers=None):
+        self.nktp = nktp
+        self.port_workers = {} if port_workers is None else port_workers
+        self._own_workers = []
+        self._lock = threading.Lock()
+
+    # The worker of a port, started the first time the port is used
+    def worker(self, portname):
+        with self._lock:
+            worker = self.port_workers.get(portname)
+            if worker is None:
+                worker = self.port_workers[portname] = PortWorker(self.nktp, portname)
+                self._own_workers.append(worker)
+            return worker
+
+    # Decoders, callback types and other non-blocking attributes are returned as they are
+    def __getattr__(self, name):
+        attribute = getattr(self.nktp, name)
+        if not callable(attribute) or not name[:1].islower() or name.endswith('FuncPtr') or name.startswith('setCallbackPtr'):
+            return attribute
+
+        if name.startswith(PORT_FUNCTION_PREFIXES):
+            async def port_function(portname, *args):
+                return await self.call(portname, name, *args)
+            port_function.__name__ = name
+            return port_function
+
+        async def function(*args):
+            return await asyncio.get_running_loop().run_in_executor(None, partial(attribute, *args))
+        function.__name__ = name
+        return function
+
+    async def call(self, portname, name, *args):
+        return await asyncio.wrap_future(self.worker(portname).call(name, *args))
+
+    async def transaction(self, portname, devId, writes, verify=False, stop_on_error=True):
+        return await asyncio.wrap_future(self.worker(portname).submit(devId, writes, verify, stop_on_error))
+
+    # A single port is opened or closed on its worker, in order with the commands already queued for it
+    async def openPorts(self, portnames, autoMode, liveMode):
+        if portnames and ',' not in portnames:
+            return await self.call(portnames, 'openPorts', autoMode, liveMode)
+        return await asyncio.get_running_loop().run_in_executor(None, self.nktp.openPorts, portnames, autoMode, liveMode)
+
+    async def closePorts(self, portnames):
+        if portnames and ',' not in portnames:
+            return await self.call(portnames, 'closePorts')
+        return await asyncio.get_running_loop().run_in_executor(None, self.nktp.closePorts, portnames)
+
+    # Opens the port in live mode and monitors the registers ({regId: RegisterDataTypes code}), see register_events.py. The DLL calls
+    # go through the port's worker like any other call, so a point-to-point worker records the registers to create them again after
+    # a reconnect. monitor_registers() waits for each of them, so it runs in the default executor rather than on the worker
+    async def monitor(self, portname, devId, registers, priority=RegPriority_High):
+        worker = self.worker(portname)
+        return await asyncio.get_running_loop().run_in_executor(None, partial(monitor_registers, self.nktp, portname, devId, registers,
+                                                                              priority, port_worker=worker))
+
+    # Async iterator over the register events of the registers being monitored, optionally only those of one port, device or set
+    # of registers. Must be called from the event loop
+    def events(self, portname=None, devId=None, regIds=None, maxsize=1000):
+        return RegisterEventStream(register_events(self.nktp), portname, devId, regIds, maxsize)
+
+    # Stops the port workers this object started. Workers passed in by the caller are left running
+    def close(self):
+        for worker in self._own_workers:
+            worker.close()
+        self._own_workers = []
+
+
+class RegisterEventStream:
+    def __init__(self, events, portname=None, devId=None, regIds=None, maxsize=1000):
+        self.portname = portname
+        self.dev_id = devId
+        self.reg_ids = None if regIds is None else set(regIds)
+        self.dropped = 0
+        self._events = events
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize)
+        self._closed = False
+        events.subscribe(self._on_event)
+
+    # Called on the NKTP kernel thread, hands the event over to the event loop
+    def _on_event(self, event):
+        if self.portname is not None and event.port != self.portname:
+            return
+        if self.dev_id is not None and event.dev_id != self.dev_id:
+            return
+        if self.reg_ids is not None and event.reg_id not in self.reg_ids:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass
+
+    # Events are dropped (and counted) rather than blocking the kernel thread when nobody reads them
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._events.unsubscribe(self._on_event)
+        try:
+            self._loop.call_soon_threadsafe(self._put, None)
+        except RuntimeError:
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
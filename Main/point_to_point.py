@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Point-to-point (Ethernet) NKTP ports.
+
+    NKT devices on Ethernet (e.g. an RF driver behind an NKT Ethernet module) are reached through point-to-point ports: a port name
+    registered with pointToPointPortAdd, giving the local and remote IP address and port number and the protocol (TCP or UDP).
+    Once registered, the port name is used exactly like a COM port, so the calibration, sweep, settle waiter etc. only need the
+    port name, e.g. COM_port = 'SELECT-ETH'. The command latency over Ethernet is much lower than over our serial links.
+
+    PortManager (port_manager.py) takes the point-to-point ports as {port name: pointToPointPortData}, registers them before
+    opening them and deletes them after closing them. Each one gets a PointToPointWorker, which reconnects the port (closes it,
+    registers it again and reopens it) when a register call returns RegResultComError, and then sends the call or transaction
+    again, up to retries times. Reopening the port drops the registers the kernel was monitoring in live mode, so the worker keeps
+    the registerCreate calls sent through it (e.g. by the settle waiter, see register_events.monitor_registers) and makes them again
+    after reconnecting.
+
+    The simulator backend accepts point-to-point ports too, with a local UDP/TCP stand-in for the device
+    (simulator.PointToPointStandIn).
+
+Usage:
+
+    P2P_PORTS = {'SELECT-ETH': point_to_point_port('192.168.1.67', 10001, '192.168.1.100', 10001, protocol='udp')}
+    with PortManager(nktp, ['COM4', 'SELECT-ETH'], live_ports=['SELECT-ETH'], point_to_point=P2P_PORTS) as ports:
+        result = ports.transaction('SELECT-ETH', 25, [('U32', 0x90, 600000), ('U16', 0xB0, 500), ('U8', 0x30, 1)])
+        print(ports['SELECT-ETH'].reconnects)
+"""
+
+from time import sleep
+
+from NKTP_DLL import pointToPointPortData
+from register_transactions import PortWorker
+
+# Protocols of pointToPointPortAdd
+P2P_TCP = 0
+P2P_UDP = 1
+PROTOCOLS = {'tcp': P2P_TCP, 'udp': P2P_UDP}
+
+RegResultComError = 7
+
+
+def point_to_point_port(host_address, host_port, client_address, client_port, protocol='udp', timeout_ms=100):
+    protocol = PROTOCOLS.get(str(protocol).lower(), protocol)
+    if protocol not in (P2P_TCP, P2P_UDP):
+        raise ValueError(f"Unknown point-to-point protocol {protocol!r}, expected 'tcp' or 'udp'")
+    return pointToPointPortData(host_address, int(host_port), client_address, int(client_port), protocol, int(timeout_ms))
+
+
+class PointToPointWorker(PortWorker):
+    def __init__(self, nktp, portname, portdata, live=False, retries=1, retry_delay=0.1):
+        super().__init__(nktp, portname)
+        self.portdata = portdata
+        self.live = live
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.reconnects = 0
+        # Arguments of the registerCreate calls that succeeded, {(devId, regId): args}
+        self.monitors = {}
+
+    # Registers the port with the DLL. Returns a P2PPortResultTypes code
+    def add(self):
+        return self.nktp.pointToPointPortAdd(self.portname, self.portdata)
+
+    def delete(self):
+        return self.nktp.pointToPointPortDel(self.portname)
+
+    # Runs on the worker: closes the port, registers it again, reopens it and monitors the registers it was monitoring again.
+    # Returns the openPorts result
+    def reconnect(self):
+        self.reconnects += 1
+        self.nktp.closePorts(self.portname)
+        sleep(self.retry_delay)
+        result = self.add()
+        if result != 0:
+            print(f'Port {self.portname}: could not register again', self.nktp.P2PPortResultTypes(result))
+            return result
+        result = self.nktp.openPorts(self.portname, 0, int(self.live or bool(self.monitors)))
+        print(f'Port {self.portname}: reconnect', self.nktp.PortResultTypes(result))
+        if result == 0:
+            self.monitor_again()
+        return result
+
+    # Runs on the worker: creates the devices and registers that were being monitored before the port was reopened
+    def monitor_again(self):
+        for devId in {args[0] for args in self.monitors.values()}:
+            self.nktp.deviceCreate(self.portname, devId, 1)
+        for args in self.monitors.values():
+            result = self.nktp.registerCreate(self.portname, *args)
+            if result != 0:
+                print(f'Port {self.portname}: could not monitor register {hex(args[1])} again',
+                      self.nktp.RegisterResultTypes(result))
+
+    def _transaction(self, devId, writes, verify, stop_on_error):
+        result = super()._transaction(devId, writes, verify, stop_on_error)
+        for _ in range(self.retries):
+            if RegResultComError not in result.results or self.reconnect() != 0:
+                break
+            result = super()._transaction(devId, writes, verify, stop_on_error)
+        return result
+
+    def call(self, name, *args):
+        if not name.startswith('register'):
+            return super().call(name, *args)
+        return self.run(self._call, name, *args)
+
+    # Register functions return a RegisterResultTypes code, or (code, value)
+    def _call(self, name, *args):
+        function = getattr(self.nktp, name)
+        result = function(self.portname, *args)
+        for _ in range(self.retries):
+            code = result[0] if isinstance(result, tuple) else result
+            if code != RegResultComError or self.reconnect() != 0:
+                break
+            result = function(self.portname, *args)
+        if name == 'registerCreate' and result == 0:
+            self.monitors[tuple(args[:2])] = args
+        return result
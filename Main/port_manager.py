@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Per-port workers for the NKTP devices.
+
+    The COMPACT laser is on COM4 (devId 1) and the SELECT RF driver on COM5 (devId 25). PortManager opens every port once with
+    openPorts at the start of the session and closes it with closePorts at the end, rather than relying on the DLL opening and closing
+    the port around every call. Each port gets its own worker thread (a PortWorker, see register_transactions.py):
+        - the commands to one port are run one at a time, in the order they were submitted
+        - the commands to different ports run in parallel, so e.g. switching the emission off on COM4 doesn't wait for an RF
+          transaction on COM5
+
+    If a port can't be opened, open() raises a RuntimeError with the PortResultTypes code, so the session never silently falls back
+    to the DLL's implicit open.
+
+    Point-to-point (Ethernet) ports are given as {port name: pointToPointPortData} and are listed in ports like the COM ports. They
+    are registered with pointToPointPortAdd before being opened, deleted after being closed, and reconnected by their worker after a
+    RegResultComError (see point_to_point.py).
+
+Usage:
+
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        emission = ports.submit('COM4', 'registerWriteU8', 1, 0x30, 1, -1)     # returns a Future straight away
+        result = ports.transaction('COM5', 25, [('U32', 0x90, 600000), ('U16', 0xB0, 500), ('U8', 0x30, 1)])
+        emission.result()
+        select_port = ports['COM5']                                             # the PortWorker, e.g. for PowerCalibrator
+"""
+
+from point_to_point import PointToPointWorker
+from register_transactions import PortWorker
+
+
+class PortManager:
+    def __init__(self, nktp, ports, live_ports=(), auto_mode=0, point_to_point=None):
+        self.nktp = nktp
+        self.ports = list(ports)
+        self.live_ports = set(live_ports)
+        self.auto_mode = auto_mode
+        self.point_to_point = dict(point_to_point or {})
+        self.workers = {port: self._worker(port) for port in self.ports}
+        self.opened = []
+        self.added = []
+
+    def _worker(self, port):
+        if port in self.point_to_point:
+            return PointToPointWorker(self.nktp, port, self.point_to_point[port], live=port in self.live_ports)
+        return PortWorker(self.nktp, port)
+
+    def __getitem__(self, port):
+        return self.workers[port]
+
+    # Registers the point-to-point ports, then opens all ports at the same time, each on its own worker
+    def open(self):
+        failed = []
+        for port in self.ports:
+            if port in self.point_to_point:
+                result = self.workers[port].add()
+                if result == 0:
+                    self.added.append(port)
+                else:
+                    failed.append(f'{port} ({self.nktp.P2PPortResultTypes(result)})')
+        if failed:
+            self.close()
+            raise RuntimeError('Could not add point-to-point port ' + ', '.join(failed))
+
+        futures = {port: self.workers[port].call('openPorts', self.auto_mode, int(port in self.live_ports)) for port in self.ports}
+        for port, future in futures.items():
+            result = future.result()
+            if result == 0:
+                self.opened.append(port)
+                print(f'Port {port}: opened')
+            else:
+                failed.append(f'{port} ({self.nktp.PortResultTypes(result)})')
+        if failed:
+            self.close()
+            raise RuntimeError('Could not open port ' + ', '.join(failed))
+        return self
+
+    # Queues an NKTP function that takes the port name as its first argument and returns a Future for its result
+    def submit(self, port, name, *args):
+        return self.workers[port].call(name, *args)
+
+    def call(self, port, name, *args):
+        return self.submit(port, name, *args).result()
+
+    def transaction(self, port, devId, writes, verify=False, stop_on_error=True):
+        return self.workers[port].transaction(devId, writes, verify, stop_on_error)
+
+    # Closes the ports once everything already queued on them has run, deletes the point-to-point ports, then stops the workers
+    def close(self):
+        futures = {port: self.workers[port].call('closePorts') for port in self.opened}
+        for port, future in futures.items():
+            result = future.result()
+            print(f'Port {port}: closed', self.nktp.PortResultTypes(result))
+        self.opened = []
+        for port in self.added:
+            self.workers[port].delete()
+        self.added = []
+        for worker in self.workers.values():
+            worker.close()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
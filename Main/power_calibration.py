@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Power normalisation of the SuperK SELECT AOTF.
+
+    For each wavelength of the sweep, the RF amplitude of the SELECT is adjusted until the measured count is within tolerance of the
+    target count, so that every band of the hypercube is recorded with (roughly) the same optical power.
+
+    The count is measured by a function supplied by the caller, measure(wavelength), which takes the wavelength in pm and returns the
+    calibrated count (e.g. the dark/white corrected spectrometer reading nearest to the wavelength).
+
+Warm start:
+
+    Every probe costs three register writes, a settle time and a spectrometer reading, so the calibrator tries to need as few as
+    possible per band:
+        - each band starts from the amplitude found for the same wavelength by a previous calibration with the same setup
+          (initial_amplitudes, see previous_amplitudes()), or otherwise from the amplitude the previous band converged to, rather
+          than from 500
+        - once two probes have been made for a band, the next amplitude is found with a secant step on the measured
+          count-vs-amplitude slope. For the first probe, the slope measured at the neighbouring band is used (a Newton step), and the
+          original clamped proportional step (error / 3, at most 100) is only used when no usable slope is known
+    Most bands then land within tolerance after one or two probes.
+
+    If a SettleWaiter (aotf_settle.py) is given, each probe waits for the RF driver to confirm the new settings instead of sleeping for
+    settle_time, which then becomes the timeout.
+
+Usage:
+
+    calibrator = PowerCalibrator(nktp, get_spectrometer_count, TARGET_COUNT, TOLERANCE, MAX_ITERATIONS, port='COM5')
+    key = CalibrationCache.make_key(select_serial, spec.serial_number, spec_integration_time, TARGET_COUNT, Wavelengths)
+    initial_amplitudes = previous_amplitudes('calibration_results.csv', Wavelengths, key)
+    final_amplitudes, final_counts = calibrator.calibrate(Wavelengths, initial_amplitudes)
+    save_calibration('calibration_results.csv', Wavelengths, final_amplitudes, final_counts, key)
+"""
+
+import json
+import os
+from time import perf_counter, sleep
+
+import numpy as np
+
+from aotf_settle import REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH
+from register_transactions import run_transaction
+
+CALIBRATION_HEADER = 'Wavelength (pm),Amplitude,Count'
+
+# Largest amplitude change a secant/Newton step may make, so that one noisy reading can't throw the amplitude across the range
+MAX_SECANT_STEP = 250
+
+
+class PowerCalibrator:
+    def __init__(self, nktp, measure, target_count, tolerance, max_iterations, port='COM5', dev_id=25, settle_time=0.1,
+                 start_amplitude=500, warm_start=True, secant=True, settle_waiter=None, port_worker=None,
+                 verbose=True):
+        self.nktp = nktp
+        self.measure = measure
+        self.target_count = target_count
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.port = port
+        self.dev_id = dev_id
+        self.settle_time = settle_time
+        self.start_amplitude = start_amplitude
+        self.warm_start = warm_start
+        self.secant = secant
+        self.settle_waiter = settle_waiter
+        self.port_worker = port_worker
+        self.verbose = verbose
+        self.slope = None
+        self.iterations = []
+        self.timings = {'write': [], 'settle': [], 'measure': [], 'band': []}
+
+    def log(self, *args):
+        if self.verbose:
+            print(*args)
+
+    # initial_amplitudes is optional, one starting amplitude per wavelength (NaN where there is none)
+    def calibrate(self, wavelengths, initial_amplitudes=None):
+        final_amplitudes = np.zeros(len(wavelengths))
+        final_counts = np.zeros(len(wavelengths))
+        self.iterations = []
+        self.slope = None
+
+        for i, wavelength in enumerate(wavelengths):
+            start_amplitude = self.start_amplitude
+            if initial_amplitudes is not None and np.isfinite(initial_amplitudes[i]):
+                start_amplitude = initial_amplitudes[i]
+            elif self.warm_start and i > 0:
+                start_amplitude = final_amplitudes[i - 1]
+
+            start = perf_counter()
+            final_amplitudes[i], final_counts[i], iterations = self.calibrate_band(wavelength, start_amplitude)
+            self.iterations.append(iterations)
+            self.timings['band'].append(perf_counter() - start)
+
+        return final_amplitudes, final_counts
+
+    # Runs the register writes as one transaction, on the port worker if there is one. The settle waiter is told about them first
+    def transaction(self, writes):
+        if self.settle_waiter is not None:
+            self.settle_waiter.written(writes)
+        if self.port_worker is not None:
+            return self.port_worker.transaction(self.dev_id, writes)
+        return run_transaction(self.nktp, self.port, self.dev_id, writes)
+
+    # Returns the amplitude, the count measured at that amplitude and the number of probes it took
+    def calibrate_band(self, wavelength, start_amplitude=None):
+        lam = int(wavelength)
+        amplitude = self.start_amplitude if start_amplitude is None else start_amplitude
+        probes = []
+
+        for iteration in range(self.max_iterations):
+            amplitude = int(amplitude)
+            count = self.probe(wavelength, amplitude)
+            probes.append((amplitude, count))
+
+            if abs(count - self.target_count) <= self.tolerance:
+                self.log(f'Target reached for wavelength {lam} pm')
+                break
+
+            amplitude = self.next_amplitude(probes)
+
+            start = perf_counter()
+            self.transaction([('U8', REG_RF_POWER, 0)])
+            self.log('RF power OFF')
+            self.timings['write'].append(perf_counter() - start)
+
+            if iteration == self.max_iterations - 1:
+                self.log(f'Warning: Max iterations reached for wavelength {lam} pm')
+
+        slope = self.probe_slope(probes)
+        if slope is not None:
+            self.slope = slope
+
+        # The last amplitude probed, not the next one to try, if the band ran out of iterations
+        amplitude, count = probes[-1]
+        return amplitude, count, iteration + 1
+
+    # Sets the wavelength and amplitude, waits for the AOTF to settle and returns the measured count
+    def probe(self, wavelength, amplitude):
+        lam = int(wavelength)
+        amplitude = int(amplitude)
+
+        start = perf_counter()
+        result = self.transaction([('U32', REG_WAVELENGTH, lam), ('U16', REG_AMPLITUDE, amplitude), ('U8', REG_RF_POWER, 1)])
+        self.timings['write'].append(perf_counter() - start)
+        self.log(f'Setting wavelength {lam} pm')
+        self.log(f'Setting amplitude {amplitude}')
+        self.log('RF power ON')
+        if not result.ok:
+            self.log('Register write failed:', ', '.join(f'{hex(regId)} {self.nktp.RegisterResultTypes(code)}'
+                                                         for regId, code in result.failures()))
+
+        # Wait for the RF driver to confirm the new settings if we can, otherwise for the fixed settle time
+        start = perf_counter()
+        if self.settle_waiter is not None:
+            self.settle_waiter.wait({REG_WAVELENGTH: lam, REG_AMPLITUDE: amplitude, REG_RF_POWER: 1}, self.settle_time)
+        else:
+            sleep(self.settle_time)
+        self.timings['settle'].append(perf_counter() - start)
+
+        start = perf_counter()
+        count = self.measure(wavelength)
+        self.timings['measure'].append(perf_counter() - start)
+        self.log(f'Count: {count}')
+        return count
+
+    # Count-vs-amplitude slope from the last two probes, None if they don't give a usable (positive) slope
+    def probe_slope(self, probes):
+        if len(probes) < 2:
+            return None
+        (a0, c0), (a1, c1) = probes[-2], probes[-1]
+        if a1 == a0:
+            return None
+        slope = (c1 - c0) / (a1 - a0)
+        return slope if slope > 0 else None
+
+    def next_amplitude(self, probes):
+        amplitude, count = probes[-1]
+        error = self.target_count - count
+
+        slope = None
+        if self.secant:
+            slope = self.probe_slope(probes) if len(probes) >= 2 else self.slope
+
+        if slope is not None:
+            step = int(round(np.clip(error / slope, -MAX_SECANT_STEP, MAX_SECANT_STEP)))
+            if step == 0:
+                step = 1 if error > 0 else -1
+            return int(min(1000, max(1, amplitude + step)))
+
+        step_size = max(1, min(100, abs(int(error / 3))))
+
+        if count < self.target_count:
+            return min(1000, amplitude + step_size)
+        else:
+            return max(1, amplitude - step_size)
+
+
+# Where the setup of a saved calibration is kept: calibration_results.json next to calibration_results.csv
+def setup_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+# Setup a calibration was made with: its calibration cache key (CalibrationCache.make_key) without the wavelength grid, which
+# previous_amplitudes() interpolates across
+def calibration_setup(key):
+    return {name: value for name, value in key.items() if name != 'wavelengths_pm'}
+
+# Saves the calibration, and the setup it was made with if key is given
+def save_calibration(path, wavelengths, amplitudes, counts, key=None):
+    np.savetxt(path,
+               np.column_stack((wavelengths, amplitudes, counts)),
+               delimiter=',',
+               header=CALIBRATION_HEADER,
+               comments='')
+    if key is not None:
+        with open(setup_path(path), 'w') as f:
+            json.dump(calibration_setup(key), f, indent=1)
+    elif os.path.exists(setup_path(path)):
+        os.remove(setup_path(path))
+
+# Returns the wavelengths (pm), amplitudes and counts saved by save_calibration
+def load_calibration(path):
+    data = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    return data[:, 0], data[:, 1], data[:, 2]
+
+# The setup saved with a calibration, or None
+def load_setup(path):
+    if not os.path.exists(setup_path(path)):
+        return None
+    with open(setup_path(path)) as f:
+        return json.load(f)
+
+# Amplitudes of an earlier calibration interpolated onto wavelengths, to start the calibration from. NaN outside the wavelength range
+# it covered. Returns None if there is no earlier calibration, or if key is given and the calibration wasn't saved with the same
+# setup (SELECT, spectrometer or camera, integration time, readout and target count)
+def previous_amplitudes(path, wavelengths, key=None):
+    if not os.path.exists(path):
+        return None
+    if key is not None and load_setup(path) != calibration_setup(key):
+        return None
+    cal_wavelengths, amplitudes, counts = load_calibration(path)
+    order = np.argsort(cal_wavelengths)
+    return np.interp(wavelengths, cal_wavelengths[order], amplitudes[order], left=np.nan, right=np.nan)
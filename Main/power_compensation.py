@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorised power compensation.
+
+    Compensates spectra and hypercubes for the RF amplitude that the power normalisation chose at each wavelength. The amplitude
+    interpolator is evaluated over a whole wavelength array at once rather than pixel by pixel, and the resulting compensation vector
+    is cached per wavelength grid, so compensating a spectrum or a whole hypercube is a single array operation.
+
+    All wavelengths are in pm, like the calibration table. Spectrometer wavelengths (nm) must be multiplied by 1000 first.
+
+Usage:
+
+    compensation = PowerCompensation(wavelengths_cal, amplitudes_cal)
+    amplitudes = compensation.amplitudes(Wavelengths)
+    compensated_intensities = compensation.compensate(wavelengths * 1000, total_intensities)
+    compensated_cube = compensation.compensate_cube(cube_store.bands, Wavelengths)
+"""
+
+import numpy as np
+from scipy.interpolate import interp1d
+
+
+class PowerCompensation:
+    def __init__(self, wavelengths_cal, amplitudes_cal, max_cached_grids=8):
+        self.amplitude_interpolator = interp1d(wavelengths_cal, amplitudes_cal, kind='linear', fill_value='extrapolate')
+        self.max_cached_grids = max_cached_grids
+        self._vectors = {}
+
+    # Compensation factor at each wavelength: 1000 / calibrated amplitude, or 1 where the amplitude is not positive
+    def factors(self, wavelengths):
+        normalized_amplitude = self.amplitude_interpolator(np.asarray(wavelengths, dtype=float)) / 1000
+        factors = np.ones_like(normalized_amplitude)
+        np.divide(1, normalized_amplitude, out=factors, where=normalized_amplitude > 0)
+        return factors
+
+    # RF amplitude to set at each wavelength, clamped to the SELECT's 1-1000 range
+    def amplitudes(self, wavelengths):
+        return np.clip((1000 / self.factors(wavelengths)).astype(int), 1, 1000)
+
+    # 1 / factors for a wavelength grid, cached so repeated spectra on the same grid cost one multiplication
+    def vector(self, wavelengths):
+        wavelengths = np.ascontiguousarray(wavelengths, dtype=float)
+        key = (wavelengths.shape, hash(wavelengths.tobytes()))
+        vector = self._vectors.get(key)
+        if vector is None:
+            if len(self._vectors) >= self.max_cached_grids:
+                self._vectors.pop(next(iter(self._vectors)))
+            vector = 1 / self.factors(wavelengths)
+            vector.setflags(write=False)
+            self._vectors[key] = vector
+        return vector
+
+    def compensate(self, wavelengths, intensities):
+        return np.asarray(intensities) * self.vector(wavelengths)
+
+    # Compensates every band of a cube in one operation. band_axis is 0 for a band-sequential (band, row, col) cube such as
+    # HypercubeStore.bands, or -1 for a (row, col, band) cube. Pass out to write the result into an existing float array
+    def compensate_cube(self, cube, band_wavelengths, band_axis=0, out=None):
+        vector = self.vector(band_wavelengths)
+        shape = [1] * np.ndim(cube)
+        shape[band_axis] = -1
+        return np.multiply(cube, vector.reshape(shape), out=out)
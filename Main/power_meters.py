@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Power meters for the power normalisation.
+
+    PowerCalibrator (power_calibration.py) measures each probe with measure(wavelength), wavelength in pm. Both ways of measuring the
+    power are meters with that call, so the calibrator, the calibration cache and the warm start work the same with either:
+        - SpectrometerMeter     the dark/white corrected spectrometer count of the band (see spectrometer_session.py)
+        - CameraROIMeter        the mean grey level of a region of the camera image of a white target, with the dark level (RF power
+                                off) subtracted. The hypercube is measured by the camera, whose spectral response differs from the
+                                spectrometer's, so calibrating on the camera flattens what the camera actually sees
+    Each meter also gives the serial number, integration (exposure) time and readout that key its calibrations in the calibration
+    cache.
+
+    CameraROIMeter uses the persistent CameraSession (camera_session.py): every measurement is a software trigger on the session
+    that is already grabbing, copied into a frame buffer allocated once, and only the region of interest is averaged. The target
+    count is then in grey levels, e.g. about half of the camera's full scale, and must not saturate the region.
+
+Usage:
+
+    meter = CameraROIMeter(camera, exposure_time, roi=(120, 360, 160, 480))
+    ports.call('COM5', 'registerWriteU8', 25, 0x30, 0, -1)     # RF power off for the dark level
+    meter.capture_dark()
+    calibrator = PowerCalibrator(nktp, meter, TARGET_COUNT, TOLERANCE, MAX_ITERATIONS)
+    key = cache.make_key(select_serial, meter.serial_number, meter.integration_time, TARGET_COUNT, Wavelengths, meter.readout)
+"""
+
+import numpy as np
+
+
+class SpectrometerMeter:
+    def __init__(self, spec, integration_time, dark_reference, calibration_factors):
+        self.spec = spec
+        self.integration_time = int(integration_time)
+        self.dark_reference = dark_reference
+        self.calibration_factors = calibration_factors
+        self.serial_number = spec.serial_number
+        line_width = getattr(spec, 'line_width_nm', None)
+        self.readout = f'line {line_width} nm' if line_width else None
+
+    # Calibrated count of the band, from the pixels set up with spec.set_bands()
+    def __call__(self, wavelength):
+        self.spec.integration_time_micros(self.integration_time)
+        intensities = self.spec.intensities()
+        return self.spec.band_count(intensities, wavelength / 1000, self.dark_reference, self.calibration_factors)
+
+
+class CameraROIMeter:
+    def __init__(self, camera, exposure_time, roi=None, n_frames=1):
+        self.camera = camera
+        self.exposure_time = exposure_time
+        self.integration_time = int(exposure_time)
+        self.n_frames = n_frames
+        self.serial_number = getattr(camera, 'serial_number', 'camera')
+        height, width = camera.shape
+        # (first row, last row + 1, first column, last column + 1), the central half of the image by default
+        if roi is None:
+            roi = (height // 4, 3 * height // 4, width // 4, 3 * width // 4)
+        self.roi = tuple(int(x) for x in roi)
+        row0, row1, col0, col1 = self.roi
+        if not (0 <= row0 < row1 <= height and 0 <= col0 < col1 <= width):
+            raise ValueError(f'Camera ROI {self.roi} is outside the {width}x{height} image')
+        self.readout = f'camera roi {row0}:{row1},{col0}:{col1}'
+        self.dark_level = 0.0
+        self.saturated_frames = 0
+        self._frame = None
+
+    # Triggers a frame on the grabbing session into the frame buffer, and returns the region of interest
+    def _grab_roi(self):
+        self.camera.set_exposure(self.exposure_time)
+        if self._frame is None:
+            frame = self.camera.grab()
+            if frame is not None:
+                self._frame = frame
+        else:
+            frame = self.camera.grab(out=self._frame)
+        if frame is None:
+            raise RuntimeError('Camera: no frame for the power normalisation')
+        row0, row1, col0, col1 = self.roi
+        return self._frame[row0:row1, col0:col1]
+
+    def _mean(self):
+        total = 0.0
+        for _ in range(self.n_frames):
+            roi = self._grab_roi()
+            if roi.dtype.kind in 'ui' and roi.max() >= np.iinfo(roi.dtype).max:
+                self.saturated_frames += 1
+            total += roi.mean(dtype=np.float64)
+        return total / self.n_frames
+
+    # Mean level of the region with no light from the AOTF. The RF power must be off
+    def capture_dark(self):
+        self.dark_level = self._mean()
+        return self.dark_level
+
+    def __call__(self, wavelength):
+        return self._mean() - self.dark_level
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Write-through cache for NKTP register writes.
+
+    The sweep switches the RF power on for every band and the calibration rewrites the amplitude even when it hasn't changed, and
+    every one of those writes is a serial round-trip to the device. RegisterCache wraps the NKTP_DLL register API (the module, or the
+    simulator) and remembers the last value each device acknowledged, per (port, devId, regId, index). A typed write
+    (registerWriteU8 ... registerWriteF64) of the value the register already holds is skipped and reported as successful.
+
+    The cache only knows about the writes that went through it, so it is dropped:
+        - for a port, when the port is opened or closed again (openPorts/closePorts)
+        - for a device, when any register access to it fails (the device may have been reset or disconnected)
+        - for a register, when it is written with an untyped or ASCII write (registerWrite, registerWriteAscii, ...)
+        - explicitly, with invalidate()
+    Everything else is passed straight through to the wrapped API, so RegisterCache can be used wherever nktp is used.
+
+    Writes to the same register are serialised (the compare, the write and the cached value happen under a per-register lock),
+    so two threads writing the same register can't both skip, or leave the cache holding the value the device didn't end up with.
+
+Usage:
+
+    nktp = RegisterCache(backend.nktp)
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)      # written
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)      # skipped
+    print(nktp.skipped, 'writes skipped')
+"""
+
+import threading
+
+RegResultSuccess = 0
+
+TYPED_WRITES = ('registerWriteU8', 'registerWriteS8', 'registerWriteU16', 'registerWriteS16', 'registerWriteU32',
+                'registerWriteS32', 'registerWriteU64', 'registerWriteS64', 'registerWriteF32', 'registerWriteF64')
+TYPED_WRITE_READS = tuple(name.replace('registerWrite', 'registerWriteRead') for name in TYPED_WRITES)
+UNTYPED_WRITES = ('registerWrite', 'registerWriteAscii', 'registerWriteRead', 'registerWriteReadAscii')
+READS = ('registerRead', 'registerReadU8', 'registerReadS8', 'registerReadU16', 'registerReadS16', 'registerReadU32',
+         'registerReadS32', 'registerReadU64', 'registerReadS64', 'registerReadF32', 'registerReadF64', 'registerReadAscii')
+
+
+class RegisterCache:
+    def __init__(self, nktp, enabled=True):
+        self.nktp = nktp
+        self.enabled = enabled
+        self.values = {}
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    # Everything that isn't cached goes straight to the wrapped API
+    def __getattr__(self, name):
+        return getattr(self.nktp, name)
+
+    # Forgets the cached values of a port, a device or a single register. With no arguments the whole cache is dropped
+    def invalidate(self, portname=None, devId=None, regId=None):
+        with self._lock:
+            for key in list(self.values):
+                if (portname is None or key[0] == portname) and (devId is None or key[1] == devId) and (regId is None or key[2] == regId):
+                    del self.values[key]
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # Counts the write and stores the value the device acknowledged. A failed write drops the device, this register included
+    def _written(self, key, result, value):
+        with self._lock:
+            self.written += 1
+            if result == RegResultSuccess:
+                self.values[key] = value
+                return
+        self.invalidate(key[0], key[1])
+
+    # The cached value is dropped while the write is in flight, so it is gone if the write raises
+    def _call(self, key, name, *args):
+        with self._lock:
+            self.values.pop(key, None)
+        return getattr(self.nktp, name)(*args)
+
+    def _write(self, name, portname, devId, regId, value, index):
+        key = (portname, devId, regId, index)
+        with self._key_lock(key):
+            with self._lock:
+                if self.enabled and self.values.get(key) == value:
+                    self.skipped += 1
+                    return RegResultSuccess
+
+            result = self._call(key, name, portname, devId, regId, value, index)
+            self._written(key, result, value)
+            return result
+
+    # The value read back after the write is what the device really holds (it may have clamped the value written)
+    def _write_read(self, name, portname, devId, regId, value, index):
+        key = (portname, devId, regId, index)
+        with self._key_lock(key):
+            result, readValue = self._call(key, name, portname, devId, regId, value, index)
+            self._written(key, result, readValue)
+            return result, readValue
+
+    # Dropped before and after the write, in case a typed write of the same register stored a value in between
+    def _untyped_write(self, name, portname, devId, regId, *args):
+        self.invalidate(portname, devId, regId)
+        try:
+            result = getattr(self.nktp, name)(portname, devId, regId, *args)
+        finally:
+            self.invalidate(portname, devId, regId)
+        with self._lock:
+            self.written += 1
+        if (result[0] if isinstance(result, tuple) else result) != RegResultSuccess:
+            self.invalidate(portname, devId)
+        return result
+
+    def _read(self, name, portname, devId, regId, index):
+        result = getattr(self.nktp, name)(portname, devId, regId, index)
+        if result[0] != RegResultSuccess:
+            self.invalidate(portname, devId)
+        return result
+
+    def openPorts(self, portnames, autoMode, liveMode):
+        self._invalidate_ports(portnames)
+        return self.nktp.openPorts(portnames, autoMode, liveMode)
+
+    def closePorts(self, portnames):
+        self._invalidate_ports(portnames)
+        return self.nktp.closePorts(portnames)
+
+    # portnames is a comma separated list, where an empty string means all ports
+    def _invalidate_ports(self, portnames):
+        ports = [p for p in portnames.split(',') if p]
+        if not ports:
+            self.invalidate()
+        for portname in ports:
+            self.invalidate(portname)
+
+
+def _method(handler, name):
+    def method(self, *args):
+        return getattr(self, handler)(name, *args)
+    method.__name__ = name
+    return method
+
+
+for _name in TYPED_WRITES:
+    setattr(RegisterCache, _name, _method('_write', _name))
+for _name in TYPED_WRITE_READS:
+    setattr(RegisterCache, _name, _method('_write_read', _name))
+for _name in UNTYPED_WRITES:
+    setattr(RegisterCache, _name, _method('_untyped_write', _name))
+for _name in READS:
+    setattr(RegisterCache, _name, _method('_read', _name))
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Live-mode register events.
+
+    In live mode the NKTP kernel polls the registers created with registerCreate and calls the register status callback whenever one
+    of them changes. The DLL only holds one register callback, so RegisterEvents installs it once per NKTP API and passes every event
+    on to any number of subscribers (the settle waiter, the asyncio event streams of nktp_async.py, ...).
+
+    Subscribers are called on the NKTP kernel thread with a RegisterEvent, and must not call DLL functions or block. The event holds
+    a copy of the register data, so it can be kept after the callback has returned; event.value decodes it according to its
+    RegisterDataTypes code.
+
+Usage:
+
+    events = register_events(nktp)
+    monitor_registers(nktp, 'COM5', 25, {0x90: 6, 0xB0: 4}, port_worker=ports['COM5'])
+    events.subscribe(print)
+    ...
+    events.unsubscribe(print)
+"""
+
+import ctypes
+import struct
+import threading
+import weakref
+from collections import namedtuple
+
+# RegisterDataTypes codes and the struct format of their data
+DATA_FORMATS = {2: '<B', 3: '<b', 4: '<H', 5: '<h', 6: '<I', 7: '<i', 8: '<f', 9: '<Q', 10: '<q', 11: '<d'}
+RegData_Ascii = 12
+RegPriority_High = 1
+
+
+class RegisterEvent(namedtuple('RegisterEvent', ['port', 'dev_id', 'reg_id', 'status', 'data_type', 'data'])):
+    __slots__ = ()
+
+    # The register value decoded according to data_type: a number, a string for ASCII registers, otherwise the raw bytes
+    @property
+    def value(self):
+        fmt = DATA_FORMATS.get(self.data_type)
+        if fmt is not None and len(self.data) >= struct.calcsize(fmt):
+            return struct.unpack_from(fmt, self.data)[0]
+        if self.data_type == RegData_Ascii:
+            return self.data.split(b'\0', 1)[0].decode('ascii', 'replace')
+        return self.data
+
+
+class RegisterEvents:
+    def __init__(self, nktp):
+        self.nktp = nktp
+        self._subscribers = []
+        self._lock = threading.Lock()
+        # Keep a reference to the callback so it isn't garbage collected while the DLL holds it
+        self._callback = nktp.registerStatusCallbackFuncPtr(self._on_register)
+        self._installed = False
+
+    def _on_register(self, portname, devId, regId, status, regType, regDataLen, regData):
+        data = ctypes.string_at(regData, regDataLen) if regData else b''
+        event = RegisterEvent(portname.decode('ascii'), devId, regId, status, regType, data)
+        for subscriber in self._subscribers:
+            subscriber(event)
+
+    def subscribe(self, subscriber):
+        with self._lock:
+            self._subscribers = self._subscribers + [subscriber]
+            if not self._installed:
+                self.nktp.setCallbackPtrRegisterInfo(self._callback)
+                self._installed = True
+
+    # The callback is removed from the DLL once the last subscriber has gone
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+            if self._installed and not self._subscribers:
+                self.nktp.setCallbackPtrRegisterInfo(None)
+                self._installed = False
+
+
+_dispatchers = weakref.WeakKeyDictionary()
+_dispatchers_lock = threading.Lock()
+
+
+# The RegisterEvents of an NKTP API. Wrappers such as RegisterCache share the one of the API they wrap, since they share its DLL
+def register_events(nktp):
+    while getattr(nktp, 'nktp', None) is not None:
+        nktp = nktp.nktp
+    with _dispatchers_lock:
+        events = _dispatchers.get(nktp)
+        if events is None:
+            events = _dispatchers[nktp] = RegisterEvents(nktp)
+        return events
+
+
+# Opens the port in live mode and asks the kernel to monitor the registers ({regId: RegisterDataTypes code}). The DLL calls go
+# through the port's worker if one is given, in order with everything else sent to the port.
+# Returns 0, or the first failing PortResultTypes/RegisterResultTypes code
+def monitor_registers(nktp, port, dev_id, registers, priority=RegPriority_High, port_worker=None):
+    def call(name, *args):
+        if port_worker is None:
+            return getattr(nktp, name)(port, *args)
+        return port_worker.call(name, *args).result()
+
+    result = call('openPorts', 0, 1)
+    if result != 0:
+        print('Could not open port in live mode', nktp.PortResultTypes(result))
+        return result
+    call('deviceCreate', dev_id, 1)
+
+    for regId, dataType in registers.items():
+        result = call('registerCreate', dev_id, regId, priority, dataType)
+        if result != 0:
+            print('Could not monitor register', hex(regId), nktp.RegisterResultTypes(result))
+            return result
+    return 0
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Batched register transactions.
+
+    Tuning the SELECT to a band takes three register writes (wavelength 0x90, amplitude 0xB0, RF power 0x30), each a separate
+    blocking call. A transaction is the list of typed writes for one device, written one after the other in a single call, and
+    returns the RegisterResultTypes code of every write at once:
+
+        writes = [('U32', 0x90, lam), ('U16', 0xB0, amplitude), ('U8', 0x30, 1)]
+        result = run_transaction(nktp, 'COM5', 25, writes)
+        result.results          # [0, 0, 0]
+        result.ok               # True if every write succeeded
+
+    Each write is (type, regId, value) or (type, regId, value, index), where type is the suffix of the NKTP_DLL function
+    (U8, S8, U16, S16, U32, S32, U64, S64, F32, F64) and index defaults to -1. By default a transaction stops at the first write that
+    fails, and the writes after it are not sent (their result is None). With verify=True every value is written with
+    registerWriteRead* and result.values holds the values read back, so result.verified tells whether the device holds what was
+    written.
+
+    A PortWorker runs the transactions for one port on its own thread, so a port only ever sees one transaction at a time, in the
+    order they were submitted, whichever thread they came from.
+
+Usage:
+
+    worker = PortWorker(nktp, 'COM5')
+    result = worker.transaction(25, writes, verify=True)
+    future = worker.submit(25, writes)      # returns straight away
+    future = worker.call('registerReadU16', 25, 0xB0, -1)
+    worker.close()
+"""
+
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+RegResultSuccess = 0
+
+REGISTER_TYPES = ('U8', 'S8', 'U16', 'S16', 'U32', 'S32', 'U64', 'S64', 'F32', 'F64')
+
+
+class TransactionResult(namedtuple('TransactionResult', ['writes', 'results', 'values'])):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return all(result == RegResultSuccess for result in self.results)
+
+    # True if every write succeeded and was read back with the value written. Always False without verify
+    @property
+    def verified(self):
+        if not self.ok or self.values is None:
+            return False
+        for write, value in zip(self.writes, self.values):
+            expected = write[2]
+            if write[0].startswith('F'):
+                if abs(value - expected) > 1e-6 * max(1.0, abs(expected)):
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    # (regId, result) of every write that failed or wasn't sent
+    def failures(self):
+        return [(write[1], result) for write, result in zip(self.writes, self.results) if result != RegResultSuccess]
+
+
+def run_transaction(nktp, portname, devId, writes, verify=False, stop_on_error=True):
+    writes = [tuple(write) for write in writes]
+    for write in writes:
+        if write[0] not in REGISTER_TYPES:
+            raise ValueError(f'Unknown register type {write[0]!r}, expected one of: {", ".join(REGISTER_TYPES)}')
+
+    results = [None] * len(writes)
+    values = [None] * len(writes) if verify else None
+    prefix = 'registerWriteRead' if verify else 'registerWrite'
+
+    for k, write in enumerate(writes):
+        dataType, regId, value = write[:3]
+        index = write[3] if len(write) > 3 else -1
+        function = getattr(nktp, prefix + dataType)
+        if verify:
+            results[k], values[k] = function(portname, devId, regId, value, index)
+        else:
+            results[k] = function(portname, devId, regId, value, index)
+        if stop_on_error and results[k] != RegResultSuccess:
+            break
+
+    return TransactionResult(writes, results, values)
+
+
+class PortWorker:
+    def __init__(self, nktp, portname):
+        self.nktp = nktp
+        self.portname = portname
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'port-{portname}', initializer=self._started)
+
+    def _started(self):
+        self._thread = threading.current_thread()
+
+    def _transaction(self, devId, writes, verify, stop_on_error):
+        return run_transaction(self.nktp, self.portname, devId, writes, verify, stop_on_error)
+
+    # Queues the transaction and returns a Future for its TransactionResult
+    def submit(self, devId, writes, verify=False, stop_on_error=True):
+        return self._executor.submit(self._transaction, devId, writes, verify, stop_on_error)
+
+    # Queues any NKTP function that takes the port name as its first argument, e.g. call('registerReadU16', 25, 0xB0, -1), and
+    # returns a Future for its result
+    def call(self, name, *args):
+        return self.run(getattr(self.nktp, name), self.portname, *args)
+
+    # Queues function(*args) behind everything already submitted to this port
+    def run(self, function, *args):
+        return self._executor.submit(function, *args)
+
+    # Runs the transaction and waits for its TransactionResult. Called from the worker itself, it runs straight away
+    def transaction(self, devId, writes, verify=False, stop_on_error=True):
+        if threading.current_thread() is self._thread:
+            return self._transaction(devId, writes, verify, stop_on_error)
+        return self.submit(devId, writes, verify, stop_on_error).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
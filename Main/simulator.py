@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+"""
+In-process simulator for the NKT Photonics SuperK COMPACT + SELECT, the Ocean spectrometer and the Basler camera.
+
+    Lets a full calibration and sweep run on a machine with no devices attached (and without the Windows NKTPDLL.dll), so that
+    sweep throughput can be benchmarked and regression-tested on Linux. Use it through backends.load_backend('simulator') rather than
+    directly. The result code decoders and the callback prototype come from the NKTP_DLL package, which doesn't need the DLL for
+    those.
+
+SimulatedNKTP:
+
+    Stands in for the NKTP_DLL module: same function names, arguments and return values as the register functions used by the
+    scripts. Each register transaction takes register_latency seconds and transactions on one port are serialised, as on a real
+    serial link. The registers that matter to the optics are honoured:
+        - COMPACT (devId 1 on COM4)     0x30 emission on/off
+        - SELECT RF driver (devId 25)   0x30 RF power on/off, 0x90-0x97 channel wavelength (pm), 0xB0-0xB7 channel amplitude
+                                        (per mille)
+    After a wavelength or amplitude change the channel gives no light for settle_time seconds, like the AOTF crystal settling.
+    Ports opened in live mode support register monitoring (deviceCreate, registerCreate, setCallbackPtrRegisterInfo): the register
+    callback reports a new value once the change has settled.
+    Point-to-point ports (pointToPointPortAdd/Get/Del) reach the devices of a PointToPointStandIn over a real local UDP or TCP
+    socket: every register transaction is a round trip to the stand-in instead of the serial register_latency, and fails with
+    RegResultComError if the stand-in doesn't answer within the port's timeout.
+
+PointToPointStandIn:
+
+    Local UDP or TCP server standing in for an Ethernet-attached NKT device, e.g. a SELECT behind an NKT Ethernet module. It answers
+    the simulator's requests after a small processing latency. Closing it and starting a new one on the same address simulates a
+    dropped and restored network link.
+
+SimulatedSpectrometer:
+
+    Same interface as seabreeze's Spectrometer. Each active AOTF channel gives a Gaussian line centred on its wavelength whose height
+    follows the supercontinuum spectrum and the (non-linear) AOTF diffraction efficiency at the set amplitude. A dark baseline and
+    shot/read noise are added, and the reading blocks for the integration time.
+
+SimulatedCamera:
+
+    Same interface as camera_session.CameraSession. Renders a synthetic scene made of a few materials with different reflectance
+    spectra, lit by the active AOTF channels. grab() blocks for the exposure time plus a readout time.
+"""
+
+import ctypes
+import ipaddress
+import socket
+import threading
+from time import perf_counter, sleep
+
+import numpy as np
+
+import NKTP_DLL
+
+EMISSION_PORT, COMPACT_ID = 'COM4', 1
+SELECT_ID = 25
+REG_EMISSION = 0x30
+REG_RF_POWER = 0x30
+REG_WAVELENGTH = 0x90
+REG_AMPLITUDE = 0xB0
+N_CHANNELS = 8
+
+# Register result codes, see NKTP_DLL.RegisterResultTypes
+RegResultSuccess = 0
+RegResultComError = 7
+RegResultDeviceNotFound = 12
+
+
+# Size in bytes of the RegisterDataTypes used by the monitored registers
+REGISTER_DATA_SIZES = {2: 1, 3: 1, 4: 2, 5: 2, 6: 4, 7: 4}
+
+
+# Relative supercontinuum output, peaking in the red and falling off towards the blue
+def source_spectrum(wavelength_nm):
+    wavelength_nm = np.asarray(wavelength_nm, dtype=float)
+    return 0.25 + 0.75 * np.exp(-((wavelength_nm - 650) / 180) ** 2)
+
+# Fraction of the light diffracted by the AOTF at a given RF amplitude (per mille). Saturates towards full amplitude
+def aotf_efficiency(amplitude):
+    return np.sin(0.5 * np.pi * np.clip(amplitude, 0, 1000) / 1000) ** 2
+
+
+class SimulatedNKTP:
+    registerStatusCallbackFuncPtr = NKTP_DLL.registerStatusCallbackFuncPtr
+
+    def __init__(self, register_latency=0.002, settle_time=0.02, serial='SIM-SELECT-0001', bus_scan_time=2.0):
+        self.register_latency = register_latency
+        self.settle_time = settle_time
+        self.serial = serial
+        self.bus_scan_time = bus_scan_time
+        self.bus_scans = 0
+        self.registers = {}
+        self.devices = {EMISSION_PORT: {COMPACT_ID: 0x74}, 'COM5': {SELECT_ID: 0x67}}
+        self.open_ports = set()
+        self.live_ports = set()
+        self.monitored = {}
+        self._register_callback = None
+        self._changed = {}
+        self._lock = threading.Lock()
+        self._port_locks = {}
+        self.p2p_ports = {}
+        self.links = {}
+
+        self.RegisterResultTypes = NKTP_DLL.RegisterResultTypes
+        self.PortResultTypes = NKTP_DLL.PortResultTypes
+        self.DeviceResultTypes = NKTP_DLL.DeviceResultTypes
+        self.P2PPortResultTypes = NKTP_DLL.P2PPortResultTypes
+
+    # Takes the port for one transaction. Returns its lock, or None if a point-to-point port's stand-in didn't answer
+    def _transaction(self, portname):
+        with self._lock:
+            lock = self._port_locks.setdefault(portname, threading.Lock())
+        lock.acquire()
+        if portname in self.p2p_ports:
+            link = self.links.get(portname)
+            try:
+                if link is None:
+                    raise OSError('port not open')
+                link.request(b'r')
+            except OSError:
+                lock.release()
+                return None
+        elif self.register_latency:
+            sleep(self.register_latency)
+        return lock
+
+    def _write(self, portname, devId, regId, value, index):
+        lock = self._transaction(portname)
+        if lock is None:
+            return RegResultComError
+        try:
+            if devId not in self.devices.get(portname, {}):
+                return RegResultDeviceNotFound
+            key = (portname, devId, regId)
+            if self.registers.get(key) != value:
+                self.registers[key] = value
+                self._changed[key] = perf_counter()
+                if key in self.monitored and portname in self.live_ports:
+                    self._notify_later(key, value, self.settle_time)
+            return RegResultSuccess
+        finally:
+            lock.release()
+
+    def _read(self, portname, devId, regId, index):
+        lock = self._transaction(portname)
+        if lock is None:
+            return RegResultComError, 0
+        try:
+            if devId not in self.devices.get(portname, {}):
+                return RegResultDeviceNotFound, 0
+            return RegResultSuccess, self.registers.get((portname, devId, regId), 0)
+        finally:
+            lock.release()
+
+    def registerWriteU8(self, portname, devId, regId, value, index):
+        return self._write(portname, devId, regId, int(value), index)
+
+    registerWriteS8 = registerWriteU16 = registerWriteS16 = registerWriteU32 = registerWriteS32 = registerWriteU8
+    registerWriteU64 = registerWriteS64 = registerWriteU8
+
+    def registerWriteF32(self, portname, devId, regId, value, index):
+        return self._write(portname, devId, regId, float(value), index)
+
+    registerWriteF64 = registerWriteF32
+
+    def registerReadU8(self, portname, devId, regId, index):
+        return self._read(portname, devId, regId, index)
+
+    registerReadS8 = registerReadU16 = registerReadS16 = registerReadU32 = registerReadS32 = registerReadU8
+    registerReadU64 = registerReadS64 = registerReadF32 = registerReadF64 = registerReadU8
+
+    def registerWriteReadU8(self, portname, devId, regId, writeValue, index):
+        result = self.registerWriteU8(portname, devId, regId, writeValue, index)
+        if result != RegResultSuccess:
+            return result, 0
+        return self._read(portname, devId, regId, index)
+
+    registerWriteReadS8 = registerWriteReadU16 = registerWriteReadS16 = registerWriteReadU32 = registerWriteReadU8
+    registerWriteReadS32 = registerWriteReadU64 = registerWriteReadS64 = registerWriteReadU8
+
+    def registerWriteReadF32(self, portname, devId, regId, writeValue, index):
+        result = self.registerWriteF32(portname, devId, regId, writeValue, index)
+        if result != RegResultSuccess:
+            return result, 0.0
+        return self._read(portname, devId, regId, index)
+
+    registerWriteReadF64 = registerWriteReadF32
+
+    def openPorts(self, portnames, autoMode, liveMode):
+        ports = [p for p in portnames.split(',') if p] or list(self.devices)
+        for port in ports:
+            if port in self.p2p_ports and not self._connect(port):
+                return 1
+        # autoMode 1 scans the bus for devices, which is what makes it slow on the real ports
+        if autoMode == 1:
+            self.bus_scans += 1
+            sleep(self.bus_scan_time)
+        self.open_ports.update(ports)
+        if liveMode:
+            self.live_ports.update(ports)
+        return 0
+
+    def closePorts(self, portnames):
+        ports = [p for p in portnames.split(',') if p] or list(self.open_ports)
+        for port in ports:
+            link = self.links.pop(port, None)
+            if link is not None:
+                link.close()
+        self.open_ports.difference_update(ports)
+        self.live_ports.difference_update(ports)
+        # Like the kernel, closing a port forgets the registers monitored on it
+        self.monitored = {key: dataType for key, dataType in self.monitored.items() if key[0] not in ports}
+        return 0
+
+    def pointToPointPortAdd(self, portname, portdata):
+        if not portname:
+            return 1
+        for address, result in ((portdata.hostAddress, 2), (portdata.clientAddress, 3)):
+            try:
+                ipaddress.ip_address(address)
+            except ValueError:
+                return result
+        self.p2p_ports[portname] = portdata
+        return 0
+
+    def pointToPointPortGet(self, portname):
+        portdata = self.p2p_ports.get(portname)
+        if portdata is None:
+            return 4, NKTP_DLL.pointToPointPortData('', 0, '', 0, 0, 0)
+        return 0, portdata
+
+    def pointToPointPortDel(self, portname):
+        if portname not in self.p2p_ports:
+            return 4
+        self.closePorts(portname)
+        del self.p2p_ports[portname]
+        self.devices.pop(portname, None)
+        return 0
+
+    # Connects a point-to-point port to its stand-in and asks it which devices it has
+    def _connect(self, portname):
+        link = self.links.pop(portname, None)
+        if link is not None:
+            link.close()
+        try:
+            link = _PointToPointLink(self.p2p_ports[portname])
+            table = link.request(b'?')
+        except OSError:
+            return False
+        self.links[portname] = link
+        self.devices[portname] = dict(zip(table[::2], table[1::2]))
+        return True
+
+    def deviceCreate(self, portname, devId, waitReady):
+        return 0 if devId in self.devices.get(portname, {}) else 3
+
+    def registerCreate(self, portname, devId, regId, priority, dataType):
+        if devId not in self.devices.get(portname, {}):
+            return RegResultDeviceNotFound
+        key = (portname, devId, regId)
+        self.monitored[key] = dataType
+        if portname in self.live_ports:
+            self._notify_later(key, self.registers.get(key, 0), self.register_latency)
+        return RegResultSuccess
+
+    def setCallbackPtrRegisterInfo(self, RegisterStatusCallback):
+        self._register_callback = RegisterStatusCallback
+
+    def _notify_later(self, key, value, delay):
+        timer = threading.Timer(delay, self._notify, (key, value))
+        timer.daemon = True
+        timer.start()
+
+    # Calls the register callback the way the NKTP kernel does, with the register data in a C buffer
+    def _notify(self, key, value):
+        callback = self._register_callback
+        dataType = self.monitored.get(key)
+        # The port may have been closed, and the register forgotten, since the change
+        if callback is None or dataType is None or self.registers.get(key, 0) != value:
+            return
+        portname, devId, regId = key
+        size = REGISTER_DATA_SIZES.get(dataType, 4)
+        data = ctypes.create_string_buffer(int(value).to_bytes(size, 'little'), size)
+        callback(portname.encode('ascii'), devId, regId, 0, dataType, size, ctypes.addressof(data))
+
+    def getAllPorts(self):
+        return ','.join(list(self.devices) + [port for port in self.p2p_ports if port not in self.devices])
+
+    def getOpenPorts(self):
+        return ','.join(sorted(self.open_ports))
+
+    def deviceExists(self, portname, devId):
+        return 0, int(devId in self.devices.get(portname, {}))
+
+    def deviceGetType(self, portname, devId):
+        if devId not in self.devices.get(portname, {}):
+            return 3, 0
+        return 0, self.devices[portname][devId]
+
+    def deviceGetAllTypes(self, portname):
+        types = bytearray(256)
+        for devId, devType in self.devices.get(portname, {}).items():
+            types[devId] = devType
+        return 0, bytes(types)
+
+    def deviceGetModuleSerialNumberStr(self, portname, devId):
+        if devId not in self.devices.get(portname, {}):
+            return 3, b''
+        return 0, f'{self.serial}-{devId}'.encode('ascii')
+
+    # List of (wavelength in nm, relative power) for every channel currently giving light
+    def active_lines(self):
+        reg = self.registers
+        if not reg.get((EMISSION_PORT, COMPACT_ID, REG_EMISSION)):
+            return []
+        now = perf_counter()
+        lines = []
+        for port, devices in self.devices.items():
+            if SELECT_ID not in devices or not reg.get((port, SELECT_ID, REG_RF_POWER)):
+                continue
+            for channel in range(N_CHANNELS):
+                wavelength_key = (port, SELECT_ID, REG_WAVELENGTH + channel)
+                amplitude_key = (port, SELECT_ID, REG_AMPLITUDE + channel)
+                wavelength, amplitude = reg.get(wavelength_key, 0), reg.get(amplitude_key, 0)
+                if not wavelength or not amplitude:
+                    continue
+                changed = max(self._changed.get(wavelength_key, 0), self._changed.get(amplitude_key, 0))
+                if now - changed < self.settle_time:
+                    continue
+                wavelength_nm = wavelength / 1000
+                lines.append((wavelength_nm, float(source_spectrum(wavelength_nm) * aotf_efficiency(amplitude))))
+        return lines
+
+
+# Client side of a point-to-point port: a socket to the stand-in, one request and answer per transaction
+class _PointToPointLink:
+    def __init__(self, portdata):
+        kind = socket.SOCK_STREAM if portdata.protocol == 0 else socket.SOCK_DGRAM
+        self.socket = socket.socket(socket.AF_INET, kind)
+        try:
+            self.socket.settimeout(max(portdata.msTimeout, 1) / 1000)
+            self.socket.bind((portdata.hostAddress, portdata.hostPort))
+            self.socket.connect((portdata.clientAddress, portdata.clientPort))
+        except OSError:
+            self.socket.close()
+            raise
+
+    def request(self, data):
+        self.socket.sendall(data)
+        answer = self.socket.recv(512)
+        if not answer:
+            raise ConnectionResetError('point-to-point stand-in closed the connection')
+        return answer
+
+    def close(self):
+        self.socket.close()
+
+
+class PointToPointStandIn:
+    def __init__(self, protocol='udp', address='127.0.0.1', port=0, devices=None, latency=0.0002):
+        self.protocol = protocol
+        self.devices = {SELECT_ID: 0x67} if devices is None else dict(devices)
+        self.latency = latency
+        self.requests = 0
+        self._closed = False
+        self._connections = []
+        kind = socket.SOCK_STREAM if protocol == 'tcp' else socket.SOCK_DGRAM
+        self._socket = socket.socket(socket.AF_INET, kind)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((address, port))
+        self._socket.settimeout(0.1)
+        self.address, self.port = self._socket.getsockname()
+        if protocol == 'tcp':
+            self._socket.listen()
+        serve = self._serve_tcp if protocol == 'tcp' else self._serve_udp
+        threading.Thread(target=serve, name=f'p2p-stand-in-{self.port}', daemon=True).start()
+
+    # The device table (devId, type pairs) for b'?', an acknowledgement for anything else
+    def _answer(self, request):
+        self.requests += 1
+        if self.latency:
+            sleep(self.latency)
+        if request[:1] == b'?':
+            return bytes(b for devId, devType in sorted(self.devices.items()) for b in (devId, devType))
+        return b'!'
+
+    def _serve_udp(self):
+        while not self._closed:
+            try:
+                request, peer = self._socket.recvfrom(512)
+                self._socket.sendto(self._answer(request), peer)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+    def _serve_tcp(self):
+        while not self._closed:
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            connection.settimeout(None)
+            self._connections.append(connection)
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _serve_connection(self, connection):
+        with connection:
+            while True:
+                try:
+                    request = connection.recv(512)
+                    if not request:
+                        return
+                    connection.sendall(self._answer(request))
+                except OSError:
+                    return
+
+    def close(self):
+        self._closed = True
+        self._socket.close()
+        for connection in self._connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SimulatedSpectrometer:
+    def __init__(self, nktp, serial_number='SIM-HR2B1032', pixels=2048, wavelength_range=(340.0, 1030.0), line_width=2.0,
+                 full_scale=16383, dark_level=1000.0, peak_counts=3000.0, read_noise=4.0, seed=None):
+        self.nktp = nktp
+        self.serial_number = serial_number
+        self.model = 'SIMULATED'
+        # Each reading is integrated from the time it's asked for (see spectrometer_stream.py)
+        self.free_running = False
+        self.pixels = pixels
+        self.line_width = line_width
+        self.full_scale = full_scale
+        self.dark_level = dark_level
+        self.peak_counts = peak_counts
+        self.read_noise = read_noise
+        self.reference = None
+        self._wavelengths = np.linspace(wavelength_range[0], wavelength_range[1], pixels)
+        self._integration_time = 10000
+        self._rng = np.random.default_rng(seed)
+
+    def __repr__(self):
+        return f'<SimulatedSpectrometer {self.model}:{self.serial_number}>'
+
+    def integration_time_micros(self, integration_time_micros):
+        self._integration_time = int(integration_time_micros)
+
+    def wavelengths(self):
+        return self._wavelengths.copy()
+
+    # Put a 'dark' or 'white' reference target in front of the spectrometer, or None for the sample
+    def place(self, reference):
+        self.reference = reference
+
+    def intensities(self, correct_dark_counts=False, correct_nonlinearity=False):
+        sleep(self._integration_time / 1e6)
+        scale = self.peak_counts * self._integration_time / 10000
+        signal = np.zeros(self.pixels)
+        if self.reference == 'white':
+            signal += 0.5 * scale * source_spectrum(self._wavelengths)
+        elif self.reference is None:
+            sigma = self.line_width / 2.355
+            for wavelength_nm, power in self.nktp.active_lines():
+                signal += scale * power * np.exp(-0.5 * ((self._wavelengths - wavelength_nm) / sigma) ** 2)
+        counts = self.dark_level + signal
+        counts += self._rng.normal(0, 1, self.pixels) * np.sqrt(self.read_noise ** 2 + signal)
+        return np.clip(counts, 0, self.full_scale)
+
+    def close(self):
+        pass
+
+
+class SimulatedCamera:
+    def __init__(self, nktp, exposure_time=None, shape=(480, 640), pixel_rate=200e6, gain=500.0, n_materials=4, seed=0,
+                 serial_number='SIM-CAMERA-0001', timeout_ms=2000):
+        self.nktp = nktp
+        self.serial_number = serial_number
+        self.timeout_ms = timeout_ms
+        self.height, self.width = shape
+        self.pixel_rate = pixel_rate
+        self.gain = gain
+        self.exposure_time = None
+        self.frames_grabbed = 0
+        self.frames_triggered = 0
+        self.trigger_error = None
+        self._exposure_end = 0.0
+        self._triggered = threading.Condition()
+
+        # Scene: each pixel is a mixture of a few materials, each with a Gaussian reflectance band somewhere in the visible
+        rng = np.random.default_rng(seed)
+        rows, cols = np.mgrid[0:self.height, 0:self.width]
+        self._abundances = np.empty((n_materials, self.height, self.width), dtype=np.float32)
+        for k in range(n_materials):
+            cy, cx = rng.uniform(0, self.height), rng.uniform(0, self.width)
+            radius = rng.uniform(0.2, 0.5) * min(self.height, self.width)
+            self._abundances[k] = np.exp(-((rows - cy) ** 2 + (cols - cx) ** 2) / (2 * radius ** 2))
+        self._abundances /= self._abundances.sum(axis=0, keepdims=True)
+        self._centres = rng.uniform(450, 700, n_materials)
+        self._widths = rng.uniform(30, 90, n_materials)
+
+        if exposure_time is not None:
+            self.set_exposure(exposure_time)
+        print(f'Camera: OPEN ({self.width}x{self.height}, simulated)')
+
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    def set_exposure(self, exposure_time):
+        self.exposure_time = exposure_time
+
+    def reflectance(self, wavelength_nm):
+        return 0.1 + 0.9 * np.exp(-0.5 * ((wavelength_nm - self._centres) / self._widths) ** 2)
+
+    def trigger(self):
+        try:
+            lines = self.nktp.active_lines()
+        except Exception as error:
+            with self._triggered:
+                self.trigger_error = error
+                self._triggered.notify_all()
+            raise
+        with self._triggered:
+            self.trigger_error = None
+            self.frames_triggered += 1
+            self._exposure_end = perf_counter() + (self.exposure_time or 0) / 1e6
+            self._triggered.notify_all()
+        self._lines = lines
+
+    def retrieve(self, out=None):
+        sleep(max(0.0, self._exposure_end - perf_counter()) + self.height * self.width / self.pixel_rate)
+
+        weights = np.zeros(len(self._centres), dtype=np.float32)
+        for wavelength_nm, power in self._lines:
+            weights += power * self.reflectance(wavelength_nm)
+        weights *= self.gain * (self.exposure_time or 0) / 1e4
+        img = np.tensordot(weights, self._abundances, axes=1)
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        np.clip(img, 0, 255, out=img)
+        np.copyto(out, img, casting='unsafe')
+        self.frames_grabbed += 1
+        return out
+
+    def grab(self, out=None):
+        self.trigger()
+        return self.retrieve(out)
+
+    def wait_exposure_end(self, n, timeout=None):
+        timeout = self.timeout_ms / 1000 if timeout is None else timeout
+        with self._triggered:
+            self._triggered.wait_for(lambda: self.frames_triggered >= n or self.trigger_error is not None, timeout)
+            if self.frames_triggered < n:
+                if self.trigger_error is not None:
+                    raise RuntimeError(f'Camera: trigger failed ({self.trigger_error})') from self.trigger_error
+                raise TimeoutError(f'Camera: frame {n} not triggered within {timeout} s')
+            remaining = self._exposure_end - perf_counter()
+        if remaining > 0:
+            sleep(remaining)
+
+    def close(self):
+        print('Camera: Closed')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Dark and white spectrometer references, averaged over several frames and cached between sessions.
+
+    The light-dark calibration used to take a single spectrometer reading of each reference, so the read noise of that one frame
+    ended up in every corrected reading, and both references had to be placed by hand at the start of every run. ReferenceLibrary:
+        - averages n_frames readings of a reference, with a streaming per-pixel mean and variance (RunningStats), so no frames are
+          kept
+        - keeps every reference in a directory (reference_cache/ by default), keyed by the kind ('dark' or 'white'), the
+          spectrometer serial number and the integration time
+        - reuses a cached reference without placing it again while it is fresh: younger than max_age (1 h for the dark reference,
+          which drifts with the detector temperature, 8 h for the white reference by default)
+        - when there is no fresh dark reference for the integration time, interpolates one between the fresh dark references at the
+          nearest shorter and longer integration times (the dark counts grow linearly with the integration time)
+    Only the references that aren't cached are placed and captured.
+
+Files:
+
+    reference_cache/index.json          the kind, serial number, integration time, frame count and save time of every reference
+    reference_cache/<id>.npz            the per-pixel mean and variance of the reference
+
+Usage:
+
+    library = ReferenceLibrary('reference_cache')
+    dark, white = library.references(spec, spec_integration_time, n_frames=10, place=backend.place_reference,
+                                     remove=backend.remove_reference)
+    calibration_factors = white_calibration(dark.mean, white.mean)
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+# How long (s) a cached reference can be reused without placing it again
+MAX_AGE = {'dark': 3600, 'white': 8 * 3600}
+
+# source is 'captured', 'cached' or 'interpolated'
+Reference = namedtuple('Reference', 'kind, serial_number, integration_time, mean, variance, n_frames, saved, source')
+
+
+# Per-pixel mean and variance of a stream of frames (Welford's algorithm)
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+
+    def add(self, frame):
+        frame = np.asarray(frame, dtype=float)
+        if self.mean is None:
+            self.mean = np.zeros_like(frame)
+            self._m2 = np.zeros_like(frame)
+        self.count += 1
+        delta = frame - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (frame - self.mean)
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self._m2 / (self.count - 1)
+
+
+# White calibration factors, as in the original light-dark calibration
+def white_calibration(dark_reference, white_reference):
+    return (white_reference - dark_reference) / (max(white_reference) - min(dark_reference))
+
+
+class ReferenceLibrary:
+    def __init__(self, directory='reference_cache', max_age=None):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+        self.max_age = dict(MAX_AGE, **(max_age or {}))
+
+    @staticmethod
+    def key_id(kind, serial_number, integration_time):
+        key = f'{kind}/{serial_number}/{int(integration_time)}'
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _age(self, entry):
+        return (datetime.now() - datetime.fromisoformat(entry['saved'])).total_seconds()
+
+    def _load_entry(self, entry, source='cached'):
+        path = os.path.join(self.directory, entry['file'])
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            mean, variance = data['mean'], data['variance']
+        return Reference(entry['kind'], entry['serial_number'], entry['integration_time_us'], mean, variance, entry['n_frames'],
+                         entry['saved'], source)
+
+    # Fresh cached entries of one kind for a spectrometer, {integration time: entry}
+    def _fresh(self, kind, serial_number):
+        return {entry['integration_time_us']: entry for entry in self._read_index().values()
+                if entry['kind'] == kind and entry['serial_number'] == str(serial_number)
+                and self._age(entry) <= self.max_age[kind]}
+
+    # The cached reference for kind, serial number and integration time if it's still fresh, otherwise None
+    def load(self, kind, serial_number, integration_time):
+        entry = self._fresh(kind, serial_number).get(int(integration_time))
+        return None if entry is None else self._load_entry(entry)
+
+    # A dark reference for integration_time, interpolated between the fresh dark references at the nearest shorter and longer
+    # integration times, or None if there aren't any on both sides
+    def interpolate_dark(self, serial_number, integration_time):
+        integration_time = int(integration_time)
+        fresh = self._fresh('dark', serial_number)
+        shorter = [t for t in fresh if t < integration_time]
+        longer = [t for t in fresh if t > integration_time]
+        if not shorter or not longer:
+            return None
+        low, high = self._load_entry(fresh[max(shorter)]), self._load_entry(fresh[min(longer)])
+        if low is None or high is None or low.mean.shape != high.mean.shape:
+            return None
+        fraction = (integration_time - low.integration_time) / (high.integration_time - low.integration_time)
+        mean = low.mean + fraction * (high.mean - low.mean)
+        # The dark noise grows with the integration time like the dark counts, so the variance is interpolated linearly too
+        variance = low.variance + fraction * (high.variance - low.variance)
+        return Reference('dark', str(serial_number), integration_time, mean, variance, min(low.n_frames, high.n_frames),
+                         min(low.saved, high.saved), 'interpolated')
+
+    def save(self, reference):
+        os.makedirs(self.directory, exist_ok=True)
+        key_id = self.key_id(reference.kind, reference.serial_number, reference.integration_time)
+        filename = f'{key_id}.npz'
+        np.savez(os.path.join(self.directory, filename), mean=reference.mean, variance=reference.variance)
+        index = self._read_index()
+        index[key_id] = {'kind': reference.kind, 'serial_number': str(reference.serial_number),
+                         'integration_time_us': int(reference.integration_time), 'n_frames': reference.n_frames,
+                         'file': filename, 'saved': reference.saved}
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, indent=1)
+
+    # Averages n_frames readings of the reference in front of the spectrometer, and caches the result
+    def capture(self, spec, kind, integration_time, n_frames=10):
+        spec.integration_time_micros(integration_time)
+        stats = RunningStats()
+        for _ in range(n_frames):
+            stats.add(spec.intensities())
+        reference = Reference(kind, str(spec.serial_number), int(integration_time), stats.mean, stats.variance, stats.count,
+                              datetime.now().isoformat(timespec='seconds'), 'captured')
+        self.save(reference)
+        return reference
+
+    # The reference of one kind: cached, interpolated (dark only) or, failing that, placed with place(kind) and captured
+    def reference(self, spec, kind, integration_time, n_frames=10, place=None):
+        reference = self.load(kind, spec.serial_number, integration_time)
+        if reference is None and kind == 'dark':
+            reference = self.interpolate_dark(spec.serial_number, integration_time)
+        if reference is not None:
+            print(f'Using {reference.source} {kind} reference ({reference.n_frames} frames, {reference.saved})')
+            return reference
+        print(f'Place {kind} reference and press Enter')
+        if place is not None:
+            place(kind)
+        return self.capture(spec, kind, integration_time, n_frames)
+
+    # The dark and white references for the integration time. remove() is called once the references placed have been captured
+    def references(self, spec, integration_time, n_frames=10, place=None, remove=None):
+        dark = self.reference(spec, 'dark', integration_time, n_frames, place)
+        white = self.reference(spec, 'white', integration_time, n_frames, place)
+        if remove is not None and 'captured' in (dark.source, white.source):
+            remove()
+        return dark, white
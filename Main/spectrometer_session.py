@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Spectrometer session with a cached wavelength axis.
+
+    Every calibration probe used to set the integration time, fetch the wavelength axis and search the whole axis
+    (np.argmin(np.abs(wavelengths - wavelength))) for the pixel nearest to the band, on top of the reading itself. The integration
+    time and the wavelength axis are USB transactions, and neither changes between probes. SpectrometerSession wraps a seabreeze
+    Spectrometer (or the simulated one) and:
+        - reads the wavelength axis once, when the session is opened
+        - maps wavelengths (nm) to their nearest pixel with a binary search of the sorted axis (pixels(), pixel())
+        - precomputes the pixel window of every band of the sweep grid with set_bands(), so the lookup of a band is a dict access
+        - only writes the integration time to the spectrometer when it actually changes
+        - reads the count of a band from all the pixels of its window rather than from the nearest pixel alone (band_counts())
+    It has the same methods as the Spectrometer (integration_time_micros, wavelengths, intensities, close), so it can be passed
+    wherever the spectrometer was. Anything else is passed through to the spectrometer.
+
+    The windows are (start, stop) pixel ranges, in the order of the sorted wavelength axis. With half_width_nm=0 each window is just
+    the pixel nearest to the band.
+
+Band readout:
+
+    A single pixel is noisy and depends on where the AOTF line falls between two pixels, so the calibration needs more probes to
+    land within tolerance. band_counts() weighs the pixels of each band's window instead:
+        - with a half width only, the count is the mean of the window
+        - with a line_width_nm (FWHM), the count is the height of a Gaussian line of that width, centred on the band, least-squares
+          fitted to the window. It is on the same scale as the nearest pixel reading (the peak of the line), with less noise
+    The pixel indices and weights of all bands are kept as (bands, pixels) arrays, padded with zero weights, so the counts of every
+    band of the grid are one gather and one weighted sum over the intensities() array. The dark and white references are applied
+    to the gathered pixels only.
+
+Usage:
+
+    spec = SpectrometerSession(backend.open_spectrometer('HR2B1032'), integration_time=10000)
+    spec.set_bands(Wavelengths / 1000)
+    index = spec.pixel(Wavelengths[i] / 1000)       # dict lookup for the bands of the grid, binary search otherwise
+    count = spec.intensities()[index]
+
+    spec.set_bands(Wavelengths / 1000, line_width_nm=2.0)
+    counts = spec.band_counts(spec.intensities(), dark=dark_reference, scale=calibration_factors)    # every band at once
+    count = spec.band_count(spec.intensities(), Wavelengths[i] / 1000, dark_reference, calibration_factors)
+"""
+
+import numpy as np
+
+
+class SpectrometerSession:
+    def __init__(self, spec, integration_time=None):
+        self.spec = spec
+        self.serial_number = spec.serial_number
+        self.integration_time = None
+
+        self._wavelengths = np.array(spec.wavelengths(), dtype=float)
+        self._wavelengths.setflags(write=False)
+        ascending = bool(np.all(np.diff(self._wavelengths) > 0))
+        self.order = None if ascending else np.argsort(self._wavelengths, kind='stable')
+        self._sorted = self._wavelengths if ascending else self._wavelengths[self.order]
+
+        self.band_wavelengths = None
+        self.band_pixels = None
+        self.windows = None
+        self.line_width_nm = None
+        self.band_indices = None
+        self.band_weights = None
+        self._bands = {}
+
+        if integration_time is not None:
+            self.integration_time_micros(integration_time)
+
+    def __repr__(self):
+        return f'<SpectrometerSession {self.spec!r}>'
+
+    def __getattr__(self, name):
+        return getattr(self.spec, name)
+
+    def integration_time_micros(self, integration_time_micros):
+        integration_time_micros = int(integration_time_micros)
+        if integration_time_micros != self.integration_time:
+            self.spec.integration_time_micros(integration_time_micros)
+            self.integration_time = integration_time_micros
+
+    # The cached wavelength axis (nm). It is read-only, copy it before changing it
+    def wavelengths(self):
+        return self._wavelengths
+
+    def intensities(self, *args, **kwargs):
+        return self.spec.intensities(*args, **kwargs)
+
+    def close(self):
+        self.spec.close()
+
+    # Positions in the sorted wavelength axis of the pixels nearest to the given wavelengths (nm). Ties go to the shorter wavelength
+    def _nearest(self, wavelengths_nm):
+        axis = self._sorted
+        wavelengths_nm = np.asarray(wavelengths_nm, dtype=float)
+        right = np.clip(np.searchsorted(axis, wavelengths_nm), 1, len(axis) - 1)
+        left = right - 1
+        return np.where(wavelengths_nm - axis[left] <= axis[right] - wavelengths_nm, left, right)
+
+    # Pixels nearest to the given wavelengths (nm)
+    def pixels(self, wavelengths_nm):
+        nearest = self._nearest(wavelengths_nm)
+        return nearest if self.order is None else self.order[nearest]
+
+    # Pixel nearest to one wavelength (nm): looked up for the bands given to set_bands(), searched for otherwise
+    def pixel(self, wavelength_nm):
+        band = self._bands.get(wavelength_nm)
+        if band is not None:
+            return self.band_pixels[band]
+        return int(self.pixels(wavelength_nm))
+
+    # Precomputes the nearest pixel, the pixel window and the pixel weights of every band of the sweep grid. Each window covers the
+    # pixels within half_width_nm of the band (one line width if only line_width_nm is given), and at least the nearest pixel
+    def set_bands(self, wavelengths_nm, half_width_nm=0.0, line_width_nm=None):
+        wavelengths_nm = np.asarray(wavelengths_nm, dtype=float)
+        if line_width_nm and not half_width_nm:
+            half_width_nm = line_width_nm
+        nearest = self._nearest(wavelengths_nm)
+        starts = np.searchsorted(self._sorted, wavelengths_nm - half_width_nm, side='left')
+        stops = np.searchsorted(self._sorted, wavelengths_nm + half_width_nm, side='right')
+        starts, stops = np.minimum(starts, nearest), np.maximum(stops, nearest + 1)
+        self.windows = (starts, stops)
+        self.line_width_nm = line_width_nm
+        self.band_wavelengths = wavelengths_nm
+        self.band_pixels = [int(p) for p in (nearest if self.order is None else self.order[nearest])]
+        self._bands = {float(w): band for band, w in enumerate(wavelengths_nm)}
+
+        # (bands, pixels) positions in the sorted axis, padded with the window's last pixel and a zero weight
+        offsets = np.arange(int((stops - starts).max()))
+        positions = starts[:, None] + offsets
+        inside = positions < stops[:, None]
+        positions = np.minimum(positions, stops[:, None] - 1)
+        if line_width_nm:
+            sigma = line_width_nm / 2.355
+            profile = np.exp(-0.5 * ((self._sorted[positions] - wavelengths_nm[:, None]) / sigma) ** 2) * inside
+            norm = (profile ** 2).sum(axis=1, keepdims=True)
+            # Bands far outside the axis have no profile left on it, and fall back to the window mean
+            weights = np.where(norm > 0, profile / np.where(norm > 0, norm, 1), inside / inside.sum(axis=1, keepdims=True))
+        else:
+            weights = inside / inside.sum(axis=1, keepdims=True)
+        self.band_indices = positions if self.order is None else self.order[positions]
+        self.band_weights = weights
+        return self.windows
+
+    # Band number of a wavelength (nm) of the grid given to set_bands(), or None
+    def band(self, wavelength_nm):
+        return self._bands.get(wavelength_nm)
+
+    # Counts of the given bands (all of them by default, or a single band number), from one intensities() array. The dark reference
+    # is subtracted from, and the result divided by scale (e.g. the white calibration factors), pixel by pixel before weighing
+    def band_counts(self, intensities, bands=None, dark=None, scale=None):
+        indices = self.band_indices if bands is None else self.band_indices[bands]
+        weights = self.band_weights if bands is None else self.band_weights[bands]
+        values = np.asarray(intensities)[indices]
+        if dark is not None:
+            values = values - np.asarray(dark)[indices]
+        if scale is not None:
+            values = values / np.asarray(scale)[indices]
+        return (values * weights).sum(axis=-1)
+
+    # Count of one wavelength (nm): from its band's window for the bands given to set_bands(), its nearest pixel otherwise
+    def band_count(self, intensities, wavelength_nm, dark=None, scale=None):
+        band = self._bands.get(wavelength_nm)
+        if band is not None:
+            return float(self.band_counts(intensities, band, dark, scale))
+        index = self.pixel(wavelength_nm)
+        value = intensities[index] - (0 if dark is None else dark[index])
+        return value if scale is None else value / scale[index]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Background spectrometer acquisition.
+
+    spec.intensities() blocks for the whole integration time and the USB transfer, and the sweep called it once per band, after the
+    AOTF had settled. SpectrometerStreamer reads the spectrometer continuously on its own thread instead, into a ring buffer of
+    timestamped spectra preallocated with NumPy, so the spectrometer keeps integrating and transferring while the sweep grabs frames
+    and writes registers. The sweep asks for spectrum(after=settled_at): the first spectrum whose exposure started after the AOTF
+    settled, so no light from the previous band ends up in it.
+
+    The exposure start of a spectrum is taken as the time it was requested. A free running spectrometer (the seabreeze ones by
+    default: spec.free_running, if it's not set) may already have been integrating when it was asked, so its exposure start is
+    taken one integration time earlier. The integration time is given to the streamer, which sets it on the spectrometer when it
+    starts. A SpectrometerSession already knows its integration time, so it can be left out for one.
+
+    While the streamer runs it owns the spectrometer: nothing else should call spec.intensities() or change the integration time.
+
+Usage:
+
+    with SpectrometerStreamer(spec, spec_integration_time) as stream:
+        ...                                                 # tune the AOTF and wait for it to settle
+        spectrum = stream.spectrum(after=settled_at)
+"""
+
+import threading
+from time import perf_counter
+
+import numpy as np
+
+from spectrometer_session import SpectrometerSession
+
+
+class SpectrometerStreamer:
+    def __init__(self, spec, integration_time=None, capacity=8, free_running=None, timeout=5.0):
+        self.spec = spec
+        self.capacity = capacity
+        self.free_running = getattr(spec, 'free_running', True) if free_running is None else free_running
+        # Integration time (us), from the spectrometer session if it isn't given
+        if integration_time is None and isinstance(spec, SpectrometerSession):
+            integration_time = spec.integration_time
+        if integration_time is None and self.free_running:
+            raise ValueError('SpectrometerStreamer: the integration time of a free running spectrometer must be given')
+        self.integration_time = integration_time
+        self.timeout = timeout
+        self.count = 0
+        self.error = None
+
+        # Ring buffer, allocated for the spectrum size on the first spectrum
+        self.spectra = None
+        self.exposure_starts = np.full(capacity, -np.inf)
+        self.received = np.full(capacity, -np.inf)
+        self.sequence = np.full(capacity, -1, dtype=np.int64)
+
+        self._new_spectrum = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            if self.integration_time is not None:
+                self.spec.integration_time_micros(self.integration_time)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._acquire, name='spectrometer-stream', daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _acquire(self):
+        while not self._stop.is_set():
+            requested = perf_counter()
+            try:
+                intensities = self.spec.intensities()
+            except Exception as error:
+                with self._new_spectrum:
+                    self.error = error
+                    self._new_spectrum.notify_all()
+                return
+            received = perf_counter()
+            exposure_start = requested - self.integration_time / 1e6 if self.free_running else requested
+
+            with self._new_spectrum:
+                if self.spectra is None:
+                    self.spectra = np.empty((self.capacity, len(intensities)))
+                slot = self.count % self.capacity
+                self.spectra[slot] = intensities
+                self.exposure_starts[slot] = exposure_start
+                self.received[slot] = received
+                self.sequence[slot] = self.count
+                self.count += 1
+                self._new_spectrum.notify_all()
+
+    # Slot of the oldest spectrum in the buffer whose exposure started at or after the given time, or None
+    def _find(self, after):
+        candidates = np.flatnonzero((self.sequence >= 0) & (self.exposure_starts >= after))
+        if not len(candidates):
+            return None
+        return candidates[np.argmin(self.sequence[candidates])]
+
+    # Copy of the first spectrum exposed after the given perf_counter() time, waiting for it if needed
+    def spectrum(self, after, timeout=None):
+        deadline = perf_counter() + (self.timeout if timeout is None else timeout)
+        with self._new_spectrum:
+            while True:
+                slot = self._find(after)
+                if slot is not None:
+                    return self.spectra[slot].copy()
+                if self.error is not None:
+                    raise RuntimeError(f'Spectrometer stream stopped: {self.error}') from self.error
+                remaining = deadline - perf_counter()
+                if remaining <= 0 or self._thread is None:
+                    raise TimeoutError(f'No spectrum exposed after {after:.3f} s within the timeout')
+                self._new_spectrum.wait(remaining)
+
+    # Copy of the latest spectrum and its exposure start, or (None, None) if there isn't one yet
+    def latest(self):
+        with self._new_spectrum:
+            if not self.count:
+                return None, None
+            slot = (self.count - 1) % self.capacity
+            return self.spectra[slot].copy(), self.exposure_starts[slot]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Pipelined wavelength sweep engine.
+
+    The original main loop ran every stage one after another: write the SELECT registers, wait for the AOTF to settle, block on the
+    spectrometer, then open the camera and grab. SweepEngine runs the camera and spectrometer captures at the same time on worker
+    threads and queues the register writes for the next wavelength as soon as the current frame has been exposed, so they overlap
+    with the frame readout and with storing the data. The time per wavelength drops from the sum of the stages to roughly the longest
+    one.
+
+Stages:
+
+    Each stage is a plain function supplied by the caller, and is given the index of the wavelength being processed:
+        - tune(i)                       write the wavelength/amplitude/RF registers for band i
+        - settle(i)                     wait for the AOTF to settle (defaults to a fixed sleep of settle_time seconds)
+        - capture_frame(i)              return the camera image for band i
+        - capture_spectrum(i)           return the spectrometer intensities for band i
+        - store(i, frame, spectrum)     save the captured data, run in order on its own worker thread
+        - frame_exposed(i)              optional, blocks until the camera has finished exposing band i. When given, the next
+                                        wavelength is tuned during the frame readout rather than after it.
+
+    All register writes go through a single worker thread so the serial port only ever sees one command at a time, in order.
+
+    settled_at is the perf_counter() time the last settle stage returned, i.e. when the AOTF settled for the band being captured. The
+    captures of band i run before band i + 1 is settled, so capture_spectrum(i) can use it to pick a spectrum from a
+    SpectrometerStreamer (spectrometer_stream.py) that was exposed after the AOTF settled.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter, sleep
+
+STAGES = ('tune', 'settle', 'frame', 'spectrum', 'store', 'band')
+
+
+class SweepEngine:
+    def __init__(self, tune, capture_frame, capture_spectrum, store, settle=None, settle_time=0.05, frame_exposed=None):
+        self.tune = tune
+        self.capture_frame = capture_frame
+        self.capture_spectrum = capture_spectrum
+        self.store = store
+        self.settle = settle if settle is not None else (lambda i: sleep(settle_time))
+        self.frame_exposed = frame_exposed
+        self.timings = {stage: [] for stage in STAGES}
+        self.settled_at = None
+
+    def _timed(self, stage, func, *args):
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[stage].append(perf_counter() - start)
+
+    def run(self, n_bands):
+        self.timings = {stage: [] for stage in STAGES}
+        if n_bands <= 0:
+            return self.timings
+
+        register_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sweep-registers')
+        capture_workers = ThreadPoolExecutor(max_workers=3, thread_name_prefix='sweep-capture')
+        store_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sweep-store')
+        stored = []
+
+        try:
+            tuned = register_worker.submit(self._timed, 'tune', self.tune, 0)
+
+            for i in range(n_bands):
+                band_start = perf_counter()
+
+                tuned.result()
+                self._timed('settle', self.settle, i)
+                self.settled_at = perf_counter()
+
+                frame = capture_workers.submit(self._timed, 'frame', self.capture_frame, i)
+                spectrum = capture_workers.submit(self._timed, 'spectrum', self.capture_spectrum, i)
+
+                # The AOTF can be retuned as soon as both sensors have stopped integrating
+                if self.frame_exposed is not None:
+                    exposed = capture_workers.submit(self.frame_exposed, i)
+                    wait([exposed, spectrum])
+                    exposed.result()
+                else:
+                    wait([frame, spectrum])
+                spectrum_data = spectrum.result()
+
+                if i + 1 < n_bands:
+                    tuned = register_worker.submit(self._timed, 'tune', self.tune, i + 1)
+
+                stored.append(store_worker.submit(self._timed, 'store', self.store, i, frame.result(), spectrum_data))
+                self.timings['band'].append(perf_counter() - band_start)
+
+            for future in stored:
+                future.result()
+        finally:
+            register_worker.shutdown(wait=True)
+            capture_workers.shutdown(wait=True)
+            store_worker.shutdown(wait=True)
+
+        return self.timings
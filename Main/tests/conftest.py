@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the acquisition modules against the simulator backend (simulator.py), so they run without any devices attached.
+
+Usage:
+
+    python -m pytest Main/tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import SimulatedBackend
+from register_cache import RegisterCache
+
+
+@pytest.fixture
+def backend():
+    return SimulatedBackend(register_latency=0.0005, settle_time=0.005, frame_shape=(24, 32), spectrometer_pixels=512, seed=0,
+                            bus_scan_time=0.0, enumeration_time=0.0)
+
+
+@pytest.fixture
+def nktp(backend):
+    return RegisterCache(backend.nktp)
+
+
+@pytest.fixture
+def spectrometer(backend):
+    spec = backend.open_spectrometer('HR2B1032')
+    spec.integration_time_micros(1000)
+    return spec
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from time import perf_counter
+
+import pytest
+
+from aotf_settle import MIN_SETTLE, REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH, SettleWaiter, channel_registers
+from backends import SimulatedBackend
+from port_manager import PortManager
+from register_cache import RegisterCache
+
+
+@pytest.fixture
+def ports(nktp):
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        yield ports
+
+
+@pytest.fixture
+def waiter(nktp, ports):
+    waiter = SettleWaiter(nktp, 'COM5', 25, timeout=0.05, port_worker=ports['COM5'])
+    yield waiter
+    waiter.close()
+
+
+def test_channel_registers():
+    registers = channel_registers(2)
+    assert set(registers) == {REG_RF_POWER, REG_WAVELENGTH, REG_WAVELENGTH + 1, REG_AMPLITUDE, REG_AMPLITUDE + 1}
+
+
+def test_wait_returns_once_the_values_are_confirmed(nktp, ports, waiter):
+    assert waiter.available
+    writes = [('U32', REG_WAVELENGTH, 550000), ('U16', REG_AMPLITUDE, 400), ('U8', REG_RF_POWER, 1)]
+    waiter.written(writes)
+    assert ports.transaction('COM5', 25, writes).ok
+    start = perf_counter()
+    assert waiter.wait({REG_WAVELENGTH: 550000, REG_AMPLITUDE: 400, REG_RF_POWER: 1}, timeout=1.0)
+    assert MIN_SETTLE <= perf_counter() - start < 0.5
+    assert waiter.timeouts == 0
+
+
+def switch_rf(ports, waiter, value):
+    writes = [('U8', REG_RF_POWER, value)]
+    waiter.written(writes)
+    assert ports.transaction('COM5', 25, writes).ok
+    return waiter.wait({REG_RF_POWER: value}, timeout=1.0)
+
+
+def test_value_reported_before_the_write_does_not_confirm_it(ports, waiter):
+    assert switch_rf(ports, waiter, 1)
+    waiter.written([('U8', REG_RF_POWER, 0)])
+    waiter.written([('U8', REG_RF_POWER, 1)])
+    assert not waiter.wait({REG_RF_POWER: 1}, timeout=0.05)
+
+
+def test_rf_off_and_on_waits_for_the_event_after_the_writes():
+    backend = SimulatedBackend(register_latency=0.0005, settle_time=0.05, frame_shape=(24, 32), seed=0, bus_scan_time=0.0,
+                               enumeration_time=0.0)
+    nktp = RegisterCache(backend.nktp)
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        waiter = SettleWaiter(nktp, 'COM5', 25, timeout=1.0, port_worker=ports['COM5'])
+        assert switch_rf(ports, waiter, 1)
+        # RF OFF after a failed probe and ON again, before the RF driver has reported the OFF
+        switch_rf_off = [('U8', REG_RF_POWER, 0)]
+        waiter.written(switch_rf_off)
+        assert ports.transaction('COM5', 25, switch_rf_off).ok
+        start = perf_counter()
+        waiter.written([('U8', REG_RF_POWER, 1)])
+        assert ports.transaction('COM5', 25, [('U8', REG_RF_POWER, 1)]).ok
+        assert waiter.wait({REG_RF_POWER: 1})
+        assert perf_counter() - start >= 0.04
+        waiter.close()
+
+
+def test_rf_off_and_on_again_waits_for_the_new_event(ports, waiter):
+    assert switch_rf(ports, waiter, 1)
+    assert switch_rf(ports, waiter, 0)
+    assert switch_rf(ports, waiter, 1)
+    assert waiter.timeouts == 0
+
+
+def test_unchanged_value_is_confirmed_by_the_last_event(nktp, ports, waiter):
+    assert switch_rf(ports, waiter, 1)
+    written = nktp.written
+    assert switch_rf(ports, waiter, 1)
+    assert nktp.written == written
+
+
+def test_wait_times_out(waiter):
+    start = perf_counter()
+    assert not waiter.wait({REG_WAVELENGTH: 123456})
+    assert perf_counter() - start >= 0.05
+    assert waiter.timeouts == 1
+
+
+def test_min_settle_defaults_to_non_zero(waiter):
+    assert waiter.min_settle == MIN_SETTLE > 0
+
+
+def test_unavailable_waiter_sleeps_for_the_timeout(backend, nktp):
+    backend.nktp.devices['COM5'] = {}
+    waiter = SettleWaiter(nktp, 'COM5', 25, timeout=0.02)
+    assert not waiter.available
+    start = perf_counter()
+    assert not waiter.wait({REG_WAVELENGTH: 550000})
+    assert perf_counter() - start >= 0.02
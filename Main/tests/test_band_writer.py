@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import h5py
+import numpy as np
+import pytest
+
+from band_writer import BandWriter
+
+
+def test_existing_file_is_not_overwritten(tmp_path):
+    path = str(tmp_path / 'hypercube.h5')
+    BandWriter(path, 2, 4, 4, [500000, 510000]).close()
+    with pytest.raises(FileExistsError):
+        BandWriter(path, 2, 4, 4, [500000, 510000])
+    BandWriter(path, 3, 4, 4, [500000, 510000, 520000], overwrite=True).close()
+
+
+def test_bands_spectra_and_attributes_are_written(tmp_path):
+    path = str(tmp_path / 'hypercube.h5')
+    bands = np.arange(3 * 4 * 5, dtype=np.uint16).reshape(3, 4, 5)
+    spectra = np.linspace(0, 1, 3 * 8).reshape(3, 8)
+    with BandWriter(path, 3, 4, 5, [500000, 510000, 520000], spectrometer_wavelengths=np.linspace(400, 700, 8), exposure_time=2000,
+                    integration_time=1000, attrs={'sample': 'leaf'}) as writer:
+        for i in range(3):
+            writer.write_band(i, bands[i], spectra[i])
+        writer.write_dataset('dark_reference', np.zeros(8))
+
+    with h5py.File(path, 'r') as f:
+        np.testing.assert_array_equal(f['hypercube'][...], bands)
+        np.testing.assert_array_equal(f['spectra'][...], spectra)
+        assert f['hypercube'].chunks == (1, 4, 5)
+        assert list(f['wavelengths']) == [500000, 510000, 520000]
+        assert len(f['spectrometer_wavelengths']) == 8
+        assert f['dark_reference'].shape == (8,)
+        assert (f.attrs['exposure_time_us'], f.attrs['integration_time_us'], f.attrs['sample']) == (2000, 1000, 'leaf')
+
+
+# An error on the writer thread doesn't stop the sweep: the bands queued after it are dropped, and close() raises it
+def test_background_error_is_raised_on_close(tmp_path):
+    path = str(tmp_path / 'hypercube.h5')
+    writer = BandWriter(path, 3, 4, 5, [500000, 510000, 520000])
+    writer.write_band(0, np.ones((4, 5), dtype=np.uint16))
+    writer.write_band(1, np.ones((3, 3), dtype=np.uint16))
+    writer.write_band(2, np.ones((4, 5), dtype=np.uint16))
+    with pytest.raises(TypeError, match="Can't broadcast"):
+        writer.close()
+    assert writer.error is not None
+
+    with h5py.File(path, 'r') as f:
+        assert f['hypercube'][0].all()
+        assert not f['hypercube'][2].any()
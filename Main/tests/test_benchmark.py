@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import json
+from time import perf_counter
+
+import benchmark
+from device_recording import DeviceRecorder, ReplayBackend, TimingReplay, load_timings
+
+REGISTER_WRITE = 0.03
+
+
+def test_recorder_records_the_device_calls(backend, tmp_path):
+    recorder = DeviceRecorder()
+    recorder.wrap(backend)
+    backend.nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    backend.nktp.registerWriteU8('COM5', 25, 0x30, 0, -1)
+    backend.nktp.RegisterResultTypes(0)
+    camera = backend.open_camera(1000)
+    camera.grab()
+    assert camera.frames_grabbed == 1
+
+    assert sorted(recorder.timings) == ['camera.grab', 'nktp.registerWriteU8']
+    assert len(recorder.timings['nktp.registerWriteU8']) == 2
+    recorder.save(str(tmp_path / 'timings.json'))
+    assert load_timings(str(tmp_path / 'timings.json')) == recorder.timings
+
+
+def test_replay_takes_the_recorded_time_in_order(backend):
+    replay = TimingReplay({'nktp.registerWriteU8': [REGISTER_WRITE, 0.0]})
+    nktp = replay.device(backend.nktp, 'nktp')
+    durations = []
+    for value in (1, 0, 1):
+        start = perf_counter()
+        assert nktp.registerWriteU8('COM5', 25, 0x30, value, -1) == 0
+        durations.append(perf_counter() - start)
+    assert durations[0] >= REGISTER_WRITE and durations[2] >= REGISTER_WRITE
+    assert durations[1] < REGISTER_WRITE
+    assert replay.calls == {'nktp.registerWriteU8': 3}
+
+
+# The simulated camera already takes the exposure time, only what the recorded grab took beyond that is added
+def test_replay_backend(tmp_path):
+    path = str(tmp_path / 'timings.json')
+    with open(path, 'w') as f:
+        json.dump({'timings': {'nktp.registerWriteU8': [REGISTER_WRITE], 'camera.grab': [0.0]}}, f)
+    backend = ReplayBackend(path, frame_shape=(24, 32))
+    start = perf_counter()
+    backend.nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    assert perf_counter() - start >= REGISTER_WRITE
+    assert backend.simulated_nktp.registers[('COM5', 25, 0x30)] == 1
+
+    camera = backend.open_camera(20000)
+    start = perf_counter()
+    assert camera.grab().shape == (24, 32)
+    assert perf_counter() - start >= 0.02
+
+
+def test_benchmark_records_and_replays(tmp_path):
+    options = ['--bands', '3', '--frames', 'vga', '--no-writer', '--reference-frames', '2', '--integration-time', '1000',
+               '--exposure-time', '1000']
+    timings = str(tmp_path / 'timings.json')
+    report = benchmark.main(options + ['--record', timings, '--output', str(tmp_path / 'recorded.json')])
+    assert report['results'][0]['backend'] == 'simulator'
+    assert 'nktp.registerWriteU32' in load_timings(timings)
+
+    report = benchmark.main(options + ['--replay', timings, '--output', str(tmp_path / 'replayed.json')])
+    result = report['results'][0]
+    assert result['backend'] == 'replay'
+    assert result['sweep']['stages']['tune']['count'] == 3
+    with open(tmp_path / 'replayed.json') as f:
+        assert json.load(f)['results'][0]['bands'] == 3
+
+
+def test_peak_rss_without_the_resource_module(monkeypatch):
+    assert benchmark.peak_rss_mb() > 0
+    monkeypatch.setattr(benchmark, 'resource', None)
+    assert benchmark.peak_rss_mb() is None
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from calibration_cache import CalibrationCache
+
+WAVELENGTHS = np.linspace(500000, 600000, 11)
+
+
+# Count = gain * amplitude, with a gain per band. calibrate() sets every band to the target, except where the amplitude would have
+# to go above 1000
+class Calibrator:
+    target_count = 1000
+    tolerance = 20
+
+    def __init__(self, gains):
+        self.gains = dict(zip(WAVELENGTHS, gains))
+        self.calibrated = []
+        self.probed = []
+
+    def probe(self, wavelength, amplitude):
+        self.probed.append(wavelength)
+        return self.gains[wavelength] * amplitude
+
+    def calibrate(self, wavelengths, initial_amplitudes=None):
+        self.calibrated.extend(wavelengths)
+        gains = np.array([self.gains[w] for w in wavelengths])
+        amplitudes = np.minimum(1000, np.round(self.target_count / gains))
+        return amplitudes, gains * amplitudes
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CalibrationCache(str(tmp_path / 'calibration_cache'))
+
+
+def make_key(integration_time=10000):
+    return CalibrationCache.make_key(b'SIM-SELECT-0001-25', 'HR2B1032', integration_time, 1000, WAVELENGTHS)
+
+
+def test_cached_calibration_is_reused(cache):
+    calibrator = Calibrator(np.full(11, 2.0))
+    amplitudes, counts = cache.calibrate(make_key(), calibrator, WAVELENGTHS)
+    assert len(calibrator.calibrated) == 11
+
+    calibrator = Calibrator(np.full(11, 2.0))
+    cached_amplitudes, cached_counts = cache.calibrate(make_key(), calibrator, WAVELENGTHS)
+    assert calibrator.calibrated == [] and len(calibrator.probed) == 5
+    np.testing.assert_array_equal(cached_amplitudes, amplitudes)
+    np.testing.assert_array_equal(cached_counts, counts)
+
+
+def test_other_setup_is_calibrated_again(cache):
+    cache.calibrate(make_key(), Calibrator(np.full(11, 2.0)), WAVELENGTHS)
+    calibrator = Calibrator(np.full(11, 2.0))
+    cache.calibrate(make_key(integration_time=20000), calibrator, WAVELENGTHS)
+    assert len(calibrator.calibrated) == 11
+
+
+# The last band can't reach the target (count 500 at the largest amplitude). As long as it still reads 500 it hasn't drifted
+def test_band_short_of_the_target_is_not_recalibrated(cache):
+    gains = np.full(11, 2.0)
+    gains[-1] = 0.5
+    amplitudes, counts = cache.calibrate(make_key(), Calibrator(gains), WAVELENGTHS)
+    assert counts[-1] == 500
+
+    calibrator = Calibrator(gains)
+    cache.calibrate(make_key(), calibrator, WAVELENGTHS)
+    assert calibrator.calibrated == []
+
+
+# Spots at bands 0, 2 (rounded from 2.5), 5, 8 and 10. A drift at band 5 recalibrates the bands between its neighbouring spots
+def test_only_the_bands_around_a_drifted_spot_are_recalibrated(cache):
+    gains = np.full(11, 2.0)
+    cache.calibrate(make_key(), Calibrator(gains), WAVELENGTHS)
+
+    gains[5] = 2.2
+    calibrator = Calibrator(gains)
+    amplitudes, counts = cache.calibrate(make_key(), calibrator, WAVELENGTHS)
+    np.testing.assert_array_equal(calibrator.calibrated, WAVELENGTHS[3:8])
+    assert amplitudes[5] == round(1000 / 2.2)
+
+    _, cached_amplitudes, _ = cache.load(make_key())
+    np.testing.assert_array_equal(cached_amplitudes, amplitudes)
+
+
+def test_drift_within_the_relative_tolerance_is_ignored(cache):
+    gains = np.full(11, 2.0)
+    cache.calibrate(make_key(), Calibrator(gains), WAVELENGTHS)
+    calibrator = Calibrator(gains * 1.04)
+    cache.calibrate(make_key(), calibrator, WAVELENGTHS)
+    assert calibrator.calibrated == []
+
+    calibrator = Calibrator(gains * 1.04)
+    cache.calibrate(make_key(), calibrator, WAVELENGTHS, drift_tolerance=0.02)
+    assert len(calibrator.calibrated) == 11
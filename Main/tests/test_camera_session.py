@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+
+# The pylon camera emulator stands in for the Basler camera
+os.environ.setdefault('PYLON_CAMEMU', '1')
+pytest.importorskip('pypylon')
+
+from camera_session import CameraSession
+
+
+@pytest.fixture
+def camera():
+    with CameraSession(exposure_time=1000.0, timeout_ms=500) as camera:
+        yield camera
+
+
+# The emulator's test pattern moves on by one grey level per frame, so each trigger gives a frame of its own
+def test_grab(camera):
+    img = camera.grab()
+    assert img.shape == camera.shape
+    out = np.zeros(camera.shape, dtype=img.dtype)
+    assert camera.grab(out=out) is out
+    assert np.array_equal(out, img + np.uint8(1))
+    assert (camera.frames_triggered, camera.frames_grabbed) == (2, 2)
+    camera.wait_exposure_end(2)
+
+
+def test_exposure_is_only_written_when_it_changes(camera):
+    camera.set_exposure(2000.0)
+    assert camera.camera.ExposureTime.GetValue() == 2000.0
+    camera.camera.ExposureTime.SetValue(3000.0)
+    camera.set_exposure(2000.0)
+    assert camera.camera.ExposureTime.GetValue() == 3000.0
+
+
+# A frame that isn't there raises, and the next trigger gets its own frame
+def test_retrieve_timeout_resyncs(camera):
+    with pytest.raises(TimeoutError, match='no frame within 500 ms'):
+        camera.retrieve()
+    assert camera.grab() is not None
+    assert camera.frames_triggered == 1
+
+
+def test_wait_for_a_frame_that_is_never_triggered(camera):
+    with pytest.raises(TimeoutError, match='frame 1 not triggered'):
+        camera.wait_exposure_end(1, timeout=0.01)
+
+
+def test_failed_trigger_wakes_the_waiter(camera):
+    camera.camera.StopGrabbing()
+    with pytest.raises(Exception):
+        camera.trigger()
+    with pytest.raises(RuntimeError, match='trigger failed'):
+        camera.wait_exposure_end(1)
+    assert camera.trigger_error is not None
+
+
+def test_close():
+    camera = CameraSession(timeout_ms=500)
+    camera.close()
+    assert not camera.camera.IsOpen()
+    camera.close()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from device_discovery import DeviceDiscovery
+from port_manager import PortManager
+
+DEVICES = {'COM4': {1: 0x74}, 'COM5': {25: 0x67}}
+
+
+@pytest.fixture
+def ports(nktp):
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        yield ports
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return str(tmp_path / 'device_cache.json')
+
+
+def test_first_session_scans_every_port(backend, ports, cache):
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    assert discovery.discover() == DEVICES
+    assert discovery.scanned == ['COM4', 'COM5']
+    assert backend.nktp.bus_scans == 2
+    with open(cache) as f:
+        assert json.load(f)['ports'] == {'COM4': {'1': 0x74}, 'COM5': {'25': 0x67}}
+
+
+def test_next_session_uses_the_cache(backend, ports, cache):
+    DeviceDiscovery(backend, ports, path=cache).discover()
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    assert discovery.discover() == DEVICES
+    assert discovery.scanned == []
+    assert backend.nktp.bus_scans == 2
+
+
+def test_only_the_changed_port_is_scanned(backend, ports, cache):
+    DeviceDiscovery(backend, ports, path=cache).discover()
+    backend.nktp.devices['COM5'][25] = 0x68
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    assert discovery.discover() == {'COM4': {1: 0x74}, 'COM5': {25: 0x68}}
+    assert discovery.scanned == ['COM5']
+
+    del backend.nktp.devices['COM4'][1]
+    assert DeviceDiscovery(backend, ports, path=cache).discover()['COM4'] == {}
+
+
+def test_force_scans_everything(backend, ports, cache):
+    DeviceDiscovery(backend, ports, path=cache).discover()
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    discovery.discover(force=True)
+    assert discovery.scanned == ['COM4', 'COM5']
+
+
+def test_unreadable_cache_is_ignored(backend, ports, cache):
+    with open(cache, 'w') as f:
+        f.write('{"ports": [')
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    assert discovery.topology['ports'] == {}
+    assert discovery.discover() == DEVICES
+
+
+def test_devices_are_opened_from_the_cached_serial_number(backend, ports, cache):
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    camera = discovery.open_camera(0.01)
+    assert camera.serial_number == backend.camera_serial
+    assert discovery.topology['cameras'] == [backend.camera_serial]
+
+    # Opened straight away next time, without enumerating the cameras
+    backend.list_cameras = lambda: pytest.fail('cameras enumerated again')
+    assert DeviceDiscovery(backend, ports, path=cache).open_camera(0.01).serial_number == backend.camera_serial
+
+
+def test_camera_that_is_gone_is_replaced(backend, ports, cache):
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    discovery.topology['cameras'] = ['OLD-CAMERA']
+    assert discovery.open_camera(0.01).serial_number == backend.camera_serial
+    assert discovery.topology['cameras'] == [backend.camera_serial]
+
+    # A camera asked for by serial number that isn't attached is an error
+    with pytest.raises(RuntimeError, match='OLD-CAMERA'):
+        discovery.open_camera(0.01, serial_number='OLD-CAMERA')
+
+
+def test_requested_spectrometer_goes_first(backend, ports, cache):
+    discovery = DeviceDiscovery(backend, ports, path=cache)
+    discovery.topology['spectrometers'] = ['HR2B1032', 'USB4F0001']
+    assert discovery.open_spectrometer('USB4F0001').serial_number == 'USB4F0001'
+    assert discovery.topology['spectrometers'] == ['USB4F0001', 'HR2B1032']
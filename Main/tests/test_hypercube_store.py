@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from hypercube_store import HypercubeStore, run_filename
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HypercubeStore(str(tmp_path / 'hypercube.npy'), 5, 6, 8, dtype=np.uint16)
+
+
+def test_bands_are_contiguous(store):
+    assert store.bands.shape == (5, 6, 8)
+    assert store.bands.flags.c_contiguous
+    band = store.band(2)
+    assert band.shape == (6, 8) and band.flags.c_contiguous
+    # Band i is the i-th block of height * width pixels in the file
+    assert band.ctypes.data - store.bands.ctypes.data == 2 * 6 * 8 * store.bands.itemsize
+
+
+def test_cube_is_a_view_of_the_bands(store):
+    assert store.shape == store.cube.shape == (6, 8, 5)
+    assert np.shares_memory(store.cube, store.bands)
+    store.write_band(3, np.full((6, 8), 7, dtype=np.uint16))
+    store.band(1)[2, 4] = 9
+    assert np.all(store.cube[:, :, 3] == 7)
+    assert store.cube[2, 4, 1] == 9
+
+
+def test_bands_are_on_disk_after_flush(store):
+    bands = np.arange(5 * 6 * 8, dtype=np.uint16).reshape(5, 6, 8)
+    for i, img in enumerate(bands):
+        np.copyto(store.band(i), img)
+    store.flush()
+    np.testing.assert_array_equal(np.load(store.path, mmap_mode='r'), bands)
+    np.testing.assert_array_equal(HypercubeStore.open(store.path, mode='r').cube, bands.transpose(1, 2, 0))
+
+
+def test_existing_cube_is_not_overwritten(store):
+    store.band(0)[...] = 3
+    store.flush()
+    with pytest.raises(FileExistsError):
+        HypercubeStore(store.path, 5, 6, 8)
+    assert np.all(np.load(store.path)[0] == 3)
+
+    assert not HypercubeStore(store.path, 5, 6, 8, overwrite=True).bands.any()
+
+
+def test_run_filename():
+    assert run_filename('hypercube', '.npy', datetime(2024, 5, 21, 14, 30, 5)) == 'hypercube_20240521_143005.npy'
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from hypercube_store import HypercubeStore
+from multiplexed_sweep import MultiplexedSweep, s_matrix, s_matrix_inverse
+
+
+@pytest.mark.parametrize('order', [1, 3, 7, 15])
+def test_s_matrix_inverse(order):
+    s = s_matrix(order)
+    assert s.shape == (order, order)
+    assert np.all(s.sum(axis=1) == (order + 1) // 2)
+    np.testing.assert_allclose(s_matrix_inverse(s) @ s, np.eye(order), atol=1e-12)
+
+
+@pytest.mark.parametrize('order', [0, 2, 6])
+def test_s_matrix_order(order):
+    with pytest.raises(ValueError):
+        s_matrix(order)
+
+
+# Frames and spectra made up from known bands, as the camera and spectrometer would see them, are demultiplexed back into those
+# bands. 10 bands in blocks of 7 leave a last block with 3 bands, whose frames only hold the bands that exist
+@pytest.mark.parametrize('n_bands, order', [(14, 7), (10, 7), (5, 3)])
+def test_demultiplex_round_trip(tmp_path, backend, nktp, n_bands, order):
+    camera = backend.open_camera()
+    height, width = camera.shape
+    store = HypercubeStore(str(tmp_path / 'hypercube.npy'), n_bands, height, width, dtype=np.uint16)
+    wavelengths = np.linspace(450000, 650000, n_bands)
+    sweep = MultiplexedSweep(nktp, camera, None, store, wavelengths, np.full(n_bands, 500), order=order, verbose=False)
+
+    rng = np.random.default_rng(1)
+    bands = rng.integers(0, 4000 // order, (n_bands, height, width))
+    spectra = rng.uniform(0, 100, (n_bands, 16))
+    dark_frame = rng.integers(0, 20, (height, width))
+    sweep.dark_frame[...] = dark_frame
+
+    for k in range(sweep.n_blocks * order):
+        on = sweep.pattern_bands(k)
+        assert np.all(on < n_bands)
+        img = (bands[on].sum(axis=0) + dark_frame).astype(np.uint16)
+        sweep.store(k, img, spectra[on].sum(axis=0))
+
+    np.testing.assert_array_equal(store.bands, bands)
+    np.testing.assert_allclose(sweep.total_intensities, spectra.sum(axis=0))
+    assert sweep.saturated_frames == 0
+
+
+def make_sweep(tmp_path, backend, nktp, spectrometer, n_bands=7, order=7):
+    camera = backend.open_camera()
+    camera.set_exposure(2000)
+    height, width = camera.shape
+    store = HypercubeStore(str(tmp_path / 'hypercube.npy'), n_bands, height, width, dtype=np.uint8)
+    wavelengths = np.linspace(450000, 650000, n_bands)
+    return MultiplexedSweep(nktp, camera, spectrometer, store, wavelengths, np.full(n_bands, 500), order=order, settle_time=0.001,
+                            verbose=False)
+
+
+def test_run_fills_every_band(tmp_path, backend, nktp, spectrometer):
+    sweep = make_sweep(tmp_path, backend, nktp, spectrometer, n_bands=10)
+    total_intensities = sweep.run()
+    assert len(total_intensities) == len(spectrometer.wavelengths())
+    assert sweep.camera.frames_triggered == 1 + 2 * 7
+    assert len(sweep.engine.timings['store']) == 14
+
+
+@pytest.mark.parametrize('stage', ['dark frame', 'pattern 1'])
+def test_failed_grab_raises(tmp_path, backend, nktp, spectrometer, monkeypatch, stage):
+    sweep = make_sweep(tmp_path, backend, nktp, spectrometer)
+    retrieve = sweep.camera.retrieve
+    # The camera returns None for a failed grab, here for the dark frame or for the first multiplexed frame
+    failed = 0 if stage == 'dark frame' else 1
+    monkeypatch.setattr(sweep.camera, 'retrieve', lambda out=None: None if sweep.camera.frames_grabbed == failed else retrieve(out))
+    with pytest.raises(RuntimeError, match=f'grab failed for the {stage}'):
+        sweep.run()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from aotf_settle import REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH, RegData_U16, RegData_U32
+from nktp_async import AsyncNKTP
+from point_to_point import point_to_point_port
+from port_manager import PortManager
+from simulator import PointToPointStandIn
+
+REGISTERS = {REG_WAVELENGTH: RegData_U32, REG_AMPLITUDE: RegData_U16}
+
+
+# The registers are read once when they are first monitored, so the stream starts with their old values
+async def wait_for_value(events, value):
+    while True:
+        event = await asyncio.wait_for(events.__anext__(), 1.0)
+        if event.value == value:
+            return event
+
+
+@pytest.fixture
+def ports(nktp):
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        yield ports
+
+
+def test_reads_and_writes_are_awaited(backend, nktp, ports):
+    async def main():
+        anktp = AsyncNKTP(nktp, ports.workers)
+        writes = [('U32', REG_WAVELENGTH, 600000), ('U16', REG_AMPLITUDE, 500), ('U8', REG_RF_POWER, 1)]
+        emission, transaction = await asyncio.gather(anktp.registerWriteU8('COM4', 1, 0x30, 1, -1),
+                                                     anktp.transaction('COM5', 25, writes))
+        amplitude = await anktp.registerReadU16('COM5', 25, REG_AMPLITUDE, -1)
+        ports_found = await anktp.getAllPorts()
+        anktp.close()
+        return emission, transaction, amplitude, ports_found
+
+    emission, transaction, amplitude, ports_found = asyncio.run(main())
+    assert emission == 0 and transaction.ok
+    assert amplitude == (0, 500)
+    assert backend.nktp.registers[('COM5', 25, REG_WAVELENGTH)] == 600000
+    assert 'COM5' in ports_found.split(',')
+
+
+# Workers for ports that weren't passed in are started on first use, and stopped by close()
+def test_own_workers(nktp, ports):
+    async def main():
+        anktp = AsyncNKTP(nktp, {'COM5': ports['COM5']})
+        assert await anktp.registerWriteU8('COM4', 1, 0x30, 1, -1) == 0
+        assert anktp.worker('COM5') is ports['COM5']
+        worker = anktp.worker('COM4')
+        anktp.close()
+        return worker
+
+    worker = asyncio.run(main())
+    with pytest.raises(RuntimeError):
+        worker.call('registerReadU8', 1, 0x30, -1)
+    assert ports['COM5'].call('registerReadU8', 25, 0x30, -1).result()[0] == 0
+
+
+def test_live_event_stream(nktp, ports):
+    async def main():
+        anktp = AsyncNKTP(nktp, ports.workers)
+        async with anktp.events('COM5', 25, regIds=[REG_WAVELENGTH]) as events:
+            assert await anktp.monitor('COM5', 25, REGISTERS) == 0
+            assert (await anktp.transaction('COM5', 25, [('U16', REG_AMPLITUDE, 450), ('U32', REG_WAVELENGTH, 575000)])).ok
+            event = await wait_for_value(events, 575000)
+            assert event.reg_id == REG_WAVELENGTH
+        # The stream ends once closed
+        return [event async for event in events]
+
+    assert asyncio.run(main()) == []
+
+
+# The registers are monitored through the point-to-point worker, which creates them again after a reconnect
+def test_monitor_on_a_point_to_point_port(backend, nktp):
+    stand_in = PointToPointStandIn('udp')
+    portdata = point_to_point_port('127.0.0.1', 0, '127.0.0.1', stand_in.port, 'udp', timeout_ms=50)
+    ports = PortManager(nktp, ['SELECT-ETH'], live_ports=['SELECT-ETH'], point_to_point={'SELECT-ETH': portdata}).open()
+
+    async def main():
+        anktp = AsyncNKTP(nktp, ports.workers)
+        async with anktp.events('SELECT-ETH', 25) as events:
+            assert await anktp.monitor('SELECT-ETH', 25, REGISTERS) == 0
+            assert await anktp.registerWriteU32('SELECT-ETH', 25, REG_WAVELENGTH, 525000, -1) == 0
+            return await wait_for_value(events, 525000)
+
+    try:
+        event = asyncio.run(main())
+        assert (event.port, event.reg_id, event.value) == ('SELECT-ETH', REG_WAVELENGTH, 525000)
+        assert {key[1] for key in ports['SELECT-ETH'].monitors} == set(REGISTERS)
+        assert {key[2] for key in backend.nktp.monitored if key[0] == 'SELECT-ETH'} == set(REGISTERS)
+    finally:
+        ports.close()
+        stand_in.close()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import ctypes
+from ctypes import CFUNCTYPE, c_void_p
+
+import pytest
+
+import NKTP_DLL
+from NKTP_DLL import bindings
+from NKTP_DLL.bindings import VIEWS, argtypes, lookup, pointToPointPortData
+from NKTP_DLL.signatures import REGISTER_CTYPES, SIGNATURES, Buffer, Data, In, Out, Port, Str
+
+BUFFER_DATA = b'abc\0'
+PORTDATA = pointToPointPortData('192.168.1.10', 10001, '192.168.1.20', 10002, 0, 100)
+PORTDATA_FIELDS = ['portdata.' + field for field in pointToPointPortData._fields]
+
+
+# From the struct format code of the C type, e.g. 'b' signed char, 'B' unsigned char, 'f' float
+def is_float(ctype):
+    return ctype._type_ in 'fd'
+
+
+def is_signed(ctype):
+    return ctype._type_ in 'bhilqfd'
+
+
+# A value of the C type that only comes back unchanged if the type is right (signed, unsigned or floating point)
+def sample(ctype):
+    if ctype is c_void_p:
+        return None
+    if is_float(ctype):
+        return 2.5
+    return -5 if is_signed(ctype) else 200
+
+
+# Arguments of the Python function, and what the DLL should receive for each of them
+def sample_args(sig):
+    if sig.params == 'portname, portdata':
+        return ['COM5', PORTDATA], [b'COM5', PORTDATA.hostAddress.encode(), PORTDATA.hostPort, PORTDATA.clientAddress.encode(),
+                                    PORTDATA.clientPort, PORTDATA.protocol, PORTDATA.msTimeout]
+    args, received = [], []
+    for argument in sig.arguments:
+        if isinstance(argument, Port):
+            args.append('COM5')
+            received.append(b'COM5')
+        elif isinstance(argument, Str):
+            args.append('abc')
+            received.append(b'abc')
+        elif isinstance(argument, Data):
+            args.append(b'\x01\x02')
+            received.append(b'\x01\x02')
+        elif isinstance(argument, In):
+            args.append(sample(argument.ctype))
+            received.append(sample(argument.ctype))
+    return args, received
+
+
+# What the wrapper should return when the DLL stores the samples in the out-parameters and BUFFER_DATA in the buffers
+def expected(sig, view):
+    outputs = []
+    for argument in sig.arguments:
+        if isinstance(argument, Out):
+            outputs.append(sample(argument.ctype))
+        elif isinstance(argument, Buffer):
+            if view or argument.decode in ('raw', 'bytes'):
+                outputs.append(b'abc')
+            else:
+                outputs.append('abc')
+    if sig.pack is not None:
+        outputs = [pointToPointPortData(*outputs)]
+    if sig.restype is None:
+        return outputs[0] if outputs else None
+    return (0, *outputs) if outputs else 0
+
+
+# Stands in for the DLL: a C callback with the prototype of the function, which records the arguments it was passed and writes to
+# the out-parameters and buffers
+@pytest.fixture
+def dll():
+    calls = {}
+    result = {'code': 0}
+
+    def wrapper(name, sig, prototype):
+        def fake(*c_args):
+            values = iter(c_args)
+            received = []
+            for argument in sig.arguments:
+                if isinstance(argument, Out):
+                    next(values)[0] = sample(argument.ctype)
+                elif isinstance(argument, Buffer):
+                    data, size = next(values), next(values)
+                    received.append(('size', size[0]))
+                    if result['code'] == 0:
+                        ctypes.memmove(data, BUFFER_DATA, len(BUFFER_DATA))
+                        size[0] = len(BUFFER_DATA) - 1
+                else:
+                    received.append(next(values))
+            calls[name] = received
+            return None if sig.restype is None else result['code']
+        return CFUNCTYPE(sig.restype, *argtypes(sig))(fake)
+
+    bindings.set_wrapper(wrapper)
+    yield calls, result
+    bindings.set_wrapper(None)
+
+
+@pytest.mark.parametrize('name', sorted(SIGNATURES) + VIEWS)
+def test_wrapper_matches_the_signature(dll, name):
+    calls, _ = dll
+    sig, view = lookup(name)
+    args, received = sample_args(sig)
+
+    value = bindings.function(name)(*args)
+    if view:
+        assert isinstance(value[1], memoryview)
+        value = (value[0], bytes(value[1]))
+    assert value == expected(sig, view)
+
+    sizes = [('size', argument.size) for argument in sig.arguments if isinstance(argument, Buffer)]
+    assert [value for value in calls[name] if not isinstance(value, tuple)] == received
+    assert [value for value in calls[name] if isinstance(value, tuple)] == sizes
+
+
+# U8 ... F64: the C type has the size and the signedness in the name
+@pytest.mark.parametrize('suffix', sorted(REGISTER_CTYPES))
+def test_register_ctypes(suffix):
+    ctype = REGISTER_CTYPES[suffix]
+    assert ctypes.sizeof(ctype) * 8 == int(suffix[1:])
+    assert is_float(ctype) == (suffix[0] == 'F')
+    assert is_signed(ctype) == (suffix[0] in 'SF')
+
+
+def test_params_cover_the_inputs():
+    for name, sig in SIGNATURES.items():
+        inputs = [a.name for a in sig.arguments if isinstance(a, (Port, Str, In, Data))]
+        if sig.params is None:
+            continue
+        assert name == 'pointToPointPortAdd' and inputs == ['portname'] + PORTDATA_FIELDS
+
+
+# On an error the raw data is empty, and a string buffer the DLL didn't write to doesn't return the previous call's string
+def test_failed_call_returns_no_data(dll):
+    _, result = dll
+    registerRead = bindings.function('registerRead')
+    deviceGetPartNumberStr = bindings.function('deviceGetPartNumberStr')
+    assert registerRead('COM5', 25, 0x90, -1) == (0, b'abc')
+    assert deviceGetPartNumberStr('COM5', 25) == (0, b'abc')
+
+    result['code'] = 4
+    assert registerRead('COM5', 25, 0x90, -1) == (4, b'')
+    assert deviceGetPartNumberStr('COM5', 25) == (4, b'')
+
+
+def test_buffers_are_reused(dll):
+    registerReadView = bindings.function('registerReadView')
+    first = registerReadView('COM5', 25, 0x90, -1)[1]
+    second = registerReadView('COM5', 25, 0x90, -1)[1]
+    assert first.obj is second.obj
+
+
+def test_module_functions_are_generated_on_first_use():
+    assert NKTP_DLL.registerWriteU8 is NKTP_DLL.registerWriteU8
+    assert NKTP_DLL.registerWriteU8.__module__ == 'NKTP_DLL'
+    with pytest.raises(AttributeError):
+        NKTP_DLL.registerWriteU7
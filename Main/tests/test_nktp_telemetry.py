@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from ctypes import CFUNCTYPE
+
+import pytest
+
+from NKTP_DLL import bindings
+from NKTP_DLL.bindings import argtypes
+from NKTP_DLL.telemetry import LATENCY_BINS_MS, RegisterStats, RegisterTelemetry, key_name
+from NKTP_DLL.decoders import RegisterResultTypes
+
+RegResultCRCErr = 5
+
+
+# The generated wrapper of a function, with a stand-in for the DLL function behind it returning the given result codes in turn
+def fake_function(name, results):
+    wrapper = bindings.function(name)
+    sig = bindings.lookup(name)[0]
+    codes = iter(results)
+    namespace = wrapper.__globals__
+    namespace['_prototype'] = CFUNCTYPE(sig.restype, *argtypes(sig))(lambda *args: next(codes) if sig.restype else None)
+    bindings.install(namespace)
+    return wrapper
+
+
+@pytest.fixture
+def telemetry():
+    telemetry = RegisterTelemetry()
+    telemetry.enable()
+    yield telemetry
+    telemetry.disable()
+
+
+def test_register_calls_are_recorded_per_register(telemetry):
+    registerWriteU32 = fake_function('registerWriteU32', [0, 0, RegResultCRCErr])
+    openPorts = fake_function('openPorts', [0])
+    for _ in range(3):
+        registerWriteU32('COM5', 25, 0x90, 550000, -1)
+    openPorts('COM5', 0, 1)
+
+    snapshot = telemetry.snapshot()
+    assert set(snapshot) == {'COM5/25/0x90', 'COM5'}
+    stats = snapshot['COM5/25/0x90']
+    assert (stats['calls'], stats['errors']) == (3, 1)
+    assert stats['results'] == {RegisterResultTypes(0): 2, RegisterResultTypes(RegResultCRCErr): 1}
+    assert sum(stats['histogram'].values()) == 3
+    assert snapshot['COM5']['calls'] == 1
+
+    line = telemetry.log_line()
+    assert line.startswith('NKTP telemetry (4 calls)') and '1 errors' in line
+
+
+# Functions without a port name or a result code aren't timed
+def test_only_port_functions_with_a_result_are_instrumented(telemetry):
+    fake_function('getLegacyBusScanning', [0])()
+    fake_function('getAllPorts', [])()
+    assert telemetry.snapshot() == {}
+    assert telemetry.log_line() == 'NKTP telemetry: no register calls'
+
+
+def test_disable_removes_the_wrappers(telemetry):
+    registerWriteU8 = fake_function('registerWriteU8', [0, 0])
+    registerWriteU8('COM4', 1, 0x30, 1, -1)
+    telemetry.disable()
+    assert registerWriteU8.__globals__['_function'] is registerWriteU8.__globals__['_prototype']
+    registerWriteU8('COM4', 1, 0x30, 0, -1)
+    assert telemetry.snapshot()['COM4/1/0x30']['calls'] == 1
+
+    telemetry.reset()
+    assert telemetry.snapshot() == {}
+
+
+def test_percentiles_are_histogram_bin_edges():
+    stats = RegisterStats(RegisterResultTypes)
+    for latency in [0.0004] * 98 + [0.003, 2.0]:
+        stats.add(latency, 0)
+    assert stats.percentile(0.5) == 0.5
+    assert stats.percentile(0.99) == 5
+    assert stats.percentile(1.0) == 2000
+    assert stats.summary()['histogram'] == {'<=0.5 ms': 98, '<=5 ms': 1, f'>{LATENCY_BINS_MS[-1]} ms': 1}
+    assert stats.result_name(42).startswith('42:')
+
+
+def test_key_name():
+    assert key_name((b'COM5', 25, 0x90)) == 'COM5/25/0x90'
+    assert key_name((b'COM5', 25, None)) == 'COM5/25'
+    assert key_name((b'COM5', None, None)) == 'COM5'
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from aotf_settle import REG_AMPLITUDE, REG_RF_POWER, REG_WAVELENGTH, SettleWaiter
+from point_to_point import point_to_point_port
+from port_manager import PortManager
+from simulator import PointToPointStandIn
+
+RegResultComError = 7
+
+
+@pytest.mark.parametrize('protocol', ['udp', 'tcp'])
+def test_reconnect(backend, nktp, protocol):
+    sim = backend.nktp
+    stand_in = PointToPointStandIn(protocol)
+    portdata = point_to_point_port('127.0.0.1', 0, '127.0.0.1', stand_in.port, protocol, timeout_ms=50)
+    ports = PortManager(nktp, ['SELECT-ETH'], live_ports=['SELECT-ETH'], point_to_point={'SELECT-ETH': portdata}).open()
+    worker = ports['SELECT-ETH']
+    waiter = SettleWaiter(nktp, 'SELECT-ETH', 25, timeout=0.5, port_worker=worker)
+    try:
+        assert waiter.available
+        assert len(worker.monitors) == len(waiter.registers)
+
+        # Link down: the transaction fails after one reconnect attempt
+        stand_in.close()
+        time.sleep(0.1)
+        result = ports.transaction('SELECT-ETH', 25, [('U32', REG_WAVELENGTH, 500000)])
+        assert result.results == [RegResultComError]
+        assert worker.reconnects == 1
+
+        # Link back: the port is reconnected, the write goes through and the monitored registers are created again, so the
+        # settle waiter is confirmed again
+        stand_in = PointToPointStandIn(protocol, port=portdata.clientPort)
+        writes = [('U32', REG_WAVELENGTH, 555000), ('U16', REG_AMPLITUDE, 400), ('U8', REG_RF_POWER, 1)]
+        assert ports.transaction('SELECT-ETH', 25, writes).ok
+        assert worker.reconnects == 2
+        assert sim.registers[('SELECT-ETH', 25, REG_WAVELENGTH)] == 555000
+        assert {key[2] for key in sim.monitored if key[0] == 'SELECT-ETH'} == set(waiter.registers)
+        assert waiter.wait({REG_WAVELENGTH: 555000, REG_AMPLITUDE: 400, REG_RF_POWER: 1})
+    finally:
+        waiter.close()
+        ports.close()
+        stand_in.close()
+    assert 'SELECT-ETH' not in sim.p2p_ports
+
+
+def test_unknown_protocol():
+    with pytest.raises(ValueError):
+        point_to_point_port('127.0.0.1', 0, '127.0.0.1', 10001, protocol='sctp')
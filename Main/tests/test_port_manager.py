@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import threading
+from time import sleep
+
+import pytest
+
+from point_to_point import point_to_point_port
+from port_manager import PortManager
+
+
+def test_ports_are_opened_once_and_closed(backend, nktp):
+    sim = backend.nktp
+    with PortManager(nktp, ['COM4', 'COM5'], live_ports=['COM5']) as ports:
+        assert sim.getOpenPorts() == 'COM4,COM5'
+        assert sim.live_ports == {'COM5'}
+        assert ports.opened == ['COM4', 'COM5']
+    assert sim.getOpenPorts() == ''
+    assert sim.bus_scans == 0
+
+
+def test_auto_mode_scans_the_bus(backend, nktp):
+    with PortManager(nktp, ['COM4', 'COM5'], auto_mode=1):
+        pass
+    assert backend.nktp.bus_scans == 2
+
+
+# One port's commands run in the order they were submitted, on its own thread
+def test_submit_runs_in_order_per_port(backend, nktp):
+    with PortManager(nktp, ['COM4', 'COM5']) as ports:
+        futures = [ports.submit('COM5', 'registerWriteU32', 25, 0x90, 500000 + 1000 * k, -1) for k in range(10)]
+        reads = ports.submit('COM5', 'registerReadU32', 25, 0x90, -1)
+        assert [future.result() for future in futures] == [0] * 10
+        assert reads.result() == (0, 509000)
+        assert ports.call('COM4', 'registerReadU8', 1, 0x30, -1) == (0, 0)
+        assert ports['COM4']._thread is not ports['COM5']._thread
+
+
+# A slow command on COM5 doesn't hold up COM4
+def test_ports_run_in_parallel(nktp):
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(portname):
+        started.set()
+        release.wait(1)
+        return portname
+
+    with PortManager(nktp, ['COM4', 'COM5']) as ports:
+        blocked = ports['COM5'].run(blocking, 'COM5')
+        started.wait(1)
+        assert ports.call('COM4', 'registerWriteU8', 1, 0x30, 1, -1) == 0
+        assert not blocked.done()
+        release.set()
+        assert blocked.result() == 'COM5'
+
+
+def test_transaction(backend, nktp):
+    sim = backend.nktp
+    with PortManager(nktp, ['COM4', 'COM5']) as ports:
+        result = ports.transaction('COM5', 25, [('U32', 0x90, 600000), ('U16', 0xB0, 500), ('U8', 0x30, 1)], verify=True)
+        assert result.ok and result.verified
+        assert sim.registers[('COM5', 25, 0x90)] == 600000
+        assert sim.registers[('COM5', 25, 0xB0)] == 500
+
+
+# close() waits for everything already queued before closing the port
+def test_close_runs_queued_commands_first(backend, nktp):
+    sim = backend.nktp
+    ports = PortManager(nktp, ['COM5']).open()
+    ports['COM5'].run(sleep, 0.02)
+    pending = ports.submit('COM5', 'registerWriteU16', 25, 0xB0, 700, -1)
+    ports.close()
+    assert pending.result() == 0
+    assert sim.registers[('COM5', 25, 0xB0)] == 700
+    assert sim.getOpenPorts() == ''
+
+
+class FailingPorts:
+    def __init__(self, nktp, failing):
+        self.nktp = nktp
+        self.failing = failing
+
+    def __getattr__(self, name):
+        return getattr(self.nktp, name)
+
+    def openPorts(self, portnames, autoMode, liveMode):
+        return 2 if portnames in self.failing else self.nktp.openPorts(portnames, autoMode, liveMode)
+
+
+def test_failed_open_closes_the_other_ports(backend):
+    sim = backend.nktp
+    ports = PortManager(FailingPorts(sim, {'COM4'}), ['COM4', 'COM5'])
+    with pytest.raises(RuntimeError, match='Could not open port COM4'):
+        ports.open()
+    assert sim.getOpenPorts() == ''
+    assert ports.opened == []
+
+
+def test_point_to_point_port_with_a_bad_address(backend, nktp):
+    portdata = point_to_point_port('192.168.1.10', 10001, 'not an address', 10002, 'udp')
+    ports = PortManager(nktp, ['COM4', 'SELECT-ETH'], point_to_point={'SELECT-ETH': portdata})
+    with pytest.raises(RuntimeError, match='Could not add point-to-point port SELECT-ETH'):
+        ports.open()
+    assert backend.nktp.getOpenPorts() == ''
+    assert 'SELECT-ETH' not in backend.nktp.p2p_ports
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from calibration_cache import CalibrationCache
+from power_calibration import (REG_AMPLITUDE, PowerCalibrator, load_calibration, previous_amplitudes, save_calibration,
+                               setup_path)
+from power_meters import SpectrometerMeter
+from spectrometer_session import SpectrometerSession
+
+WAVELENGTHS = np.array([500000, 550000, 600000])
+
+
+def key(spectrometer_serial='HR2B1032', integration_time=10000, target_count=1000, readout='line 2.0 nm', wavelengths=WAVELENGTHS):
+    return CalibrationCache.make_key(b'SIM-SELECT-0001-25', spectrometer_serial, integration_time, target_count, wavelengths,
+                                     readout)
+
+
+# A target the band can't reach: the amplitude returned is the last one probed, with the count measured there
+def test_out_of_iterations_returns_the_last_probe(backend, nktp, spectrometer):
+    nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)
+    meter = SpectrometerMeter(SpectrometerSession(spectrometer), 1000, None, None)
+    counts = []
+
+    def measure(wavelength):
+        counts.append(meter(wavelength))
+        return counts[-1]
+
+    calibrator = PowerCalibrator(nktp, measure, 1e9, 1, 3, settle_time=0.01, verbose=False)
+    amplitude, count, iterations = calibrator.calibrate_band(550000, 200)
+    assert iterations == 3
+    assert count == counts[-1]
+    assert amplitude == backend.nktp.registers[('COM5', 25, REG_AMPLITUDE)]
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'calibration_results.csv')
+    save_calibration(path, WAVELENGTHS, [400, 500, 600], [990, 1000, 1010])
+    wavelengths, amplitudes, counts = load_calibration(path)
+    np.testing.assert_array_equal(wavelengths, WAVELENGTHS)
+    np.testing.assert_array_equal(amplitudes, [400, 500, 600])
+    np.testing.assert_array_equal(counts, [990, 1000, 1010])
+
+
+def test_previous_amplitudes_need_the_same_setup(tmp_path):
+    path = str(tmp_path / 'calibration_results.csv')
+    assert previous_amplitudes(path, WAVELENGTHS, key()) is None
+
+    save_calibration(path, WAVELENGTHS, [400, 500, 600], [1000, 1000, 1000], key())
+    grid = np.array([450000, 525000, 600000])
+    amplitudes = previous_amplitudes(path, grid, key(wavelengths=grid))
+    np.testing.assert_array_equal(amplitudes[1:], [450, 600])
+    assert np.isnan(amplitudes[0])
+
+    assert previous_amplitudes(path, grid, key(spectrometer_serial='SIM-CAMERA-0001', readout='camera roi 0:8,0:8')) is None
+    assert previous_amplitudes(path, grid, key(integration_time=20000)) is None
+    assert previous_amplitudes(path, grid, key(target_count=2000)) is None
+
+    # Saved without a setup, the calibration isn't reused for a setup
+    save_calibration(path, WAVELENGTHS, [400, 500, 600], [1000, 1000, 1000])
+    assert not (tmp_path / setup_path('calibration_results.csv')).exists()
+    assert previous_amplitudes(path, grid, key(wavelengths=grid)) is None
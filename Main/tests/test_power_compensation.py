@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from power_compensation import PowerCompensation
+
+WAVELENGTHS_CAL = np.array([500000, 550000, 600000, 650000])
+AMPLITUDES_CAL = np.array([800, 400, 0, 1000])
+
+
+# The per-wavelength calculation the vectorised one replaced
+def reference_factor(compensation, wavelength):
+    normalized_amplitude = compensation.amplitude_interpolator(wavelength) / 1000
+    return 1 / normalized_amplitude if normalized_amplitude > 0 else 1
+
+
+@pytest.fixture
+def compensation():
+    return PowerCompensation(WAVELENGTHS_CAL, AMPLITUDES_CAL)
+
+
+def test_factors_match_the_per_wavelength_calculation(compensation):
+    wavelengths = np.linspace(480000, 670000, 50)
+    expected = [reference_factor(compensation, wavelength) for wavelength in wavelengths]
+    assert np.allclose(compensation.factors(wavelengths), expected)
+    # No amplitude at 600 nm, so nothing to compensate
+    assert compensation.factors([600000])[0] == 1
+
+
+def test_amplitudes_are_clamped(compensation):
+    assert list(compensation.amplitudes([500000, 550000, 600000, 650000, 700000])) == [800, 400, 1000, 1000, 1000]
+    weak = PowerCompensation([500000, 510000], [0.5, 0.5])
+    assert weak.amplitudes([505000])[0] == 1
+
+
+def test_compensate_spectrum(compensation):
+    wavelengths = np.array([500, 525, 550, 575])
+    intensities = np.array([1000.0, 2000.0, 3000.0, 4000.0])
+    compensated = compensation.compensate(wavelengths * 1000, intensities)
+    expected = [intensity / reference_factor(compensation, wavelength * 1000)
+                for wavelength, intensity in zip(wavelengths, intensities)]
+    assert np.allclose(compensated, expected)
+
+
+@pytest.mark.parametrize('band_axis', [0, -1])
+def test_compensate_cube_scales_each_band(compensation, band_axis):
+    bands = np.array([500000, 550000, 650000])
+    cube = np.arange(3 * 4 * 5, dtype=np.uint16).reshape(3, 4, 5)
+    if band_axis == -1:
+        cube = np.moveaxis(cube, 0, -1)
+    compensated = compensation.compensate_cube(cube, bands, band_axis=band_axis)
+    for i, wavelength in enumerate(bands):
+        band = np.take(cube, i, axis=band_axis)
+        assert np.allclose(np.take(compensated, i, axis=band_axis), band / reference_factor(compensation, wavelength))
+
+
+def test_compensate_cube_into_out(compensation):
+    cube = np.ones((2, 3, 3), dtype=np.uint16)
+    out = np.empty(cube.shape)
+    result = compensation.compensate_cube(cube, [500000, 550000], out=out)
+    assert result is out
+    assert np.allclose(out[:, 0, 0], [0.8, 0.4])
+
+
+def test_vectors_are_cached_per_grid():
+    compensation = PowerCompensation(WAVELENGTHS_CAL, AMPLITUDES_CAL, max_cached_grids=2)
+    grid = np.array([500000.0, 550000.0])
+    vector = compensation.vector(grid)
+    assert compensation.vector(grid.copy()) is vector
+    assert not vector.flags.writeable
+
+    compensation.vector([600000.0])
+    compensation.vector([650000.0])
+    assert len(compensation._vectors) == 2
+    # The oldest grid was dropped, so it is calculated again
+    assert compensation.vector(grid) is not vector
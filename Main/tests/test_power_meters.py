@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from time import sleep
+
+import numpy as np
+import pytest
+
+from power_meters import CameraROIMeter
+
+
+# Returns the frames it is given in turn, the way the camera session does: a new array, or copied into out
+class FrameSource:
+    def __init__(self, frames, serial_number='CAM-1'):
+        self.frames = iter(frames)
+        self.shape = (8, 12)
+        self.serial_number = serial_number
+        self.exposures = []
+        self.outs = []
+
+    def set_exposure(self, exposure_time):
+        self.exposures.append(exposure_time)
+
+    def grab(self, out=None):
+        frame = next(self.frames)
+        self.outs.append(out)
+        if out is None:
+            return frame.copy()
+        out[...] = frame
+        return out
+
+
+def frame(level, dtype=np.uint16):
+    return np.full((8, 12), level, dtype=dtype)
+
+
+def test_default_roi_is_the_central_half():
+    meter = CameraROIMeter(FrameSource([]), 1000.0)
+    assert meter.roi == (2, 6, 3, 9)
+    assert meter.readout == 'camera roi 2:6,3:9'
+    assert (meter.serial_number, meter.integration_time) == ('CAM-1', 1000)
+
+
+def test_roi_outside_the_image():
+    with pytest.raises(ValueError, match='outside the 12x8 image'):
+        CameraROIMeter(FrameSource([]), 1000.0, roi=(0, 9, 0, 12))
+
+
+def test_only_the_roi_is_measured_above_the_dark_level():
+    lit = frame(100)
+    lit[0, 0] = 60000
+    meter = CameraROIMeter(FrameSource([frame(10), lit]), 1000.0, roi=(2, 6, 3, 9))
+    assert meter.capture_dark() == 10
+    assert meter(550000) == 90
+    assert meter.saturated_frames == 0
+
+
+def test_frame_buffer_is_reused():
+    camera = FrameSource([frame(1), frame(2), frame(3)])
+    meter = CameraROIMeter(camera, 500.0)
+    for _ in range(3):
+        meter(550000)
+    assert camera.outs[0] is None
+    assert camera.outs[1] is camera.outs[2] is meter._frame
+    assert camera.exposures == [500.0] * 3
+
+
+def test_frames_are_averaged_and_saturation_counted():
+    camera = FrameSource([frame(100, np.uint8), frame(255, np.uint8)])
+    meter = CameraROIMeter(camera, 1000.0, n_frames=2)
+    assert meter(550000) == 177.5
+    assert meter.saturated_frames == 1
+
+
+def test_no_frame():
+    camera = FrameSource([])
+    camera.grab = lambda out=None: None
+    with pytest.raises(RuntimeError, match='no frame'):
+        CameraROIMeter(camera, 1000.0)(550000)
+
+
+# On the simulator the AOTF light at a band, once settled, is above the dark level with the RF power off
+def test_simulated_camera(backend, nktp):
+    camera = backend.open_camera(1000.0)
+    meter = CameraROIMeter(camera, 1000.0)
+    nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)
+    nktp.registerWriteU8('COM5', 25, 0x30, 0, -1)
+    meter.capture_dark()
+    nktp.registerWriteU32('COM5', 25, 0x90, 550000, -1)
+    nktp.registerWriteU16('COM5', 25, 0xB0, 1000, -1)
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    sleep(2 * backend.nktp.settle_time)
+    assert meter(550000) > 0
+    camera.close()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from register_cache import RegisterCache
+
+RegResultDeviceNotFound = 12
+
+
+def test_repeated_write_is_skipped(nktp):
+    assert nktp.registerWriteU16('COM5', 25, 0xB0, 500, -1) == 0
+    assert nktp.registerWriteU16('COM5', 25, 0xB0, 500, -1) == 0
+    assert (nktp.written, nktp.skipped) == (1, 1)
+
+    assert nktp.registerWriteU16('COM5', 25, 0xB0, 501, -1) == 0
+    assert (nktp.written, nktp.skipped) == (2, 1)
+    assert nktp.registerReadU16('COM5', 25, 0xB0, -1) == (0, 501)
+
+
+def test_index_is_part_of_the_key(nktp):
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, 0)
+    assert (nktp.written, nktp.skipped) == (2, 0)
+
+
+def test_reopening_the_port_drops_its_values(nktp):
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)
+    nktp.openPorts('COM5', 0, 0)
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)
+    assert (nktp.written, nktp.skipped) == (3, 1)
+
+
+def test_failed_write_drops_the_device(nktp):
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    assert nktp.registerWriteU8('COM5', 99, 0x30, 1, -1) == RegResultDeviceNotFound
+    assert nktp.registerWriteU8('COM5', 99, 0x30, 1, -1) == RegResultDeviceNotFound
+    nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    assert (nktp.written, nktp.skipped) == (3, 1)
+
+
+def test_invalidate_drops_one_register(nktp):
+    nktp.registerWriteU32('COM5', 25, 0x90, 600000, -1)
+    nktp.registerWriteU16('COM5', 25, 0xB0, 500, -1)
+    nktp.invalidate('COM5', 25, 0x90)
+    nktp.registerWriteU32('COM5', 25, 0x90, 600000, -1)
+    nktp.registerWriteU16('COM5', 25, 0xB0, 500, -1)
+    assert (nktp.written, nktp.skipped) == (3, 1)
+
+
+def test_write_read_caches_the_value_read_back(nktp):
+    assert nktp.registerWriteReadU16('COM5', 25, 0xB0, 700, -1) == (0, 700)
+    nktp.registerWriteU16('COM5', 25, 0xB0, 700, -1)
+    assert (nktp.written, nktp.skipped) == (1, 1)
+
+
+def test_disabled_cache_writes_everything(backend):
+    nktp = RegisterCache(backend.nktp, enabled=False)
+    for _ in range(3):
+        nktp.registerWriteU8('COM5', 25, 0x30, 1, -1)
+    assert (nktp.written, nktp.skipped) == (3, 0)
+
+
+def test_concurrent_writes_of_the_same_value_write_once(nktp):
+    threads = [threading.Thread(target=nktp.registerWriteU16, args=('COM5', 25, 0xB0, 500, -1)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (nktp.written, nktp.skipped) == (1, 7)
+
+
+def test_concurrent_writes_leave_the_value_the_device_holds(nktp):
+    def write(values):
+        for value in values:
+            nktp.registerWriteU16('COM5', 25, 0xB0, value, -1)
+
+    threads = [threading.Thread(target=write, args=([500, 600] * 20,)), threading.Thread(target=write, args=([600, 700] * 20,))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert nktp.values[('COM5', 25, 0xB0, -1)] == nktp.registerReadU16('COM5', 25, 0xB0, -1)[1]
+    assert nktp.written + nktp.skipped == 80
+
+
+def test_write_that_raises_drops_the_register(nktp, monkeypatch):
+    nktp.registerWriteU16('COM5', 25, 0xB0, 500, -1)
+
+    def fail(*args):
+        raise OSError('port gone')
+
+    monkeypatch.setattr(nktp.nktp, 'registerWriteU16', fail)
+    with pytest.raises(OSError):
+        nktp.registerWriteU16('COM5', 25, 0xB0, 600, -1)
+    assert ('COM5', 25, 0xB0, -1) not in nktp.values
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import wait
+
+from register_transactions import PortWorker, run_transaction
+
+WRITES = [('U32', 0x90, 600000), ('U16', 0xB0, 500), ('U8', 0x30, 1)]
+
+
+def test_transaction_results(nktp):
+    result = run_transaction(nktp, 'COM5', 25, WRITES, verify=True)
+    assert result.results == [0, 0, 0]
+    assert result.ok and result.verified
+
+
+def test_transaction_stops_at_the_first_failure(nktp):
+    result = run_transaction(nktp, 'COM5', 99, WRITES)
+    assert not result.ok
+    assert result.results[1:] == [None, None]
+
+
+def test_worker_runs_in_submission_order(nktp):
+    order = []
+    with PortWorker(nktp, 'COM5') as worker:
+        futures = []
+        for i in range(20):
+            futures.append(worker.submit(25, [('U16', 0xB0, 100 + i)]))
+            futures.append(worker.run(order.append, i))
+        wait(futures)
+        # The last write queued is the one the device holds
+        assert worker.call('registerReadU16', 25, 0xB0, -1).result() == (0, 119)
+    assert order == list(range(20))
+
+
+def test_worker_runs_on_one_thread(nktp):
+    with PortWorker(nktp, 'COM5') as worker:
+        threads = {worker.run(threading.current_thread).result() for _ in range(10)}
+    assert len(threads) == 1 and threading.current_thread() not in threads
+
+
+# A transaction started from a job already running on the worker runs straight away instead of waiting behind that job
+def test_transaction_on_the_worker_runs_inline(nktp):
+    with PortWorker(nktp, 'COM5') as worker:
+        future = worker.run(worker.transaction, 25, WRITES)
+        assert future.result(timeout=5).ok
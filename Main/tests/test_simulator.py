@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import threading
+from time import sleep
+
+import numpy as np
+import pytest
+
+from NKTP_DLL.signatures import REGISTER_CTYPES, SIGNATURES
+from register_transactions import run_transaction
+
+
+def tune(nktp, wavelength_pm, amplitude):
+    nktp.registerWriteU8('COM4', 1, 0x30, 1, -1)
+    result = run_transaction(nktp, 'COM5', 25, [('U32', 0x90, wavelength_pm), ('U16', 0xB0, amplitude), ('U8', 0x30, 1)])
+    assert result.ok
+    sleep(2 * nktp.settle_time)
+
+
+# Every typed register function of the bindings is simulated
+def test_typed_register_functions_match_the_bindings(backend):
+    for suffix in REGISTER_CTYPES:
+        for prefix in ('registerRead', 'registerWrite', 'registerWriteRead'):
+            assert prefix + suffix in SIGNATURES
+            assert callable(getattr(backend.nktp, prefix + suffix))
+
+
+@pytest.mark.parametrize('suffix, value', [('U16', 500), ('S32', -7), ('F32', 0.25), ('F64', 1e-9)])
+def test_write_read(backend, suffix, value):
+    nktp = backend.nktp
+    assert getattr(nktp, 'registerWriteRead' + suffix)('COM5', 25, 0x40, value, -1) == (0, value)
+    assert getattr(nktp, 'registerRead' + suffix)('COM5', 25, 0x40, -1) == (0, value)
+    assert getattr(nktp, 'registerWriteRead' + suffix)('COM5', 99, 0x40, value, -1)[0] != 0
+
+
+@pytest.mark.parametrize('wavelength_pm', [480000, 560000, 640000])
+def test_spectral_line_follows_the_aotf(backend, nktp, spectrometer, wavelength_pm):
+    tune(nktp, wavelength_pm, 600)
+    intensities = spectrometer.intensities()
+    peak = spectrometer.wavelengths()[np.argmax(intensities)]
+    assert abs(peak - wavelength_pm / 1000) < 2.0
+
+
+def test_line_grows_with_the_amplitude(nktp, spectrometer):
+    heights = []
+    for amplitude in (200, 500, 800):
+        tune(nktp, 550000, amplitude)
+        heights.append(spectrometer.intensities().max())
+    assert heights == sorted(heights)
+
+
+def test_no_light_until_settled(backend, nktp):
+    tune(nktp, 550000, 500)
+    assert backend.nktp.active_lines()
+    backend.nktp.settle_time = 1.0
+    nktp.registerWriteU32('COM5', 25, 0x90, 600000, -1)
+    assert not backend.nktp.active_lines()
+
+
+def test_camera_frames_change_with_the_wavelength(backend, nktp):
+    camera = backend.open_camera(10000.0)
+    tune(nktp, 480000, 800)
+    blue = camera.grab().astype(float)
+    tune(nktp, 640000, 800)
+    red = camera.grab().astype(float)
+    assert camera.frames_grabbed == camera.frames_triggered == 2
+    assert blue.mean() > 0 and not np.array_equal(blue, red)
+
+
+
+# The camera session interface (camera_session.CameraSession) as simulated
+def test_wait_exposure_end_times_out(backend):
+    camera = backend.open_camera(1000.0)
+    with pytest.raises(TimeoutError):
+        camera.wait_exposure_end(1, timeout=0.05)
+
+
+def test_wait_exposure_end_raises_a_failed_trigger(backend, monkeypatch):
+    camera = backend.open_camera(1000.0)
+
+    def active_lines():
+        raise OSError('camera disconnected')
+
+    monkeypatch.setattr(backend.nktp, 'active_lines', active_lines)
+    errors = []
+
+    def trigger():
+        sleep(0.01)
+        try:
+            camera.trigger()
+        except OSError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=trigger)
+    thread.start()
+    with pytest.raises(RuntimeError):
+        camera.wait_exposure_end(1, timeout=5)
+    thread.join()
+    assert len(errors) == 1 and camera.frames_triggered == 0
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from spectrometer_references import Reference, ReferenceLibrary, RunningStats
+
+
+def dark(integration_time, mean, variance, saved=None):
+    saved = saved or datetime.now().isoformat(timespec='seconds')
+    return Reference('dark', 'HR2B1032', integration_time, np.full(4, float(mean)), np.full(4, float(variance)), 10, saved,
+                     'captured')
+
+
+def test_running_stats():
+    frames = np.random.default_rng(0).normal(100, 5, (20, 8))
+    stats = RunningStats()
+    for frame in frames:
+        stats.add(frame)
+    np.testing.assert_allclose(stats.mean, frames.mean(axis=0))
+    np.testing.assert_allclose(stats.variance, frames.var(axis=0, ddof=1))
+
+
+def test_references_are_captured_once_then_cached(tmp_path, spectrometer):
+    library = ReferenceLibrary(str(tmp_path))
+    placed, removed = [], []
+
+    def place(kind):
+        placed.append(kind)
+        spectrometer.place(kind)
+
+    def remove():
+        removed.append(True)
+        spectrometer.place(None)
+
+    dark_reference, white = library.references(spectrometer, 1000, n_frames=3, place=place, remove=remove)
+    assert placed == ['dark', 'white'] and len(removed) == 1
+    assert (dark_reference.source, white.source) == ('captured', 'captured')
+    assert white.mean.mean() > dark_reference.mean.mean()
+
+    cached_dark, cached_white = ReferenceLibrary(str(tmp_path)).references(spectrometer, 1000, n_frames=3, place=place,
+                                                                           remove=remove)
+    assert placed == ['dark', 'white'] and len(removed) == 1
+    assert (cached_dark.source, cached_white.source) == ('cached', 'cached')
+    np.testing.assert_array_equal(cached_dark.mean, dark_reference.mean)
+    np.testing.assert_array_equal(cached_white.variance, white.variance)
+
+
+def test_stale_reference_is_not_used(tmp_path):
+    library = ReferenceLibrary(str(tmp_path))
+    library.save(dark(1000, 100, 4, saved='2000-01-01T00:00:00'))
+    assert library.load('dark', 'HR2B1032', 1000) is None
+
+
+@pytest.mark.parametrize('integration_time, fraction', [(2000, 0.5), (1500, 0.25)])
+def test_dark_is_interpolated_linearly(tmp_path, integration_time, fraction):
+    library = ReferenceLibrary(str(tmp_path))
+    library.save(dark(1000, 100, 4))
+    library.save(dark(3000, 300, 12))
+    reference = library.interpolate_dark('HR2B1032', integration_time)
+    assert reference.source == 'interpolated'
+    np.testing.assert_allclose(reference.mean, 100 + fraction * 200)
+    np.testing.assert_allclose(reference.variance, 4 + fraction * 8)
+
+
+def test_dark_is_not_extrapolated(tmp_path):
+    library = ReferenceLibrary(str(tmp_path))
+    library.save(dark(1000, 100, 4))
+    library.save(dark(3000, 300, 12))
+    assert library.interpolate_dark('HR2B1032', 4000) is None
+    assert library.interpolate_dark('HR2B1032', 500) is None
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from spectrometer_session import SpectrometerSession
+
+BANDS_NM = np.linspace(450, 650, 21)
+
+
+def nearest(axis, wavelength_nm):
+    return int(np.argmin(np.abs(axis - wavelength_nm)))
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_pixels_are_the_nearest(spectrometer, descending):
+    if descending:
+        spectrometer._wavelengths = spectrometer._wavelengths[::-1].copy()
+    spec = SpectrometerSession(spectrometer)
+    axis = spectrometer.wavelengths()
+    spec.set_bands(BANDS_NM)
+    for wavelength_nm in list(BANDS_NM) + [300.0, 455.123, 1100.0]:
+        assert spec.pixel(wavelength_nm) == nearest(axis, wavelength_nm)
+    assert list(spec.pixels(BANDS_NM)) == [nearest(axis, w) for w in BANDS_NM]
+
+
+def test_integration_time_is_only_written_when_it_changes(spectrometer, monkeypatch):
+    written = []
+    monkeypatch.setattr(spectrometer, 'integration_time_micros', written.append)
+    spec = SpectrometerSession(spectrometer, integration_time=10000)
+    spec.integration_time_micros(10000)
+    spec.integration_time_micros(20000)
+    assert written == [10000, 20000]
+    assert spec.integration_time == 20000
+
+
+def test_windows_cover_the_half_width(spectrometer):
+    spec = SpectrometerSession(spectrometer)
+    axis = spectrometer.wavelengths()
+    starts, stops = spec.set_bands(BANDS_NM, half_width_nm=3.0)
+    for wavelength_nm, start, stop in zip(BANDS_NM, starts, stops):
+        inside = np.flatnonzero(np.abs(axis - wavelength_nm) <= 3.0)
+        assert (start, stop) == (inside[0], inside[-1] + 1)
+
+    # With no half width, the window is the nearest pixel alone
+    starts, stops = spec.set_bands(BANDS_NM)
+    assert np.all(stops - starts == 1)
+
+
+def test_band_counts_are_the_window_mean(spectrometer):
+    spec = SpectrometerSession(spectrometer)
+    spec.set_bands(BANDS_NM, half_width_nm=2.0)
+    rng = np.random.default_rng(0)
+    intensities = rng.uniform(1000, 2000, spectrometer.pixels)
+    dark = rng.uniform(0, 100, spectrometer.pixels)
+    scale = rng.uniform(0.5, 1.0, spectrometer.pixels)
+
+    starts, stops = spec.windows
+    expected = [((intensities - dark) / scale)[start:stop].mean() for start, stop in zip(starts, stops)]
+    np.testing.assert_allclose(spec.band_counts(intensities, dark=dark, scale=scale), expected)
+    assert spec.band_count(intensities, BANDS_NM[3], dark, scale) == pytest.approx(expected[3])
+
+
+# The fitted line height of an exact line of the same width is its peak, wherever it falls between two pixels
+def test_line_fit_gives_the_peak(spectrometer):
+    spec = SpectrometerSession(spectrometer)
+    spec.set_bands(BANDS_NM, line_width_nm=2.0)
+    axis = spectrometer.wavelengths()
+    sigma = 2.0 / 2.355
+    for wavelength_nm in BANDS_NM[::5]:
+        intensities = 500.0 * np.exp(-0.5 * ((axis - wavelength_nm) / sigma) ** 2)
+        assert spec.band_count(intensities, wavelength_nm) == pytest.approx(500.0)
+
+
+def test_off_grid_wavelength_reads_the_nearest_pixel(spectrometer):
+    spec = SpectrometerSession(spectrometer)
+    spec.set_bands(BANDS_NM, line_width_nm=2.0)
+    intensities = np.arange(spectrometer.pixels, dtype=float)
+    assert spec.band(500.5) is None
+    assert spec.band_count(intensities, 500.5) == spec.pixel(500.5)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import itertools
+from time import perf_counter, sleep
+
+import numpy as np
+import pytest
+
+from spectrometer_session import SpectrometerSession
+from spectrometer_stream import SpectrometerStreamer
+
+
+# Puts the number of each reading in its first pixel
+@pytest.fixture
+def numbered(spectrometer, monkeypatch):
+    read = spectrometer.intensities
+    numbers = itertools.count()
+
+    def intensities():
+        spectrum = read()
+        spectrum[0] = next(numbers)
+        return spectrum
+
+    monkeypatch.setattr(spectrometer, 'intensities', intensities)
+    return spectrometer
+
+
+def test_spectrum_after_is_the_first_exposed_after(numbered):
+    with SpectrometerStreamer(numbered, 1000) as stream:
+        sleep(0.01)
+        after = perf_counter()
+        number = int(stream.spectrum(after=after)[0])
+        with stream._new_spectrum:
+            exposed = dict(zip(stream.sequence, stream.exposure_starts))
+        assert exposed[number] >= after
+        assert all(start < after for n, start in exposed.items() if 0 <= n < number)
+
+        # Asked again, the same spectrum is returned, and a later one after that
+        assert int(stream.spectrum(after=after)[0]) == number
+        assert int(stream.spectrum(after=perf_counter())[0]) > number
+
+
+def test_spectra_are_kept_in_order(numbered):
+    with SpectrometerStreamer(numbered, 1000, capacity=4) as stream:
+        numbers = [int(stream.spectrum(after=perf_counter())[0]) for _ in range(10)]
+    assert numbers == sorted(numbers) and len(set(numbers)) == 10
+
+
+def test_timeout(spectrometer):
+    stream = SpectrometerStreamer(spectrometer, 1000, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        stream.spectrum(after=perf_counter())
+    with stream:
+        start = perf_counter()
+        with pytest.raises(TimeoutError):
+            stream.spectrum(after=perf_counter() + 60)
+        assert perf_counter() - start >= 0.05
+
+
+def test_spectrometer_error_stops_the_stream(spectrometer, monkeypatch):
+    def intensities():
+        raise OSError('USB transfer failed')
+
+    monkeypatch.setattr(spectrometer, 'intensities', intensities)
+    with SpectrometerStreamer(spectrometer, 1000) as stream:
+        with pytest.raises(RuntimeError):
+            stream.spectrum(after=perf_counter(), timeout=1.0)
+
+
+def test_integration_time(spectrometer):
+    spec = SpectrometerSession(spectrometer, integration_time=2000)
+    assert SpectrometerStreamer(spec).integration_time == 2000
+    with pytest.raises(ValueError):
+        SpectrometerStreamer(spectrometer, free_running=True)
+
+    stream = SpectrometerStreamer(spectrometer, 3000, free_running=True).start()
+    spectrum, exposure_start = None, None
+    while spectrum is None:
+        spectrum, exposure_start = stream.latest()
+    stream.close()
+    assert spectrometer._integration_time == 3000
+    assert exposure_start < stream.received[0] - 0.003
+    assert np.all(np.isfinite(spectrum))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import threading
+from time import perf_counter, sleep
+
+import pytest
+
+from sweep_engine import STAGES, SweepEngine
+
+
+# Records when each stage of each band starts and ends. The frame readout is slow, so the next band can be tuned during it
+class Stages:
+    def __init__(self, readout=0.01, store_times=None):
+        self.readout = readout
+        self.store_times = store_times or {}
+        self.events = []
+        self.stored = []
+        self.settled_at = {}
+        self.engine = None
+        self._lock = threading.Lock()
+
+    def record(self, event, i):
+        with self._lock:
+            self.events.append((event, i, perf_counter()))
+
+    def time(self, event, i):
+        return next(t for e, j, t in self.events if (e, j) == (event, i))
+
+    def tune(self, i):
+        self.record('tune', i)
+
+    def settle(self, i):
+        self.record('settle', i)
+
+    def capture_frame(self, i):
+        sleep(self.readout)
+        self.record('frame', i)
+        return f'frame {i}'
+
+    def frame_exposed(self, i):
+        self.record('exposed', i)
+
+    def capture_spectrum(self, i):
+        self.settled_at[i] = self.engine.settled_at
+        self.record('spectrum', i)
+        return f'spectrum {i}'
+
+    def store(self, i, frame, spectrum):
+        sleep(self.store_times.get(i, 0))
+        self.stored.append((i, frame, spectrum))
+
+    def make_engine(self, pipelined=True):
+        self.engine = SweepEngine(self.tune, self.capture_frame, self.capture_spectrum, self.store, settle=self.settle,
+                                  frame_exposed=self.frame_exposed if pipelined else None)
+        return self.engine
+
+
+def test_bands_are_stored_in_order():
+    stages = Stages(readout=0.0, store_times={0: 0.02, 2: 0.01})
+    stages.make_engine().run(6)
+    assert stages.stored == [(i, f'frame {i}', f'spectrum {i}') for i in range(6)]
+
+
+def test_next_band_is_tuned_during_the_readout():
+    stages = Stages(readout=0.02)
+    stages.make_engine().run(4)
+    for i in range(3):
+        assert stages.time('tune', i) < stages.time('settle', i)
+        assert stages.time('exposed', i) < stages.time('tune', i + 1)
+        assert stages.time('spectrum', i) < stages.time('tune', i + 1)
+        # Band i + 1 is tuned before the frame of band i has been read out
+        assert stages.time('tune', i + 1) < stages.time('frame', i)
+
+
+def test_without_frame_exposed_the_next_band_waits_for_the_frame():
+    stages = Stages(readout=0.005)
+    stages.make_engine(pipelined=False).run(4)
+    for i in range(3):
+        assert stages.time('frame', i) < stages.time('tune', i + 1)
+
+
+def test_settled_at_is_when_the_band_settled():
+    stages = Stages()
+    stages.make_engine().run(3)
+    for i in range(3):
+        assert stages.time('settle', i) <= stages.settled_at[i] <= stages.time('spectrum', i)
+
+
+def test_timings_cover_every_band():
+    stages = Stages(readout=0.0)
+    timings = stages.make_engine().run(5)
+    assert set(timings) == set(STAGES)
+    assert all(len(timings[stage]) == 5 for stage in STAGES)
+
+
+def test_stage_error_is_raised_from_run():
+    stages = Stages(readout=0.0)
+
+    def capture_frame(i):
+        if i == 2:
+            raise RuntimeError('Camera: grab failed for the band 3')
+        return f'frame {i}'
+
+    engine = stages.make_engine()
+    engine.capture_frame = capture_frame
+    with pytest.raises(RuntimeError, match='band 3'):
+        engine.run(5)
+    assert [i for i, _, _ in stages.stored] == [0, 1]
+
+
+def test_no_bands():
+    stages = Stages()
+    assert all(times == [] for times in stages.make_engine().run(0).values())
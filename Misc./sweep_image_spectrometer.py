@@ -9,6 +9,7 @@ Created on Mon Jun 24 12:20:20 2024
 ####################
 
 from NKTP_DLL import *
+import os
 from time import sleep
 import numpy as np
 
@@ -11,6 +11,7 @@ modified swep_image_spectrometer.py to subtract backgound noise from the spectro
 ####################
 
 from NKTP_DLL import *
+import os
 from time import sleep
 import numpy as np
 
@@ -3,6 +3,7 @@
 ####################
 
 from NKTP_DLL import *
+import os
 from time import sleep
 import numpy as np
 